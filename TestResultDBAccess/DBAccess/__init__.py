@@ -1,2 +1,38 @@
-from .direct_db_accesss import DirectDBAccess
-from .rest_api_db_access import RestApiDBAccess
\ No newline at end of file
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import importlib
+
+# the backends are imported at the first access of their name, so importing the
+# package does not load MySQLdb or requests of a backend which is not used
+_LAZY_IMPORTS = {
+   "DirectDBAccess"         : ".direct_db_accesss",
+   "DirectDBConnectionPool" : ".db_connection_pool",
+   "RestApiDBAccess"        : ".rest_api_db_access",
+   "AsyncRestApiDBAccess"   : ".async_rest_api_db_access",
+   "AdaptiveFlushPolicy"    : ".flush_policy",
+   "CommitPolicy"           : ".commit_policy",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+def __getattr__(name):
+   if name in _LAZY_IMPORTS:
+      value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+      globals()[name] = value
+      return value
+   raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def __dir__():
+   return sorted(list(globals()) + __all__)
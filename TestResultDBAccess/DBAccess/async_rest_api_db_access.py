@@ -0,0 +1,544 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: async_rest_api_db_access.py
+#
+# This class provides coroutines to interact with TestResultWebApp's REST APIs
+# from an asyncio event loop (based on aiohttp).
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#  - coroutines flush() and vCreateNewHeaders(), array payloads if the server
+#    supports them
+#  - send CCR samples and test cases in batches
+#
+# ******************************************************************************
+
+import asyncio
+from collections import deque
+from functools import partial
+from .ca_bundle import oGetSSLContext, sGetCABundle
+from .ccr_columns import arCCRColumns
+from .db_accesss_interface import DBAccessInterface
+from .project_cache import oProjectKeyCache
+from .rest_api_db_access import RestApiDBAccess, dGetCapabilities, vSetCapabilities
+from .rest_payloads import dResultPayload, dFilePayload, dFileHeaderPayload, \
+                           dTestCasePayload, dAbortPayload, dCCRPayload
+
+async def _aitItems(iterable):
+   """
+Iterate a synchronous or asynchronous iterable asynchronously.
+   """
+   if hasattr(iterable, '__aiter__'):
+      async for item in iterable:
+         yield item
+   else:
+      for item in iterable:
+         yield item
+
+async def _aitChunks(iterable, nSize):
+   """
+Iterate a synchronous or asynchronous iterable asynchronously in lists of up to
+``nSize`` items.
+   """
+   arChunk = []
+   async for item in _aitItems(iterable):
+      arChunk.append(item)
+      if len(arChunk) >= nSize:
+         yield arChunk
+         arChunk = []
+   if arChunk:
+      yield arChunk
+
+class AsyncRestApiDBAccess(DBAccessInterface):
+   """
+AsyncRestApiDBAccess provides the operations of ``RestApiDBAccess`` as
+coroutines, so an uploader running in an asyncio event loop does not block it.
+
+The requests are sent with ``aiohttp`` (optional dependency, installed with the
+``async`` extra, required when the first request is sent). At most
+``max_in_flight`` requests of an instance are in flight at the same time. Methods
+creating many records (``arCreateNewTestCases()``, ``nCreateNewTestCases()``,
+``vCreateCCRdata()``, ...) keep this number of requests in flight and return the
+IDs in input order. If the server supports array payloads, up to ``batch_size``
+records are sent per request.
+
+The arguments of the coroutines are the arguments of the methods of
+``RestApiDBAccess``:
+
+.. code::
+
+   oDBAccess = DBAccessFactory().create("rest_async", max_in_flight=16)
+   await oDBAccess.connect(host, user, passwd, database)
+   arIDs = await oDBAccess.arCreateNewTestCases(arTestCases)
+   await oDBAccess.vFinishTestResult(result_id)
+   await oDBAccess.disconnect()
+   """
+
+   def __init__(self, max_in_flight=10, connect_timeout=None, read_timeout=None, batch_size=100):
+      """
+Initializes the AsyncRestApiDBAccess instance.
+
+**Arguments:**
+
+*  ``max_in_flight``
+
+   / *Condition*: optional / *Type*: int / *Default*: 10 /
+
+   Maximum number of requests in flight, also the size of the connection pool.
+
+*  ``connect_timeout``, ``read_timeout``
+
+   / *Condition*: optional / *Type*: float / *Default*: None /
+
+   Timeouts of the requests in seconds, ``None`` waits forever.
+
+*  ``batch_size``
+
+   / *Condition*: optional / *Type*: int / *Default*: 100 /
+
+   Maximum number of records which are sent in one request if the server
+   supports array payloads (see ``bProbeBatchSupport()``).
+      """
+      if max_in_flight < 1:
+         raise ValueError("max_in_flight must be at least 1")
+      self.base_url     = ""
+      self.nMaxInFlight = max_in_flight
+      self.timeout      = (connect_timeout, read_timeout)
+      self.session      = None
+      self.cookies      = {}
+      self.nBatchSize   = batch_size
+      self.bBatchSupported = False
+      self.__oSemaphore = None
+
+   async def __oGetSession(self):
+      if self.session is None:
+         # aiohttp is only required by the asynchronous REST API access
+         import aiohttp
+         oSSLContext = oGetSSLContext() if oGetSSLContext().get_ca_certs() else False
+         self.session = aiohttp.ClientSession(
+            headers={"Content-Type": "application/json"},
+            cookies=self.cookies,
+            connector=aiohttp.TCPConnector(limit=self.nMaxInFlight, ssl=oSSLContext),
+            timeout=aiohttp.ClientTimeout(sock_connect=self.timeout[0],
+                                          sock_read=self.timeout[1]))
+         self.__oSemaphore = asyncio.Semaphore(self.nMaxInFlight)
+      return self.session
+
+   # Methods to handle api request
+   async def __tRequest(self, sMethod, url, payload=None):
+      oSession = await self.__oGetSession()
+      async with self.__oSemaphore:
+         async with oSession.request(sMethod, url, json=payload, allow_redirects=True) as res:
+            try:
+               data = await res.json(content_type=None)
+            except ValueError:
+               data = None
+            return res.status, data
+
+   async def __get_request(self, resource):
+      nStatus, data = await self.__tRequest('GET', "{}/{}".format(self.base_url, resource))
+      if nStatus == 200 and data and data['success']:
+         return data['data']
+      return None
+
+   async def __post_request(self, resource, payload=None):
+      nStatus, data = await self.__tRequest('POST', "{}/{}".format(self.base_url, resource),
+                                            payload)
+      if nStatus == 201 and data and data['success']:
+         return data['data']
+      raise Exception(data['message'] if data else "HTTP status {}".format(nStatus))
+
+   async def __patch_request(self, resource, resource_id, payload=None):
+      nStatus, data = await self.__tRequest('PATCH', "{}/{}/{}".format(self.base_url, resource,
+                                                                       resource_id), payload)
+      if nStatus == 200 and data and data['success']:
+         return data['data']
+      raise Exception(data['message'] if data else "HTTP status {}".format(nStatus))
+
+   async def __nRunBounded(self, fnCoroutine, itArgs, arResults=None):
+      """
+Run ``fnCoroutine(*args)`` for all ``args`` of the (asynchronous) iterable with
+up to ``max_in_flight`` coroutines at once. The results are appended in input
+order to ``arResults`` (if given), the number of runs is returned.
+The first error (in input order) is raised, the remaining coroutines are cancelled.
+      """
+      nCount  = 0
+      dqTasks = deque()
+      try:
+         async for args in _aitItems(itArgs):
+            if len(dqTasks) >= self.nMaxInFlight:
+               result = await dqTasks.popleft()
+               nCount += 1
+               if arResults is not None:
+                  arResults.append(result)
+            dqTasks.append(asyncio.ensure_future(fnCoroutine(*args)))
+         while dqTasks:
+            result = await dqTasks.popleft()
+            nCount += 1
+            if arResults is not None:
+               arResults.append(result)
+      except BaseException:
+         for oTask in dqTasks:
+            oTask.cancel()
+         await asyncio.gather(*dqTasks, return_exceptions=True)
+         raise
+      return nCount
+
+   def __dGetWamCookies(self):
+      # the Kerberos login is done with requests (aiohttp has no Kerberos
+      # support), the cookies are passed to the aiohttp session
+      import requests
+      try:
+         from requests_kerberos import HTTPKerberosAuth, OPTIONAL
+         with requests.Session() as session:
+            session.verify = sGetCABundle() or False
+            session.get("{}/loggedin".format(self.base_url),
+                        auth=HTTPKerberosAuth(mutual_authentication=OPTIONAL),
+                        allow_redirects=True)
+            return session.cookies.get_dict()
+      except Exception as err:
+         raise Exception("Cannot access API server. Reason: {}".format(err))
+
+   # Implementation of interface's methods
+   #
+   async def connect(self, host, user, passwd, database, *args):
+      """
+Connects to the database via REST API using the provided credentials.
+
+See ``RestApiDBAccess.connect()``.
+      """
+      self.base_url = "{}/{}".format(host, database)
+      self.cookies = await asyncio.get_running_loop().run_in_executor(None,
+                                                                     self.__dGetWamCookies)
+      if self.session is not None:
+         self.session.cookie_jar.update_cookies(self.cookies)
+      try:
+         _, data = await self.__tRequest('GET', "{}/getPubKey".format(self.base_url))
+         pubkey = data['pubKey']
+      except Exception as err:
+         raise Exception("Failed to get public key. Reason: {}".format(err))
+
+      req_body = {
+         'usr': user,
+         'pwd': RestApiDBAccess.encrypt_password(passwd, pubkey),
+         'dom': '',
+      }
+      _, data = await self.__tRequest('POST', "{}/login".format(self.base_url), req_body)
+      if data and data['data'] == "login_success":
+         print("  > Login successfully!")
+      else:
+         raise Exception('Login failed!')
+      await self.bProbeBatchSupport()
+
+   async def bProbeBatchSupport(self):
+      """
+Ask the server whether it accepts array payloads, see
+``RestApiDBAccess.bProbeBatchSupport()``. The answer is cached per base URL.
+      """
+      self.bBatchSupported = False
+      if self.nBatchSize > 1:
+         data = dGetCapabilities(self.base_url)
+         if data is None:
+            try:
+               data = await self.__get_request('capabilities')
+            except Exception:
+               # not cached, the server is asked again at the next connect()
+               return False
+            vSetCapabilities(self.base_url, data)
+            data = dGetCapabilities(self.base_url)
+         if data.get('batch'):
+            self.bBatchSupported = True
+            if data.get('max_batch_size'):
+               self.nBatchSize = min(self.nBatchSize, int(data['max_batch_size']))
+      return self.bBatchSupported
+
+   async def __arPostBatch(self, resource, arPayloads):
+      """
+POST the records as one array payload and return the response data of the records.
+      """
+      data = await self.__post_request(resource, arPayloads)
+      if not isinstance(data, list) or len(data) != len(arPayloads):
+         raise Exception("Unexpected response of {} for {} records".format(resource,
+                                                                           len(arPayloads)))
+      return data
+
+   async def disconnect(self):
+      """
+Disconnect from TestResultWebApp's database and close the HTTP session.
+      """
+      try:
+         nStatus, _ = await self.__tRequest('GET', self.base_url+'/logout')
+      finally:
+         if self.session is not None:
+            await self.session.close()
+            self.session = None
+      if nStatus == 200:
+         print("  > Logout successfully!")
+      else:
+         raise Exception('Logout failed!')
+
+   async def commit(self):
+      """
+There is no transaction for the REST API access.
+      """
+      pass
+
+   async def flush(self):
+      """
+There are no deferred updates, the requests are sent at once.
+      """
+      pass
+
+   # Methods to retrieve (GET) information from database
+   async def arGetCategories(self):
+      """
+Get existing categories.
+      """
+      data = await self.__get_request('categories')
+      if data:
+         return [item['category'] for item in data]
+      return []
+
+   async def bExistingResultID(self, result_id):
+      """
+Verify the given test result UUID is existing or not.
+      """
+      data = await self.__get_request('results/{}'.format(result_id))
+      return bool(data)
+
+   async def sGetLatestFileID(self, result_id=None):
+      """
+Get latest file ID of all result or given ``result_id``.
+      """
+      request_url = 'files/last'
+      if result_id:
+         request_url = 'files/last?test_result_id={}'.format(result_id)
+      data = await self.__get_request(request_url)
+      if data and ('id' in data) and data['id']:
+         return data['id']
+      raise Exception("Cannot get latest file_id")
+
+   async def arGetProjectVersionSWByID(self, result_id):
+      """
+Get the project and version_sw information of given ``result_id``.
+      """
+      data = await self.__get_request('results/{}'.format(result_id))
+      if data:
+         return (data['project'], data['version_sw_target'])
+      return None
+
+   async def __vEnsureProject(self, project, variant, branch):
+      prj_resource = 'projects?project={}&variant={}&branch={}'.format(project, variant, branch)
+      if await self.__get_request(prj_resource):
+         return
+      req_prj = {
+         "project": project,
+         "variant": variant,
+         "branch": branch
+      }
+      try:
+         await self.__post_request('projects', req_prj)
+      except Exception:
+         if not await self.__get_request(prj_resource):
+            raise
+
+   # Methods to create new record(s) (POST) in database
+   async def sCreateNewTestResult(self, project, variant, branch, *args):
+      """
+Creates a new test result.
+      """
+      if not oProjectKeyCache.bContains(self.base_url, project, variant, branch):
+         await self.__vEnsureProject(project, variant, branch)
+         oProjectKeyCache.vAdd(self.base_url, project, variant, branch)
+      req_result = dResultPayload(project, variant, branch, *args)
+      await self.__post_request('results', req_result)
+      return req_result['test_result_id']
+
+   async def nCreateNewFile(self, *args, **kwargs):
+      """
+Create new result file.
+      """
+      data = await self.__post_request('files', dFilePayload(*args, **kwargs))
+      return data['id']
+
+   async def vCreateNewHeader(self, *args):
+      """
+Create a new result file header.
+      """
+      await self.__post_request('fileheaders', dFileHeaderPayload(*args))
+
+   async def vCreateNewHeaders(self, arHeaders):
+      """
+Create many result file headers, in batches of ``batch_size`` headers if the
+server supports array payloads, with up to ``max_in_flight`` requests in flight.
+      """
+      arPayloads = [dFileHeaderPayload(*header) for header in arHeaders]
+      if self.bBatchSupported:
+         await self.__nRunBounded(self.__arPostBatch,
+                                  (('fileheaders', arPayloads[nStart:nStart + self.nBatchSize])
+                                   for nStart in range(0, len(arPayloads), self.nBatchSize)))
+      else:
+         await self.__nRunBounded(self.__post_request,
+                                  (('fileheaders', payload) for payload in arPayloads))
+
+   async def nCreateNewSingleTestCase(self, *args):
+      """
+Create single test case.
+      """
+      data = await self.__post_request('testcases', dTestCasePayload(*args))
+      return data['id']
+
+   async def nCreateNewTestCase(self, *args):
+      """
+Alias for nCreateNewSingleTestCase.
+      """
+      return await self.nCreateNewSingleTestCase(*args)
+
+   async def __arCreateTestCaseBatch(self, arTestCases):
+      data = await self.__arPostBatch('testcases', [dTestCasePayload(*testcase)
+                                                    for testcase in arTestCases])
+      return [item['id'] for item in data]
+
+   async def __nCreateTestCaseBatch(self, arTestCases):
+      return len(await self.__arCreateTestCaseBatch(arTestCases))
+
+   async def arCreateNewTestCases(self, arTestCases):
+      """
+Create many test cases with up to ``max_in_flight`` requests in flight and return
+their IDs in input order. If the server supports array payloads, ``batch_size``
+test cases are sent in one request.
+      """
+      if self.bBatchSupported:
+         arBatchIDs = []
+         await self.__nRunBounded(self.__arCreateTestCaseBatch,
+                                  ((arChunk,) async for arChunk in _aitChunks(arTestCases,
+                                                                              self.nBatchSize)),
+                                  arBatchIDs)
+         return [nID for arIDs in arBatchIDs for nID in arIDs]
+      arIDs = []
+      await self.__nRunBounded(self.nCreateNewSingleTestCase, arTestCases, arIDs)
+      return arIDs
+
+   async def nCreateNewTestCases(self, itTestCases):
+      """
+Create test cases from a lazy (synchronous or asynchronous) iterable with up to
+``max_in_flight`` requests in flight. If the server supports array payloads,
+``batch_size`` test cases are sent in one request. Returns the number of created
+test cases.
+      """
+      if self.bBatchSupported:
+         arCounts = []
+         await self.__nRunBounded(self.__nCreateTestCaseBatch,
+                                  ((arChunk,) async for arChunk in _aitChunks(itTestCases,
+                                                                              self.nBatchSize)),
+                                  arCounts)
+         return sum(arCounts)
+      return await self.__nRunBounded(self.nCreateNewSingleTestCase, itTestCases)
+
+   async def vCreateAbortReason(self, result_id, abort_reason, abort_message):
+      """
+Create abort reason entry.
+      """
+      await self.__post_request('aborts', dAbortPayload(result_id, abort_reason, abort_message))
+
+   async def __vCreateCCRSample(self, test_case_id, *row):
+      await self.__post_request('ccrs', dCCRPayload(test_case_id, row))
+
+   async def __vCreateCCRBatch(self, test_case_id, arRows):
+      await self.__arPostBatch('ccrs', [dCCRPayload(test_case_id, row) for row in arRows])
+
+   async def vCreateCCRdata(self, test_case_id, lCCRdata):
+      """
+Create CCR data per test case. If the server supports array payloads,
+``batch_size`` samples are sent in one request, otherwise one request per sample.
+The samples may be a lazy (synchronous or asynchronous) iterable, only the
+samples of the requests in flight are kept.
+      """
+      if self.bBatchSupported:
+         await self.__nRunBounded(partial(self.__vCreateCCRBatch, test_case_id),
+                                  ((arRows,) async for arRows in _aitChunks(lCCRdata,
+                                                                            self.nBatchSize)))
+      else:
+         await self.__nRunBounded(partial(self.__vCreateCCRSample, test_case_id), lCCRdata)
+
+   async def vCreateCCRdataColumns(self, test_case_id, timestamps, mem, cpu):
+      """
+Create CCR data per test case from columns of timestamp, MEM and CPU values.
+      """
+      await self.vCreateCCRdata(test_case_id, zip(*arCCRColumns(timestamps, mem, cpu)))
+
+   async def vCreateCCRdataStream(self, test_case_id, itCCRdata):
+      """
+Create CCR data from a lazy (synchronous or asynchronous) iterable of samples.
+      """
+      await self.vCreateCCRdata(test_case_id, itCCRdata)
+
+   async def vCreateTags(self, result_id, tags):
+      """
+Create tag entries.
+      """
+      req_tag = {
+         "test_result_id"  : result_id,
+         "tags"            : tags
+      }
+      await self.__post_request('userresults', req_tag)
+
+   # Methods to update existing record (PATCH) in database
+   async def vCreateReanimation(self, result_id, num_of_reanimation):
+      """
+Create reanimation entry.
+      """
+      await self.__patch_request('results', result_id,
+                                 {"num_of_reanimation" : num_of_reanimation})
+
+   async def vSetCategory(self, result_id, category_main):
+      """
+Create category entry.
+      """
+      await self.__patch_request('results', result_id, {"category_main" : category_main})
+
+   async def vUpdateFileEndTime(self, file_id, time_end):
+      """
+Update test file end time.
+      """
+      await self.__patch_request('files', file_id, {"time_end" : time_end})
+
+   async def vUpdateResultEndTime(self, result_id, time_end):
+      """
+Update test result end time.
+      """
+      await self.__patch_request('results', result_id, {"time_end" : time_end})
+
+   async def vFinishTestResult(self, result_id):
+      """
+Update state of given test result to "new report".
+      """
+      await self.__patch_request('results', result_id, {"result_state" : "new report"})
+
+   # Methods to call Stored Procedures of database
+   async def vUpdateEvtbl(self, result_id):
+      """
+Call ``update_evtbl`` stored procedure to update given ``result_id``.
+      """
+      await self.__patch_request('evtblresults', result_id)
+
+   async def vUpdateEvtbls(self):
+      """
+Call ``update_evtbls`` stored procedure.
+      """
+      await self.__post_request('evtblresults')
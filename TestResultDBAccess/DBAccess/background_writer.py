@@ -0,0 +1,164 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: background_writer.py
+#
+# This class flushes batches of buffered rows in a dedicated writer thread.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#  - hand batches which are dropped after an error to a discard function
+#
+# ******************************************************************************
+
+import queue
+import threading
+
+class BackgroundWriter(object):
+   """
+BackgroundWriter hands batches to a dedicated writer thread which flushes them
+in submission order.
+
+The queue is bounded: ``vSubmit()`` blocks while ``queue_size`` batches are
+waiting, so the caller cannot run away from the database (back-pressure).
+With ``queue_size=1`` this is a double buffer: the caller fills one batch while
+the writer flushes the other.
+
+The first error of the writer is kept and raised to the caller at the next
+``vSubmit()`` or ``vBarrier()``. Batches submitted after an error are dropped,
+so no later batch overtakes a failed one. They are passed to ``fnDiscard`` (if
+given) before the error is raised.
+   """
+
+   __STOP = object()
+
+   def __init__(self, fnFlush, queue_size=1, name="TestResultDBAccess-writer", fnDiscard=None):
+      """
+Initializer of class ``BackgroundWriter``. The writer thread is started
+immediately.
+
+**Arguments:**
+
+*  ``fnFlush``
+
+   / *Condition*: required / *Type*: callable /
+
+   Function which is called with each batch in the writer thread.
+
+*  ``queue_size``
+
+   / *Condition*: optional / *Type*: int / *Default*: 1 /
+
+   Maximum number of batches which wait for the writer.
+
+*  ``name``
+
+   / *Condition*: optional / *Type*: str /
+
+   Name of the writer thread.
+
+*  ``fnDiscard``
+
+   / *Condition*: optional / *Type*: callable / *Default*: None /
+
+   Function which is called in the writer thread with each batch which is
+   dropped after an error.
+      """
+      if queue_size < 1:
+         raise ValueError("queue_size must be at least 1")
+      self.__fnFlush = fnFlush
+      self.__fnDiscard = fnDiscard
+      self.__oQueue  = queue.Queue(maxsize=queue_size)
+      self.__oError  = None
+      self.__oThread = threading.Thread(target=self.__vRun, name=name, daemon=True)
+      self.__oThread.start()
+
+   def __vRun(self):
+      while True:
+         batch = self.__oQueue.get()
+         try:
+            if batch is BackgroundWriter.__STOP:
+               return
+            if self.__oError is None:
+               self.__fnFlush(batch)
+            elif self.__fnDiscard is not None:
+               self.__fnDiscard(batch)
+         except BaseException as error:
+            if self.__oError is None:
+               self.__oError = error
+         finally:
+            self.__oQueue.task_done()
+
+   def __vRaiseError(self):
+      if self.__oError is not None:
+         # the batches behind the failed one are discarded before the error is raised
+         self.__oQueue.join()
+         error, self.__oError = self.__oError, None
+         raise error
+
+   def vSubmit(self, batch):
+      """
+Queue a batch for the writer thread. Blocks while the queue is full.
+
+**Arguments:**
+
+*  ``batch``
+
+   / *Condition*: required / *Type*: any /
+
+   Batch which is passed to the flush function.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.__vRaiseError()
+      self.__oQueue.put(batch)
+
+   def vBarrier(self):
+      """
+Wait until all submitted batches are flushed and raise the first error of the
+writer (if any).
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.__oQueue.join()
+      self.__vRaiseError()
+
+   def vStop(self):
+      """
+Flush all submitted batches and stop the writer thread. The first error of the
+writer (if any) is raised after the thread has stopped.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      if self.__oThread.is_alive():
+         self.__oQueue.put(BackgroundWriter.__STOP)
+         self.__oThread.join()
+      self.__vRaiseError()
@@ -0,0 +1,238 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: ca_bundle.py
+#
+# Shared SSL context and PEM bundle of the system CA store for the REST API
+# access. Both are built once per process and reused by all RestApiDBAccess
+# instances.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#  - keep the bundle in a private directory and trust only own bundle files
+#  - import the user cache helpers from user_cache instead of session_cache
+#
+# ******************************************************************************
+
+import atexit
+import glob
+import hashlib
+import os
+import shutil
+import ssl
+import stat
+import tempfile
+import threading
+
+from requests.adapters import HTTPAdapter
+
+from .user_cache import bIsPrivate, sUserCacheDirectory
+
+# name of the bundle file: <prefix><hash of the system CA store>.pem
+CA_BUNDLE_PREFIX = "TestResultDBAccess-ca-"
+
+_oLock       = threading.Lock()
+_oSSLContext = None
+_sCABundle   = None
+# own directory of this process if the bundle directory is not private
+_sProcessDirectory = None
+
+def oGetSSLContext():
+   """
+Get the SSL context with the system CA store. The context is created once per
+process and shared by all sessions.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+   / *Type*: ssl.SSLContext /
+
+   Shared SSL context.
+   """
+   global _oSSLContext
+   with _oLock:
+      if _oSSLContext is None:
+         _oSSLContext = ssl.create_default_context()
+      return _oSSLContext
+
+def sGetCABundle(sDirectory=None):
+   """
+Get the path of a PEM file with the CA certificates of the system CA store.
+
+The file name contains a hash of the CA store, so all processes of the user with
+the same CA store share one file which is written only once. Bundles of a
+previous CA store are removed when a new bundle is written.
+
+The bundle is only kept in a directory which is owned by the user and not
+accessible by other users (mode 0700), and an existing bundle is only used if it
+is a regular file of the user which other users cannot write. If the directory
+is accessible by other users, the bundle is written to an own temporary
+directory of the process instead.
+
+**Arguments:**
+
+*  ``sDirectory``
+
+   / *Condition*: optional / *Type*: str / *Default*: None /
+
+   Directory of the bundle file, a ``TestResultDBAccess/certs`` directory in the
+   user's cache directory by default.
+
+**Returns:**
+
+   / *Type*: str /
+
+   Path to the PEM file, ``None`` if the system CA store is empty.
+   """
+   global _sCABundle
+   sDirectory = _sPrivateDirectory(sDirectory)
+   if _sCABundle is not None and os.path.dirname(_sCABundle) == sDirectory \
+      and _bIsOwnBundle(_sCABundle):
+      return _sCABundle
+
+   der_certs = oGetSSLContext().get_ca_certs(binary_form=True)
+   if not der_certs:
+      return None
+   oHash = hashlib.sha256()
+   for der in der_certs:
+      oHash.update(der)
+   sBundle = os.path.join(sDirectory, "%s%s.pem" % (CA_BUNDLE_PREFIX, oHash.hexdigest()[:16]))
+
+   with _oLock:
+      if not _bIsOwnBundle(sBundle):
+         _vWriteBundle(sBundle, der_certs)
+         vRemoveStaleCABundles(sBundle)
+      _sCABundle = sBundle
+   return sBundle
+
+def _sPrivateDirectory(sDirectory):
+   global _sProcessDirectory
+   sDirectory = sDirectory or sUserCacheDirectory("certs")
+   try:
+      os.makedirs(sDirectory, mode=0o700, exist_ok=True)
+      bPrivate = bIsPrivate(os.lstat(sDirectory)) and os.path.isdir(sDirectory)
+   except OSError:
+      bPrivate = False
+   if bPrivate:
+      return sDirectory
+   with _oLock:
+      if _sProcessDirectory is None:
+         # mkdtemp creates the directory with mode 0700
+         _sProcessDirectory = tempfile.mkdtemp(prefix=CA_BUNDLE_PREFIX)
+         atexit.register(shutil.rmtree, _sProcessDirectory, True)
+      return _sProcessDirectory
+
+def _bIsOwnBundle(sBundle):
+   # a regular file (no symlink) of the user which other users cannot write
+   try:
+      oStat = os.lstat(sBundle)
+   except OSError:
+      return False
+   return stat.S_ISREG(oStat.st_mode) and bIsPrivate(oStat, 0o022)
+
+def _vWriteBundle(sBundle, der_certs):
+   # write to a temporary file and rename it, so another process never reads a
+   # partly written bundle
+   fd, sTmpFile = tempfile.mkstemp(prefix=CA_BUNDLE_PREFIX, suffix=".tmp",
+                                   dir=os.path.dirname(sBundle))
+   try:
+      with os.fdopen(fd, 'w') as outfile:
+         for der in der_certs:
+            outfile.write("{}\n".format(ssl.DER_cert_to_PEM_cert(der)))
+      os.chmod(sTmpFile, 0o644)
+      os.replace(sTmpFile, sBundle)
+   except BaseException:
+      try:
+         os.remove(sTmpFile)
+      except OSError:
+         pass
+      raise
+
+def vRemoveStaleCABundles(sKeep=None):
+   """
+Remove the CA bundles of other CA stores from the directory of ``sKeep``. Only
+bundles of the current user are removed.
+
+**Arguments:**
+
+*  ``sKeep``
+
+   / *Condition*: optional / *Type*: str / *Default*: None /
+
+   Path of the bundle to keep. If ``None``, all bundles in the default directory
+   of ``sGetCABundle()`` are removed.
+
+**Returns:**
+
+(*no returns*)
+   """
+   sDirectory = os.path.dirname(sKeep) if sKeep else sUserCacheDirectory("certs")
+   for sBundle in glob.glob(os.path.join(glob.escape(sDirectory), CA_BUNDLE_PREFIX + "*.pem")):
+      try:
+         bOwn = bIsPrivate(os.lstat(sBundle), 0)
+      except OSError:
+         continue
+      if bOwn and (sKeep is None or not os.path.samefile(sBundle, sKeep)):
+         try:
+            os.remove(sBundle)
+         except OSError:
+            # still in use (Windows) or removed by another process
+            pass
+
+class SSLContextAdapter(HTTPAdapter):
+   """
+Transport adapter which verifies the server certificates with the shared SSL
+context of ``oGetSSLContext()`` instead of loading the CA bundle into a new
+context for each connection pool.
+
+The shared context is only used if the session verifies with the CA bundle of
+``sGetCABundle()`` (which contains the same certificates), other ``verify``
+values are handled by ``HTTPAdapter`` as before.
+   """
+
+   def __init__(self, ca_bundle=None, **kwargs):
+      """
+Initializer of class ``SSLContextAdapter``.
+
+**Arguments:**
+
+*  ``ca_bundle``
+
+   / *Condition*: optional / *Type*: str / *Default*: None /
+
+   Path of the CA bundle which is replaced by the shared SSL context.
+
+*  ``kwargs``
+
+   / *Condition*: optional / *Type*: dict /
+
+   Keyword arguments of ``requests.adapters.HTTPAdapter``.
+      """
+      self.sCABundle = ca_bundle
+      super(SSLContextAdapter, self).__init__(**kwargs)
+
+   def build_connection_pool_key_attributes(self, request, verify, cert=None):
+      host_params, pool_kwargs = super(SSLContextAdapter, self).\
+                                 build_connection_pool_key_attributes(request, verify, cert)
+      if self.sCABundle is not None and verify == self.sCABundle:
+         pool_kwargs.pop("ca_certs", None)
+         pool_kwargs.pop("ca_cert_dir", None)
+         pool_kwargs["ssl_context"] = oGetSSLContext()
+      return host_params, pool_kwargs
@@ -0,0 +1,217 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: case_buffer.py
+#
+# This class buffers pending test case rows column by column in preallocated
+# storage which is reused after each flush.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#  - append the values without a row tuple, iterate the rows without copies
+#
+# ******************************************************************************
+
+import sys
+from itertools import islice
+
+from .flush_policy import AdaptiveFlushPolicy
+
+class TestCaseBuffer(object):
+   """
+TestCaseBuffer is a columnar buffer of pending ``tbl_case`` rows.
+
+*  Each column is a preallocated list which is reused after ``vClear()``, so
+   buffering does not allocate a tuple per row and no new list per flush.
+*  The often repeated values of ``component``, ``result_main``, ``result_state``
+   and ``test_result_id`` are interned, so all rows share one string object.
+*  The row tuples for ``executemany`` are built lazily while the rows are
+   iterated (``itRows()``), so a flush does not copy the buffer.
+
+The columns are in the order of ``TBL_CASE_BULK_COLUMNS``.
+   """
+
+   # not a test class for pytest's collection
+   __test__ = False
+
+   NUM_COLUMNS = 15
+
+   # indexes of the columns in the order of TBL_CASE_BULK_COLUMNS
+   COMPONENT      = 6
+   RESULT_MAIN    = 8
+   RESULT_STATE   = 9
+   TEST_RESULT_ID = 12
+   FILE_ID        = 13
+
+   INTERNED_COLUMNS = (COMPONENT, RESULT_MAIN, RESULT_STATE, TEST_RESULT_ID)
+
+   # per-field overhead of a row within an insert statement
+   ROW_OVERHEAD = NUM_COLUMNS * AdaptiveFlushPolicy.FIELD_OVERHEAD
+
+   def __init__(self, capacity=100):
+      """
+Initializer of class ``TestCaseBuffer``.
+
+**Arguments:**
+
+*  ``capacity``
+
+   / *Condition*: optional / *Type*: int / *Default*: 100 /
+
+   Number of preallocated rows. The buffer grows if more rows are appended.
+      """
+      self.nCapacity = max(1, capacity)
+      self.arColumns = [[None] * self.nCapacity for _ in range(TestCaseBuffer.NUM_COLUMNS)]
+      self.nRows  = 0
+      self.nBytes = 0
+
+   def __len__(self):
+      return self.nRows
+
+   def __iter__(self):
+      return self.itRows()
+
+   def vAppend(self, name, issue, tcid, fid, testnumber, repeatcount, component,
+                     time_start, result_main, result_state, result_return, counter_resets,
+                     test_result_id, file_id, lastlog):
+      """
+Append one row. The values are stored in their columns directly, the estimated
+size of the row (see ``AdaptiveFlushPolicy.nRowSize()``) is added to ``nBytes``.
+
+**Arguments:**
+
+*  ``name``, ``issue``, ..., ``lastlog``
+
+   / *Condition*: required / *Type*: str, int or None /
+
+   Row values in the order of ``TBL_CASE_BULK_COLUMNS``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if self.nRows == self.nCapacity:
+         self.__vGrow()
+      nIndex = self.nRows
+      arColumns = self.arColumns
+      if type(component) is str:
+         component = sys.intern(component)
+      if type(result_main) is str:
+         result_main = sys.intern(result_main)
+      if type(result_state) is str:
+         result_state = sys.intern(result_state)
+      if type(test_result_id) is str:
+         test_result_id = sys.intern(test_result_id)
+      arColumns[0][nIndex]  = name
+      arColumns[1][nIndex]  = issue
+      arColumns[2][nIndex]  = tcid
+      arColumns[3][nIndex]  = fid
+      arColumns[4][nIndex]  = testnumber
+      arColumns[5][nIndex]  = repeatcount
+      arColumns[6][nIndex]  = component
+      arColumns[7][nIndex]  = time_start
+      arColumns[8][nIndex]  = result_main
+      arColumns[9][nIndex]  = result_state
+      arColumns[10][nIndex] = result_return
+      arColumns[11][nIndex] = counter_resets
+      arColumns[12][nIndex] = test_result_id
+      arColumns[13][nIndex] = file_id
+      arColumns[14][nIndex] = lastlog
+      self.nRows  += 1
+      # estimated size, see AdaptiveFlushPolicy.nRowSize() (inlined, no row tuple)
+      nValueSize = AdaptiveFlushPolicy.VALUE_SIZE
+      self.nBytes += (TestCaseBuffer.ROW_OVERHEAD
+                      + (len(name) if type(name) is str else nValueSize)
+                      + (len(issue) if type(issue) is str else nValueSize)
+                      + (len(tcid) if type(tcid) is str else nValueSize)
+                      + (len(fid) if type(fid) is str else nValueSize)
+                      + (len(testnumber) if type(testnumber) is str else nValueSize)
+                      + (len(repeatcount) if type(repeatcount) is str else nValueSize)
+                      + (len(component) if type(component) is str else nValueSize)
+                      + (len(time_start) if type(time_start) is str else nValueSize)
+                      + (len(result_main) if type(result_main) is str else nValueSize)
+                      + (len(result_state) if type(result_state) is str else nValueSize)
+                      + (len(result_return) if type(result_return) is str else nValueSize)
+                      + (len(counter_resets) if type(counter_resets) is str else nValueSize)
+                      + (len(test_result_id) if type(test_result_id) is str else nValueSize)
+                      + (len(file_id) if type(file_id) is str else nValueSize)
+                      + (len(lastlog) if type(lastlog) is str else nValueSize))
+
+   def __vGrow(self):
+      """
+Double the capacity of all columns.
+      """
+      for column in self.arColumns:
+         column.extend([None] * self.nCapacity)
+      self.nCapacity *= 2
+
+   def itRows(self):
+      """
+Iterate the buffered rows as tuples for the upload. The columns are not copied,
+the buffer must not be changed while the rows are iterated. The buffer itself
+can be iterated more than once (e.g. to retry an upload).
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+   / *Type*: iterator /
+
+   Row tuples in the order of ``TBL_CASE_BULK_COLUMNS``.
+      """
+      return islice(zip(*self.arColumns), self.nRows)
+
+   def arColumn(self, nColumn):
+      """
+Get the buffered values of one column.
+
+**Arguments:**
+
+*  ``nColumn``
+
+   / *Condition*: required / *Type*: int /
+
+   Index of the column (e.g. ``TestCaseBuffer.FILE_ID``).
+
+**Returns:**
+
+   / *Type*: list /
+
+   Values of the buffered rows.
+      """
+      return self.arColumns[nColumn][:self.nRows]
+
+   def vClear(self):
+      """
+Remove all rows. The storage is kept for the next rows, the references to the
+values are released.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      arNone = [None] * self.nRows
+      for column in self.arColumns:
+         column[:len(arNone)] = arNone
+      self.nRows  = 0
+      self.nBytes = 0
@@ -0,0 +1,121 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: ccr_columns.py
+#
+# Helpers to convert columns of CCR samples (timestamp, MEM, CPU) into values
+# for the database without changing the given columns.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#
+# ******************************************************************************
+
+import sys
+
+# datetime64 units which are formatted without fraction of seconds
+_DATETIME64_SECOND_UNITS = ('Y', 'M', 'W', 'D', 'h', 'm', 's')
+
+def arFormatTimestamps(column):
+   """
+Format a NumPy ``datetime64`` array vectorized as ``%Y-%m-%d %H:%M:%S`` strings
+(with microseconds if the array has a finer unit than seconds).
+
+**Arguments:**
+
+*  ``column``
+
+   / *Condition*: required / *Type*: numpy.ndarray /
+
+   Array of ``datetime64`` values.
+
+**Returns:**
+
+   / *Type*: list /
+
+   List of formatted timestamps.
+   """
+   numpy = sys.modules['numpy']
+   sUnit = 's' if numpy.datetime_data(column.dtype)[0] in _DATETIME64_SECOND_UNITS else 'us'
+   arStrings = numpy.datetime_as_string(column, unit=sUnit)
+   return numpy.char.replace(arStrings, 'T', ' ').tolist()
+
+def arColumnValues(column):
+   """
+Get the values of one CCR column as a sequence of Python values. The column is
+not changed.
+
+*  NumPy arrays are converted with ``tolist()``, ``datetime64`` arrays are
+   formatted by ``arFormatTimestamps()``.
+*  Lists and tuples are used as they are.
+*  Other objects which support the buffer protocol (e.g. ``array.array``) are
+   converted by ``memoryview.tolist()`` in one call instead of iterating the
+   values in Python. Like for NumPy arrays, the result is a new list.
+*  Any other iterable is converted to a list.
+
+**Arguments:**
+
+*  ``column``
+
+   / *Condition*: required / *Type*: sequence, buffer or numpy.ndarray /
+
+   Column values.
+
+**Returns:**
+
+   / *Type*: list or tuple /
+
+   Column values.
+   """
+   # NumPy is an optional dependency: if the column is a NumPy array,
+   # NumPy is already imported by the caller
+   numpy = sys.modules.get('numpy')
+   if numpy is not None and isinstance(column, numpy.ndarray):
+      if numpy.issubdtype(column.dtype, numpy.datetime64):
+         return arFormatTimestamps(column)
+      return column.tolist()
+   if isinstance(column, (list, tuple)):
+      return column
+   try:
+      with memoryview(column) as oView:
+         return oView.tolist()
+   except TypeError:
+      return list(column)
+
+def arCCRColumns(timestamps, mem, cpu):
+   """
+Get the values of the CCR columns timestamp, MEM and CPU.
+
+**Arguments:**
+
+*  ``timestamps``, ``mem``, ``cpu``
+
+   / *Condition*: required / *Type*: sequence, buffer or numpy.ndarray /
+
+   Columns of the CCR samples, all of the same length.
+
+**Returns:**
+
+   / *Type*: tuple /
+
+   The values of the three columns (see ``arColumnValues()``).
+   """
+   arColumns = (arColumnValues(timestamps), arColumnValues(mem), arColumnValues(cpu))
+   if not len(arColumns[0]) == len(arColumns[1]) == len(arColumns[2]):
+      raise Exception("CCR columns differ in length: timestamp %s, MEM %s, CPU %s" %
+                      tuple(len(column) for column in arColumns))
+   return arColumns
@@ -0,0 +1,240 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: commit_policy.py
+#
+# This class decides when DirectDBAccess commits the running transaction and
+# collects the transaction duration metrics.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#
+# ******************************************************************************
+
+import time
+
+class CommitPolicy(object):
+   """
+CommitPolicy decides at which boundaries of an upload the running transaction is
+committed, so an import does not become one huge transaction.
+
+The policies can be combined, the transaction is committed as soon as one of them
+is due:
+
+*  ``rows``: after a bulk insert when at least this number of rows was written.
+*  ``per_file``: when a new file is created and when the result is finished.
+*  ``per_result``: when the result is finished (``vFinishTestResult()``).
+*  ``interval``: at the next boundary after the transaction ran this number of
+   seconds.
+
+Without any policy (default), only explicit ``commit()`` and ``disconnect()``
+commit as before.
+
+With ``batch_retries`` a savepoint is set before each bulk insert batch. A batch
+which fails with one of ``RETRYABLE_ERRORS`` is rolled back to this savepoint and
+retried, without rolling back the rows written before in the same transaction.
+   """
+
+   # ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK
+   # Note: a deadlock rolls back the whole transaction, then the savepoint is
+   # gone and the error is raised without retry.
+   RETRYABLE_ERRORS = (1205, 1213)
+
+   def __init__(self, rows=None, per_file=False, per_result=False, interval=None,
+                      batch_retries=0):
+      """
+Initializer of class ``CommitPolicy``.
+
+**Arguments:**
+
+*  ``rows``
+
+   / *Condition*: optional / *Type*: int / *Default*: None /
+
+   Commit after bulk inserts which wrote at least this number of rows.
+
+*  ``per_file``
+
+   / *Condition*: optional / *Type*: bool / *Default*: False /
+
+   Commit at the end of each file.
+
+*  ``per_result``
+
+   / *Condition*: optional / *Type*: bool / *Default*: False /
+
+   Commit at the end of each result.
+
+*  ``interval``
+
+   / *Condition*: optional / *Type*: float / *Default*: None /
+
+   Commit at the next boundary after the transaction ran this number of seconds.
+
+*  ``batch_retries``
+
+   / *Condition*: optional / *Type*: int / *Default*: 0 /
+
+   Number of retries of a failed bulk insert batch. If greater than 0, each batch
+   is protected by a savepoint.
+      """
+      self.nRows         = rows
+      self.bPerFile      = per_file
+      self.bPerResult    = per_result
+      self.fInterval     = interval
+      self.nBatchRetries = batch_retries
+      self.fStart        = None
+      self.nPendingRows  = 0
+      self.vResetStatistics()
+
+   def vRecordStatement(self):
+      """
+Notify that a statement is executed. The first statement after a commit starts
+the measurement of the transaction duration.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      if self.fStart is None:
+         self.fStart = time.monotonic()
+
+   def vRecordRows(self, nRows):
+      """
+Notify that a bulk insert wrote rows within the running transaction.
+
+**Arguments:**
+
+*  ``nRows``
+
+   / *Condition*: required / *Type*: int /
+
+   Number of written rows.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.nPendingRows += nRows
+
+   def bIsCommitDue(self, sBoundary):
+      """
+Check whether the running transaction has to be committed at the given boundary.
+
+**Arguments:**
+
+*  ``sBoundary``
+
+   / *Condition*: required / *Type*: str /
+
+   ``rows`` after a bulk insert, ``file`` before a new file is created and
+   ``result`` when the result is finished.
+
+**Returns:**
+
+   / *Type*: bool /
+
+   True if one of the policies is due.
+      """
+      if self.fStart is None:
+         return False
+      if self.bPerFile and sBoundary in ('file', 'result'):
+         return True
+      if self.bPerResult and sBoundary == 'result':
+         return True
+      if self.nRows is not None and self.nPendingRows >= self.nRows:
+         return True
+      if self.fInterval is not None and time.monotonic() - self.fStart >= self.fInterval:
+         return True
+      return False
+
+   def vRecordCommit(self):
+      """
+Notify that the running transaction was committed and record its duration.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      if self.fStart is not None:
+         fDuration = time.monotonic() - self.fStart
+         self.dStatistics['transactions']   += 1
+         self.dStatistics['rows']           += self.nPendingRows
+         self.dStatistics['total_duration'] += fDuration
+         self.dStatistics['max_duration']    = max(self.dStatistics['max_duration'], fDuration)
+         self.dStatistics['last_duration']   = fDuration
+      self.fStart = None
+      self.nPendingRows = 0
+
+   def vRecordRetry(self):
+      """
+Count a retried bulk insert batch.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.dStatistics['batch_retries'] += 1
+
+   def dGetStatistics(self):
+      """
+Get the transaction metrics.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+   / *Type*: dict /
+
+   Number of committed ``transactions``, bulk inserted ``rows``, ``total_duration``,
+   ``max_duration`` and ``last_duration`` of the transactions in seconds and the
+   number of ``batch_retries``.
+      """
+      return dict(self.dStatistics)
+
+   def vResetStatistics(self):
+      """
+Reset the transaction metrics.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.dStatistics = {'transactions'   : 0,
+                          'rows'           : 0,
+                          'total_duration' : 0.0,
+                          'max_duration'   : 0.0,
+                          'last_duration'  : 0.0,
+                          'batch_retries'  : 0}
@@ -24,9 +24,18 @@
 # March 2024:
 #  - initial version
 #
+# October 2026:
+#  - add arCreateNewTestCases with per-record default implementation
+#  - add vCreateCCRdataColumns with default implementation based on vCreateCCRdata
+#  - add streaming methods nCreateNewTestCases and vCreateCCRdataStream
+#  - add vCreateNewHeaders with per-record default implementation
+#  - add flush for backends with deferred updates
+#
 # ******************************************************************************
 
 from abc import ABCMeta, abstractmethod
+from .ccr_columns import arCCRColumns
+from itertools import islice
 
 class DBAccessInterface(object):
    """
@@ -38,6 +47,10 @@ in the database.
    """
 
    __metaclass__ = ABCMeta
+
+   # number of CCR samples which vCreateCCRdataStream pulls from the iterable at once
+   NUM_CCR_SAMPLES_PER_CHUNK = 10000
+
    @abstractmethod
    def connect(self):
       """
@@ -59,6 +72,13 @@ Commits a transaction (only applicable for DirectDBAccess with transaction suppo
       """
       pass
 
+   # Only used for backends with deferred updates
+   def flush(self):
+      """
+Sends the deferred updates (only applicable for backends with deferred updates).
+      """
+      pass
+
    # Methods to retrieve (GET) information from database
    @abstractmethod
    def arGetCategories(self):
@@ -103,6 +123,13 @@ Creates a new file header record in the database.
       """
       pass
 
+   def vCreateNewHeaders(self, arHeaders):
+      """
+Creates many file header records in the database.
+      """
+      for header in arHeaders:
+         self.vCreateNewHeader(*header)
+
    @abstractmethod
    def nCreateNewSingleTestCase(self):
       """
@@ -117,6 +144,25 @@ Creates new test case(s) record in the database.
       """
       pass
 
+   def arCreateNewTestCases(self, arTestCases):
+      """
+Creates many test case records in the database and returns their IDs in order.
+      """
+      return [self.nCreateNewSingleTestCase(*testcase) for testcase in arTestCases]
+
+   def nCreateNewTestCases(self, itTestCases):
+      """
+Creates test case records from a lazy iterable (e.g. a generator) of test cases,
+each a sequence of the arguments of ``nCreateNewTestCase``. Only one test case is
+pulled at a time, the buffering is done by ``nCreateNewTestCase``.
+Returns the number of created test cases.
+      """
+      nCount = 0
+      for testcase in itTestCases:
+         self.nCreateNewTestCase(*testcase)
+         nCount += 1
+      return nCount
+
    @abstractmethod
    def vCreateAbortReason(self):
       """
@@ -131,6 +177,26 @@ Creates new CCR data in the database.
       """
       pass
 
+   def vCreateCCRdataColumns(self, test_case_id, timestamps, mem, cpu):
+      """
+Creates new CCR data in the database from columns of timestamp, MEM and CPU
+values (lists, NumPy arrays or buffer-protocol objects).
+      """
+      self.vCreateCCRdata(test_case_id, list(zip(*arCCRColumns(timestamps, mem, cpu))))
+
+   def vCreateCCRdataStream(self, test_case_id, itCCRdata):
+      """
+Creates new CCR data in the database from a lazy iterable (e.g. a generator) of
+samples ``(timestamp, MEM, CPU)``. The samples are pulled and uploaded in chunks
+of ``NUM_CCR_SAMPLES_PER_CHUNK``, so the memory usage does not depend on the
+number of samples.
+      """
+      itCCRdata = iter(itCCRdata)
+      lChunk = list(islice(itCCRdata, self.NUM_CCR_SAMPLES_PER_CHUNK))
+      while lChunk:
+         self.vCreateCCRdata(test_case_id, lChunk)
+         lChunk = list(islice(itCCRdata, self.NUM_CCR_SAMPLES_PER_CHUNK))
+
    @abstractmethod
    def vCreateTags(self):
       """
@@ -0,0 +1,343 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: db_connection_pool.py
+#
+# This class provides a thread-safe pool of MySQL connections which can be
+# shared between several DirectDBAccess instances.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#  - import MySQLdb at the first connection
+#  - health check outside of the pool lock, close idle connections above min_size
+#  - vImportMySQLdb() is shared with direct_db_accesss
+#  - reset the session variables of returned connections
+#
+# ******************************************************************************
+
+import threading
+import time
+
+# MySQLdb is imported at the first use (see vImportMySQLdb()), so importing this
+# module does not load the database driver
+db = None
+
+def vImportMySQLdb(namespace=None):
+   """
+Import ``MySQLdb`` as global ``db`` of a module if it is not imported yet.
+
+**Arguments:**
+
+*  ``namespace``
+
+   / *Condition*: optional / *Type*: dict / *Default*: None /
+
+   Global namespace (``globals()``) of the module, this module if not given.
+
+**Returns:**
+
+(*no returns*)
+   """
+   if namespace is None:
+      namespace = globals()
+   if namespace.get('db') is None:
+      import MySQLdb
+      namespace['db'] = MySQLdb
+
+# session variables which DirectDBAccess changes temporarily
+RESET_SESSION_STATEMENT = "SET SESSION foreign_key_checks=DEFAULT, unique_checks=DEFAULT"
+
+class DirectDBConnectionPool(object):
+   """
+DirectDBConnectionPool keeps a bounded set of MySQL connections to
+TestResultWebApp's database.
+
+Each ``DirectDBAccess`` instance which is created with this pool checks out its
+own connection in ``connect()`` and returns it in ``disconnect()``. So several
+uploader threads can work in parallel, each one with its own connection and its
+own test case buffer.
+   """
+
+   def __init__(self, host        = None,
+                      user        = None,
+                      passwd      = None,
+                      database    = None,
+                      charset     = 'utf8',
+                      use_unicode = True,
+                      min_size    = 1,
+                      max_size    = 10,
+                      timeout     = None,
+                      idle_timeout = 300,
+                      **kwargs):
+      """
+Initializer of class ``DirectDBConnectionPool``.
+
+**Arguments:**
+
+*  ``host``, ``user``, ``passwd``, ``database``, ``charset``, ``use_unicode``
+
+   Connection parameters, same as for ``DirectDBAccess.connect()``.
+
+*  ``min_size``
+
+   / *Condition*: optional / *Type*: int / *Default*: 1 /
+
+   Number of connections which are opened immediately and kept in the pool.
+   Idle connections above this number are closed after ``idle_timeout``.
+
+*  ``max_size``
+
+   / *Condition*: optional / *Type*: int / *Default*: 10 /
+
+   Maximum number of connections which are opened at the same time.
+
+*  ``timeout``
+
+   / *Condition*: optional / *Type*: float / *Default*: None /
+
+   Maximum time in seconds ``checkout()`` waits for a free connection.
+   None means waiting forever.
+
+*  ``idle_timeout``
+
+   / *Condition*: optional / *Type*: float / *Default*: 300 /
+
+   Time in seconds after which an idle connection above ``min_size`` is closed.
+   None keeps all idle connections open.
+
+*  ``kwargs``
+
+   / *Condition*: optional / *Type*: dict /
+
+   Additional keyword arguments which are passed to ``MySQLdb.connect()``.
+      """
+      if (host==None or user==None or passwd==None or database==None):
+         raise Exception("host, user, passwd and database need to be provided!")
+      if min_size < 0 or max_size < 1 or min_size > max_size:
+         raise ValueError("Invalid pool size: min_size=%s, max_size=%s" % (min_size, max_size))
+
+      self.host     = host
+      self.user     = user
+      self.passwd   = passwd
+      self.database = database
+      self.dConnectArgs = dict(kwargs, charset=charset, use_unicode=use_unicode)
+      self.nMinSize = min_size
+      self.nMaxSize = max_size
+      self.fTimeout = timeout
+      self.fIdleTimeout = idle_timeout
+
+      self.__oCondition = threading.Condition()
+      # (connection, time of checkin), the most recently returned one last
+      self.__lIdle      = []
+      self.__nOpened    = 0
+      self.__bClosed    = False
+
+      for _ in range(self.nMinSize):
+         self.__lIdle.append((self.__oNewConnection(), time.monotonic()))
+         self.__nOpened += 1
+
+   def __oNewConnection(self):
+      """
+Open a new connection to the database.
+
+**Returns:**
+
+   / *Type*: MySQLdb connection /
+
+   The new connection with disabled autocommit.
+      """
+      vImportMySQLdb()
+      con = db.connect(self.host, self.user, self.passwd, db=self.database,
+                       **self.dConnectArgs)
+      con.autocommit(False)
+      return con
+
+   @staticmethod
+   def __bIsHealthy(con):
+      """
+Check whether the given connection is still usable.
+
+**Returns:**
+
+   / *Type*: bool /
+
+   True if the server answers to ``ping()``.
+      """
+      try:
+         con.ping()
+         return True
+      except Exception:
+         return False
+
+   @staticmethod
+   def __vCloseQuietly(con):
+      try:
+         con.close()
+      except Exception:
+         pass
+
+   def checkout(self):
+      """
+Take a connection from the pool.
+
+An idle connection is health checked before it is handed out, broken connections
+are replaced by new ones. The health check is done outside of the pool lock, so
+a slow server does not block other threads. If all ``max_size`` connections are
+in use, the call blocks until one is returned or ``timeout`` has expired.
+
+**Returns:**
+
+   / *Type*: MySQLdb connection /
+
+   Connection for exclusive use until ``checkin()`` is called.
+      """
+      fDeadline = None if self.fTimeout is None else time.monotonic() + self.fTimeout
+      while True:
+         con = None
+         with self.__oCondition:
+            while True:
+               if self.__bClosed:
+                  raise Exception("Connection pool is already closed!")
+               if self.__lIdle:
+                  # the connection keeps its slot while it is checked
+                  con = self.__lIdle.pop()[0]
+                  break
+               if self.__nOpened < self.nMaxSize:
+                  # reserve the slot before opening to keep the size limit
+                  self.__nOpened += 1
+                  break
+               fRemaining = None if fDeadline is None else fDeadline - time.monotonic()
+               if fRemaining is not None and fRemaining <= 0:
+                  raise Exception("Timeout while waiting for a free database connection!")
+               self.__oCondition.wait(fRemaining)
+
+         if con is None:
+            try:
+               return self.__oNewConnection()
+            except Exception:
+               self.__vReleaseSlot()
+               raise
+         if self.__bIsHealthy(con):
+            return con
+         self.__vCloseQuietly(con)
+         self.__vReleaseSlot()
+
+   def __vReleaseSlot(self):
+      with self.__oCondition:
+         self.__nOpened -= 1
+         self.__oCondition.notify()
+
+   def __arTakeExpired(self):
+      """
+Remove the idle connections above ``min_size`` which are idle for longer than
+``idle_timeout`` from the pool. Must be called with the pool lock held.
+
+**Returns:**
+
+   / *Type*: list /
+
+   The removed connections, to be closed outside of the lock.
+      """
+      arExpired = []
+      if self.fIdleTimeout is not None:
+         fOldest = time.monotonic() - self.fIdleTimeout
+         # the oldest idle connections are at the front
+         while len(self.__lIdle) > self.nMinSize and self.__lIdle[0][1] <= fOldest:
+            arExpired.append(self.__lIdle.pop(0)[0])
+            self.__nOpened -= 1
+      return arExpired
+
+   def checkin(self, con):
+      """
+Return a connection which was taken by ``checkout()`` to the pool.
+
+Uncommitted changes are rolled back and the session variables of
+``RESET_SESSION_STATEMENT`` are reset, so the next user starts with a clean
+transaction and session. A connection which cannot be reset is closed. Idle
+connections above ``min_size`` which have not been used for ``idle_timeout`` are
+closed.
+
+**Arguments:**
+
+*  ``con``
+
+   / *Condition*: required / *Type*: MySQLdb connection /
+
+   The connection to be returned.
+
+**Returns:**
+
+(*no returns*)
+      """
+      try:
+         con.rollback()
+         oCursor = con.cursor()
+         try:
+            oCursor.execute(RESET_SESSION_STATEMENT, None)
+         finally:
+            oCursor.close()
+         bReusable = True
+      except Exception:
+         bReusable = False
+
+      arClose = []
+      with self.__oCondition:
+         if self.__bClosed or not bReusable:
+            arClose.append(con)
+            self.__nOpened -= 1
+         else:
+            self.__lIdle.append((con, time.monotonic()))
+            arClose.extend(self.__arTakeExpired())
+         self.__oCondition.notify()
+      for con in arClose:
+         self.__vCloseQuietly(con)
+
+   def close(self):
+      """
+Close all idle connections. Connections which are still checked out are closed
+when they are returned.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self.__oCondition:
+         self.__bClosed = True
+         arClose = [con for con, _ in self.__lIdle]
+         self.__lIdle = []
+         self.__nOpened -= len(arClose)
+         self.__oCondition.notify_all()
+      # closing is a round trip, so it is done outside of the lock
+      for con in arClose:
+         self.__vCloseQuietly(con)
+
+   def nSize(self):
+      """
+Get the number of currently opened connections (idle and checked out).
+
+**Returns:**
+
+   / *Type*: int /
+
+   Number of opened connections.
+      """
+      with self.__oCondition:
+         return self.__nOpened
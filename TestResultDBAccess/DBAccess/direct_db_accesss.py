@@ -30,40 +30,221 @@
 # March 2024:
 #  - rename file to direct_db_accesss due to DB interface feature of RobotLog2DB
 #
+# October 2026:
+#  - replace singleton by optional connection pool
+#  - add opt-in LOAD DATA LOCAL INFILE bulk path for tbl_case inserts
+#  - flush buffered test cases by byte budget and adaptive batch size
+#  - cache known projects and create missing ones with a single upsert
+#  - use parameterized statements of StatementRegistry
+#  - reuse one cursor per connection, account round trips per method
+#  - add opt-in background writer thread for buffered test case uploads
+#  - add commit policies, savepoint retry of bulk insert batches and transaction metrics
+#  - add bulk load session with session-scoped foreign key and unique checks
+#  - add bulk test case insert which returns the generated IDs
+#  - add column based CCR data upload, vCreateCCRdata keeps the given rows unchanged
+#  - buffer pending test cases in a reused columnar TestCaseBuffer
+#  - import MySQLdb at the first connect()
+#  - opt-in deferred result updates, merged into one UPDATE per result
+#  - per-connection metadata cache of results and latest file IDs
+#  - disconnect() returns the connection also if the final commit fails
+#  - import MySQLdb with vImportMySQLdb() of db_connection_pool
+#  - re-enable foreign key checks also if a test case upload fails
+#  - account foreign key check toggles of uploads to the upload method
+#  - restore max_stmt_length of the reused cursor after executemany
+#  - add projects to the project cache only after the commit
+#  - upload buffered test cases from TestCaseBuffer without copying the rows
+#  - report the number and files of test cases which are dropped by a failed upload
+#  - no console output for batch retries and the LOAD DATA fallback
+#
 # *******************************************************************************
 
+from .background_writer import BackgroundWriter
+from .case_buffer import TestCaseBuffer
+from .ccr_columns import arCCRColumns
+from .commit_policy import CommitPolicy
+from .db_connection_pool import vImportMySQLdb
 from .db_accesss_interface import DBAccessInterface
-import MySQLdb as db
+from .flush_policy import AdaptiveFlushPolicy
+from .metadata_cache import MetadataCache
+from .project_cache import oProjectKeyCache
+from .statement_registry import StatementRegistry
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+from itertools import islice, repeat
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# MySQLdb is imported at the first use (see vImportMySQLdb()), so importing this
+# module does not load the database driver
+db = None
+
+# escape sequences of LOAD DATA INFILE with default FIELDS ESCAPED BY '\\'
+_TSV_ESCAPE_TABLE = str.maketrans({'\\' : '\\\\',
+                                   '\t'  : '\\t',
+                                   '\n'  : '\\n',
+                                   '\r'  : '\\r',
+                                   '\0'  : '\\0'})
+
+def _sTSVField(value):
+   """
+Convert a single value to an escaped field of a LOAD DATA INFILE text file.
+   """
+   if value is None:
+      return '\\N'
+   return str(value).translate(_TSV_ESCAPE_TABLE)
+
+class _ReiterableZip(object):
+   """
+Lazy ``zip`` of sequences which can be iterated more than once.
+   """
+   def __init__(self, *columns):
+      self.columns = columns
+
+   def __iter__(self):
+      return zip(*self.columns)
 
 class DirectDBAccess(DBAccessInterface):
    """
 DirectDBAccess class play a role as mysqlclient and provide methods to interact
 with TestResultWebApp's database.
    """
-   __single = None
-
    __NUM_BUFFERD_ELEMENTS_FOR_EXECUTEMANY=100
 
-   #make the DirectDBAccess to singleton
-   #! __new__ requires inheritance from "object" !
-   def __new__(classtype, *args, **kwargs):
-      """
-Create object method to make singleton class ``DirectDBAccess``.
-      """
-      # Check to see if a __single exists already for this class
-      # Compare class types instead of just looking for None so
-      # that subclasses will create their own __single objects
-      if classtype != type(classtype.__single):
-         classtype.__single = object.__new__(classtype)
-      return classtype.__single
+   # error codes which tell that the server/client refuses LOAD DATA LOCAL INFILE:
+   # ER_NOT_ALLOWED_COMMAND, CR_LOAD_DATA_LOCAL_INFILE_REJECTED, ER_CLIENT_LOCAL_FILES_DISABLED
+   __LOCAL_INFILE_REFUSED_ERRORS = (1148, 2068, 3948)
+
+   # ER_NET_PACKET_TOO_LARGE
+   __PACKET_TOO_LARGE_ERROR = 1153
+
+   # ER_NET_PACKET_TOO_LARGE (server), CR_NET_PACKET_TOO_LARGE (client)
+   __STATEMENT_TOO_LARGE_ERRORS = (1153, 2020)
+
+   # innodb_autoinc_lock_mode "traditional" and "consecutive" assign consecutive
+   # auto-increment values to the rows of one multi-row insert
+   __CONSECUTIVE_AUTOINC_LOCK_MODES = (0, 1)
+
+   # maximum number of file IDs per integrity check statement
+   __NUM_FILE_IDS_PER_INTEGRITY_CHECK = 1000
 
-   def __init__(self):
+   def __init__(self, pool=None, bulk_load=False, flush_policy=None,
+                      background_writer=False, writer_queue_size=1, commit_policy=None,
+                      deferred_updates=False, metadata_cache_size=1024):
       """
 Initializer of class ``DirectDBAccess``.
+
+**Arguments:**
+
+*  ``pool``
+
+   / *Condition*: optional / *Type*: DirectDBConnectionPool / *Default*: None /
+
+   If given, ``connect()`` checks out a connection from this pool and
+   ``disconnect()`` returns it instead of closing it.
+
+*  ``bulk_load``
+
+   / *Condition*: optional / *Type*: bool / *Default*: False /
+
+   If True, buffered test cases are uploaded with ``LOAD DATA LOCAL INFILE``
+   instead of ``executemany``. The connection is opened with ``local_infile``
+   enabled (a given pool must be created with ``local_infile=1``).
+   If the server refuses local infile, ``bBulkLoad`` is set to False and the
+   ``executemany`` path is used.
+
+*  ``flush_policy``
+
+   / *Condition*: optional / *Type*: AdaptiveFlushPolicy / *Default*: None /
+
+   Policy which decides when buffered test cases are flushed. By default an
+   ``AdaptiveFlushPolicy`` which starts with ``__NUM_BUFFERD_ELEMENTS_FOR_EXECUTEMANY``
+   rows is used.
+
+*  ``background_writer``
+
+   / *Condition*: optional / *Type*: bool / *Default*: False /
+
+   If True, buffered test cases are uploaded by a dedicated writer thread
+   (write-behind): the caller fills the next buffer while the writer flushes the
+   previous one. Errors of the writer are raised at the next flush,
+   ``vFinishTestResult()``, ``commit()`` or ``disconnect()``.
+
+*  ``writer_queue_size``
+
+   / *Condition*: optional / *Type*: int / *Default*: 1 /
+
+   Number of full buffers which may wait for the writer thread before
+   ``nCreateNewTestCase()`` blocks.
+
+*  ``commit_policy``
+
+   / *Condition*: optional / *Type*: CommitPolicy / *Default*: None /
+
+   Policy which decides when the running transaction is committed automatically
+   (per N rows, per file, per result or every T seconds) and whether failed bulk
+   insert batches are retried. By default the transaction is only committed by
+   ``commit()`` and ``disconnect()``.
+
+*  ``deferred_updates``
+
+   / *Condition*: optional / *Type*: bool / *Default*: False /
+
+   If True, the updates of ``tbl_result`` (``vSetCategory()``,
+   ``vCreateReanimation()``, ``vUpdateStartEndTime()``, ``vUpdateResultEndTime()``
+   and ``vFinishTestResult()``) are collected per result and written with one
+   ``UPDATE`` by ``flush()``. Pending updates of a result are written before it
+   is read, finished or passed to a stored procedure, and before ``commit()`` and
+   ``disconnect()``.
+
+*  ``metadata_cache_size``
+
+   / *Condition*: optional / *Type*: int / *Default*: 1024 /
+
+   Maximum number of entries of the per-connection ``MetadataCache``, which
+   answers ``bExistingResultID()``, ``arGetProjectVersionSWByID()`` and
+   ``sGetLatestFileID()`` from the own writes and earlier reads without a round
+   trip. 0 disables the cache.
       """
+      self.pool = pool
+      self.bBulkLoad = bulk_load
+      if flush_policy is None:
+         flush_policy = AdaptiveFlushPolicy(initial_rows=DirectDBAccess.__NUM_BUFFERD_ELEMENTS_FOR_EXECUTEMANY)
+      self.oFlushPolicy = flush_policy
+      if commit_policy is None:
+         commit_policy = CommitPolicy()
+      self.oCommitPolicy = commit_policy
       self.con = None
       self.db = None
-      self.lTestCases = []
+      self.oStatements = None
+      self.__oCursor = None
+      self.dStatistics = {}
+      self.sTarget = None
+      self.oTestCaseBuffer = TestCaseBuffer(self.oFlushPolicy.nBatchRows)
+      # cleared buffers which were uploaded by the writer thread
+      self.__dqFreeBuffers = deque()
+      # buffered test cases which were dropped by a failed upload, reported with
+      # the upload error
+      self.__nLostTestCases  = 0
+      self.__setLostFileIDs = set()
+      self.nAutoIncrementIncrement = 1
+      self.bConsecutiveAutoInc = False
+      self.bBackgroundWriter = background_writer
+      self.nWriterQueueSize = writer_queue_size
+      self.__oWriter = None
+      # serializes the use of the connection by caller and writer thread
+      self.__oConLock = threading.RLock()
+      self.__bBulkLoadSession = False
+      self.__setBulkLoadFileIDs = set()
+      self.bDeferredUpdates = deferred_updates
+      # test_result_id -> {column: value} of the deferred tbl_result updates
+      self.__dPendingResultUpdates = OrderedDict()
+      self.oMetadataCache = MetadataCache(metadata_cache_size)
+      # project keys inserted in the running transaction, published to
+      # oProjectKeyCache when it is committed
+      self.__setPendingProjectKeys = set()
 
    def __del__(self):
       pass
@@ -77,6 +258,9 @@ Initializer of class ``DirectDBAccess``.
       """
 Connect to the database with provided authentication and db info.
 
+If this instance was created with a connection pool, the connection is checked
+out from the pool and the arguments can be omitted.
+
 **Arguments:**
 
 *  ``host``
@@ -120,23 +304,95 @@ Connect to the database with provided authentication and db info.
 
 (*no returns*)
       """
+      vImportMySQLdb(globals())
+
+      if self.pool is not None:
+         self.db  = self.pool.database
+         self.sTarget = "%s/%s" % (self.pool.host, self.db)
+         self.con = self.pool.checkout()
+      else:
+         if (host==None or user==None or passwd==None or database==None):
+            raise Exception("host, user, passwd and database need to be provided!")
+
+         self.db = database
+         self.sTarget = "%s/%s" % (host, self.db)
+
+         # default encoding of python is latin-1,
+         # therefore we force mysql to convert to encode to utf8.
+         dConnectArgs = {}
+         if self.bBulkLoad:
+            dConnectArgs['local_infile'] = 1
+         self.con = db.connect(host,user,passwd,db=database,charset=charset,use_unicode=use_unicode,
+                               **dConnectArgs)
+         #for test purpose activate autocommit with (True)
+         self.con.autocommit(False)
+         print("Successfully connected to: %s@%s" % (self.db, host))
+
+      self.__vInitSession()
+
+   def __vInitSession(self):
+      """
+Initialize the per-connection state after ``connect()``:
+
+* Compile the SQL statements for the connected database.
+* Reset the test case buffer, the cursor and the metadata cache of the previous
+  connection.
+* Read ``max_allowed_packet`` of the server for the flush policy.
+* Read the auto-increment settings for ``arCreateNewTestCases()``.
+* Start the writer thread in background writer mode.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.oTestCaseBuffer.vClear()
+      self.__oCursor = None
+      self.oMetadataCache.vClear()
+      self.__setPendingProjectKeys.clear()
+      if self.oStatements is None or self.oStatements.database != self.db:
+         self.oStatements = StatementRegistry(self.db)
+      res = self.__arExec(self.oStatements['connect:server_settings'], bHasResponse=True)
+      nMaxAllowedPacket, nAutoIncrementIncrement, nAutoIncLockMode = res[0]
+      self.oFlushPolicy.vSetMaxAllowedPacket(nMaxAllowedPacket)
+      self.nAutoIncrementIncrement = int(nAutoIncrementIncrement)
+      self.bConsecutiveAutoInc = nAutoIncLockMode is not None and \
+                                 int(nAutoIncLockMode) in DirectDBAccess.__CONSECUTIVE_AUTOINC_LOCK_MODES
+      if self.bBackgroundWriter and self.__oWriter is None:
+         self.__oWriter = BackgroundWriter(self.__vUploadAndRecycleBuffer,
+                                           queue_size=self.nWriterQueueSize,
+                                           fnDiscard=self.__vDiscardBuffer)
+
+   def __vWaitForWriter(self):
+      """
+Wait until the writer thread has flushed all handed over test cases and raise
+its first error (if any, see ``__vRaiseLostTestCases()``). Nothing to do without
+background writer.
 
-      if (host==None or user==None or passwd==None or database==None):
-         raise Exception("host, user, passwd and database need to be provided!")
+**Arguments:**
 
-      self.db = database
+(*no arguments*)
+
+**Returns:**
 
-      # default encoding of python is latin-1,
-      # therefore we force mysql to convert to encode to utf8.
-      self.con = db.connect(host,user,passwd,db=database,charset=charset,use_unicode=use_unicode)
-      #for test purpose activate autocommit with (True)
-      self.con.autocommit(False)
-      print("Successfully connected to: %s@%s" % (self.db, host))
+(*no returns*)
+      """
+      if self.__oWriter is not None:
+         try:
+            self.__oWriter.vBarrier()
+         except Exception as error:
+            self.__vRaiseLostTestCases(error)
 
    def commit(self):
       """
 Commit changes within transaction. 
 
+In background writer mode, all test cases which were handed over to the writer
+thread are flushed before and its errors are raised.
+
 **Arguments:**
 
 (*no arguments*)
@@ -145,12 +401,135 @@ Commit changes within transaction.
 
 (*no returns*)
       """
-      self.con.commit()
+      self.__vWaitForWriter()
+      self.flush()
+      self.__vCommit()
+
+   def __vCommit(self):
+      """
+Commit the running transaction and record its duration in the commit policy.
+
+The projects inserted in the transaction are added to ``oProjectKeyCache`` after
+the commit succeeded. If the commit fails, they are dropped, so the next
+``sCreateNewTestResult()`` inserts them again.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self.__oConLock:
+         try:
+            self.con.commit()
+         except BaseException:
+            self.__setPendingProjectKeys.clear()
+            raise
+         for tProjectKey in self.__setPendingProjectKeys:
+            oProjectKeyCache.vAdd(self.sTarget, *tProjectKey)
+         self.__setPendingProjectKeys.clear()
+         self.__vAccount('commit', 0, 0)
+         self.oCommitPolicy.vRecordCommit()
+
+   def __vCommitIfDue(self, sBoundary):
+      """
+Commit the running transaction if the commit policy is due at the given boundary
+(see ``CommitPolicy.bIsCommitDue()``).
+
+**Arguments:**
+
+*  ``sBoundary``
+
+   / *Condition*: required / *Type*: str /
+
+   ``rows``, ``file`` or ``result``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self.__oConLock:
+         if self.oCommitPolicy.bIsCommitDue(sBoundary):
+            self.__vCommit()
 
    def disconnect(self):
       """
 Disconnect from TestResultWebApp's database.
 
+Pending data is written and committed. If this fails, the transaction is rolled
+back and the error is raised, the connection is closed or returned to the pool
+in any case.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      try:
+         if self.__oWriter is not None:
+            oWriter, self.__oWriter = self.__oWriter, None
+            try:
+               oWriter.vStop()
+            except Exception as error:
+               self.__vRaiseLostTestCases(error)
+         self.flush()
+         self.__vCommit()
+      except BaseException:
+         try:
+            self.con.rollback()
+         except Exception:
+            pass
+         raise
+      finally:
+         self.oMetadataCache.vClear()
+         # projects of a rolled back transaction are not published
+         self.__setPendingProjectKeys.clear()
+         con, self.con = self.con, None
+         try:
+            if self.__oCursor is not None:
+               oCursor, self.__oCursor = self.__oCursor, None
+               oCursor.close()
+         finally:
+            if self.pool is not None:
+               self.pool.checkin(con)
+            else:
+               con.close()
+
+   def __vDeferResultUpdate(self, _tbl_test_result_id, **dColumns):
+      """
+Collect column updates of a ``tbl_result`` row for ``flush()``. A later value of
+a column replaces the earlier one.
+      """
+      with self.__oConLock:
+         self.__dPendingResultUpdates.setdefault(_tbl_test_result_id, {}).update(dColumns)
+
+   def __vFlushResultUpdates(self, _tbl_test_result_id):
+      """
+Write the deferred updates of one result with a single ``UPDATE`` (if any).
+      """
+      with self.__oConLock:
+         dColumns = self.__dPendingResultUpdates.pop(_tbl_test_result_id, None)
+         if not dColumns:
+            return
+         tColumns = tuple(sorted(dColumns))
+         try:
+            self.__arExec(self.oStatements.sExpandColumns('flush:tbl_result', tColumns),
+                          tuple(dColumns[sColumn] for sColumn in tColumns) + (_tbl_test_result_id,))
+         except Exception:
+            # keep them for the next flush, newer updates of the columns win
+            dColumns.update(self.__dPendingResultUpdates.get(_tbl_test_result_id, {}))
+            self.__dPendingResultUpdates[_tbl_test_result_id] = dColumns
+            raise
+
+   def flush(self):
+      """
+Write the deferred updates of all results, one ``UPDATE`` per result.
+
 **Arguments:**
 
 (*no arguments*)
@@ -159,8 +538,9 @@ Disconnect from TestResultWebApp's database.
 
 (*no returns*)
       """
-      self.con.commit()
-      self.con.close()
+      with self.__oConLock:
+         for _tbl_test_result_id in list(self.__dPendingResultUpdates):
+            self.__vFlushResultUpdates(_tbl_test_result_id)
 
    def cleanAllTables(self):
       """
@@ -174,37 +554,193 @@ Delete all table data. Please be careful before calling this method.
 
 (*no returns*)
       """
+      self.__vWaitForWriter()
       print(">> Deleting all table data!")
-      sql="""delete from """ + self.db + """.evtbl_result_main where test_result_id!="" """
-      self.__arExec(sql)
-      sql="""delete from """ + self.db + """.evtbl_failed_unknown_per_component where test_result_id!="" """
-      self.__arExec(sql)
-      sql="""delete from """ + self.db + """.tbl_usr_case where test_case_id>0"""
-      self.__arExec(sql)
-      sql="""delete from """ + self.db + """.tbl_usr_case_history where test_case_id>0"""
-      self.__arExec(sql)
-      sql="""delete from """ + self.db + """.tbl_usr_comments where test_case_id>0"""
-      self.__arExec(sql)
-      sql="""delete from """ + self.db + """.tbl_usr_links where test_case_id>0"""
-      self.__arExec(sql)
-      sql="""delete from """ + self.db + """.tbl_usr_result where test_result_id!="" """
-      self.__arExec(sql)
-      sql="""delete from """ + self.db + """.tbl_usr_result_history where test_result_id!="" """
-      self.__arExec(sql)
-
-      sql="""delete from """ + self.db + """.tbl_file_header where file_id>0"""
-      self.__arExec(sql)
-      sql="""delete from """ + self.db + """.tbl_case where test_case_id>0"""
-      self.__arExec(sql)
-      sql="""delete from """ + self.db + """.tbl_file where file_id>0"""
-      self.__arExec(sql)
-      sql="""delete from """ + self.db + """.tbl_result where test_result_id!="" """
-      self.__arExec(sql)
-      sql="""delete from """ + self.db + """.tbl_prj where project<>"a" """
-      self.__arExec(sql)
-      self.con.commit()
-
-   def __arExec(self, command, values=None, bHasResponse=False, bReturnInsertedID=False):
+      for sql in self.oStatements['cleanAllTables']:
+         self.__arExec(sql)
+      oProjectKeyCache.vClear(self.sTarget)
+      self.__setPendingProjectKeys.clear()
+      self.oMetadataCache.vClear()
+      self.__vCommit()
+
+   def dGetStatistics(self):
+      """
+Get the round trip accounting of this instance.
+
+The counters are collected per public method which executed the statements
+(``commit`` for commits, ``other`` for statements outside the registry).
+Buffered test case uploads are accounted to ``nCreateNewTestCase``. The
+``foreign_key_checks`` toggles around an upload (two round trips per batch) are
+accounted to the upload method as well (``nCreateNewTestCase`` or
+``arCreateNewTestCases``), ``vEnableForeignKeyCheck`` only counts its own calls.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+   / *Type*: dict /
+
+   ``{method: {'round_trips': int, 'rows': int, 'bytes': int}}`` with the number
+   of round trips, the affected (or fetched) rows and the estimated bytes sent.
+      """
+      with self.__oConLock:
+         return {sMethod: dict(dCounters) for sMethod, dCounters in self.dStatistics.items()}
+
+   def dGetTransactionStatistics(self):
+      """
+Get the transaction metrics of the commit policy.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+   / *Type*: dict /
+
+   See ``CommitPolicy.dGetStatistics()``.
+      """
+      with self.__oConLock:
+         return self.oCommitPolicy.dGetStatistics()
+
+   @contextmanager
+   def oBulkLoadSession(self, foreign_key_checks=False, unique_checks=False, verify=True):
+      """
+Context manager for a bulk upload which sets the session variables
+``FOREIGN_KEY_CHECKS`` and ``UNIQUE_CHECKS`` once for the whole upload instead of
+toggling the foreign key checks around each flush of buffered test cases.
+
+On exit, the remaining test cases are flushed and the previous values of the
+session variables are restored. Then one set-based integrity check verifies that
+all test cases inserted within the session belong to an existing file and result.
+
+.. code:: python
+
+   with oDBAccess.oBulkLoadSession():
+      for ... :
+         oDBAccess.nCreateNewTestCase(...)
+      oDBAccess.vFinishTestResult(result_id)
+
+**Arguments:**
+
+*  ``foreign_key_checks``
+
+   / *Condition*: optional / *Type*: bool / *Default*: False /
+
+   Value of ``FOREIGN_KEY_CHECKS`` within the session.
+
+*  ``unique_checks``
+
+   / *Condition*: optional / *Type*: bool / *Default*: False /
+
+   Value of ``UNIQUE_CHECKS`` within the session.
+
+*  ``verify``
+
+   / *Condition*: optional / *Type*: bool / *Default*: True /
+
+   If True, run the integrity check after the session.
+
+**Returns:**
+
+*  / *Type*: DirectDBAccess /
+
+   This instance.
+      """
+      if self.__bBulkLoadSession:
+         raise Exception("Bulk load session is already active!")
+      # buffered test cases of before are flushed with the previous settings
+      if len(self.oTestCaseBuffer) > 0:
+         self.__vFlushTestCases()
+      self.__vWaitForWriter()
+      with self.__oConLock:
+         arSaved = tuple(self.__arExec(self.oStatements['oBulkLoadSession:read'], bHasResponse=True)[0])
+         self.__arExec(self.oStatements['oBulkLoadSession:set'], (int(foreign_key_checks),
+                                                                  int(unique_checks)))
+         self.__setBulkLoadFileIDs = set()
+         self.__bBulkLoadSession = True
+      try:
+         yield self
+         if len(self.oTestCaseBuffer) > 0:
+            self.__vFlushTestCases()
+         self.__vWaitForWriter()
+      finally:
+         with self.__oConLock:
+            self.__bBulkLoadSession = False
+            self.__arExec(self.oStatements['oBulkLoadSession:set'], arSaved)
+      if verify:
+         self.__vVerifyBulkLoad(sorted(self.__setBulkLoadFileIDs))
+
+   def __vVerifyBulkLoad(self, lFileIDs):
+      """
+Verify that the test cases of given files reference an existing file of the same
+result and an existing result.
+
+**Arguments:**
+
+*  ``lFileIDs``
+
+   / *Condition*: required / *Type*: list /
+
+   IDs of the files whose test cases were inserted within the bulk load session.
+
+**Returns:**
+
+(*no returns*)
+      """
+      arOrphans = []
+      nChunk = DirectDBAccess.__NUM_FILE_IDS_PER_INTEGRITY_CHECK
+      for i in range(0, len(lFileIDs), nChunk):
+         lValues = lFileIDs[i:i+nChunk]
+         sql = self.oStatements.sExpand('oBulkLoadSession:integrity_check', len(lValues))
+         arOrphans.extend(self.__arExec(sql, tuple(lValues), bHasResponse=True))
+      if arOrphans:
+         raise Exception("Integrity check of bulk load failed, test cases without file or result: %s" %
+                         ", ".join("file_id %s (%s rows)" % (file_id, nRows) for file_id, nRows in arOrphans))
+
+   def vResetStatistics(self):
+      """
+Reset the round trip accounting.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.dStatistics = {}
+
+   def __vAccount(self, sMethod, nRows, nBytes, nRoundTrips=1):
+      """
+Add the cost of one statement to the counters of given method.
+      """
+      dCounters = self.dStatistics.get(sMethod)
+      if dCounters is None:
+         dCounters = self.dStatistics[sMethod] = {'round_trips': 0, 'rows': 0, 'bytes': 0}
+      dCounters['round_trips'] += nRoundTrips
+      dCounters['rows']        += max(nRows, 0)
+      dCounters['bytes']       += nBytes
+
+   def __oGetCursor(self):
+      """
+Get the long-lived cursor of the current connection.
+
+**Returns:**
+
+   / *Type*: MySQLdb cursor /
+
+   The cursor, created at the first use after ``connect()``.
+      """
+      if self.__oCursor is None:
+         self.__oCursor = self.con.cursor()
+      return self.__oCursor
+
+   def __arExec(self, command, values=None, bHasResponse=False, bReturnInsertedID=False,
+                sMethod=None):
       """
 Execute a query. By default don't try to fetch a result.
 
@@ -234,6 +770,13 @@ Execute a query. By default don't try to fetch a result.
 
    If True, the lastrowid will be returned.
 
+*  ``sMethod``
+
+   / *Condition*: optional / *Type*: str / *Default*: None /
+
+   Method to which the round trip is accounted, the method of the statement in
+   the registry if not given.
+
 **Returns:**
 
 *  ``arRes``
@@ -243,19 +786,27 @@ Execute a query. By default don't try to fetch a result.
    List of reponse data (or lastrowid if bReturnInsertedID is set).
       """
       arRes = None
-      c = self.con.cursor()
-      c.execute(command,values)
-      if bHasResponse:
-         arRes = c.fetchall()
-      elif bReturnInsertedID:
-         arRes = c.lastrowid
-      c.close()
+      with self.__oConLock:
+         self.oCommitPolicy.vRecordStatement()
+         c = self.__oGetCursor()
+         c.execute(command,values)
+         if bHasResponse:
+            arRes = c.fetchall()
+         elif bReturnInsertedID:
+            arRes = c.lastrowid
+         nBytes = len(command)
+         if values is not None:
+            nBytes += self.oFlushPolicy.nRowSize(values)
+         self.__vAccount(sMethod or self.oStatements.sMethodOf(command), c.rowcount, nBytes)
       return arRes
 
-   def __vExecMany(self, command, values=None):
+   def __vExecMany(self, command, values=None, nMaxStmtLength=None):
       """
 Execute a query for bulk insert of many elements. No response expected.
 
+The values should fit into one statement of ``nMaxStmtLength``, then this is
+accounted as one round trip.
+
 **Arguments:**
 
 *  ``command``
@@ -270,13 +821,38 @@ Execute a query for bulk insert of many elements. No response expected.
 
    Sequence of parameters to be used with the query.
 
+*  ``nMaxStmtLength``
+
+   / *Condition*: optional / *Type*: int / *Default*: None /
+
+   Maximum length of one multi-row insert statement which is built by
+   ``executemany``. If None, the driver's default (64 KiB) is used.
+
 **Returns:**
 
-(*no returns*)
+*  ``nLastRowID``
+
+   / *Type*: int /
+
+   The lastrowid of the last executed statement (for a multi-row insert the ID
+   of its first row).
       """
-      c = self.con.cursor()
-      c.executemany(command,values)
-      c.close()
+      with self.__oConLock:
+         self.oCommitPolicy.vRecordStatement()
+         c = self.__oGetCursor()
+         if nMaxStmtLength is None:
+            c.executemany(command,values)
+         else:
+            # the cursor is reused by later statements, so its limit is restored
+            nPrevStmtLength = c.max_stmt_length
+            c.max_stmt_length = nMaxStmtLength
+            try:
+               c.executemany(command,values)
+            finally:
+               c.max_stmt_length = nPrevStmtLength
+         nBytes = len(command) + sum(map(self.oFlushPolicy.nRowSize, values))
+         self.__vAccount(self.oStatements.sMethodOf(command), c.rowcount, nBytes)
+         return c.lastrowid
 
    def __nGetLastInsertID(self, tbl):
       """
@@ -406,22 +982,18 @@ linked to all other data by means of ``test_result_id``.
 
    ``test_result_id`` of new test result.
       """
-      sql,sqlval = """select count(*) from """ + self.db + """.tbl_prj where
-               (project=%s and variant=%s and branch=%s)""", (_tbl_prj_project,
-                                                              _tbl_prj_variant,
-                                                              _tbl_prj_branch)
-      res = self.__arExec(sql,sqlval,True)[0][0]
-      if res == 0:
-         sql,sqlval = """insert into """ + self.db + """.tbl_prj
-         ( variant,project, branch) values (%s, %s, %s)""" , (_tbl_prj_variant,
-                                                              _tbl_prj_project,
-                                                              _tbl_prj_branch)
+      tProjectKey = (_tbl_prj_project, _tbl_prj_variant, _tbl_prj_branch)
+      if tProjectKey not in self.__setPendingProjectKeys and \
+         not oProjectKeyCache.bContains(self.sTarget, *tProjectKey):
+         # idempotent upsert: concurrent uploaders cannot race on the same project
+         sql,sqlval = self.oStatements['sCreateNewTestResult:tbl_prj'], (_tbl_prj_variant,
+                                                                        _tbl_prj_project,
+                                                                        _tbl_prj_branch)
          self.__arExec(sql,sqlval)
+         # shared with other connections only after the commit (see __vCommit())
+         self.__setPendingProjectKeys.add(tProjectKey)
 
-      sql,sqlval = """insert into """ + self.db + """.tbl_result (test_result_id,
-         variant,project,branch, time_start,time_end, version_sw_target,
-         version_sw_test,version_hardware,jenkinsurl,reporting_qualitygate,result_state)
-         values (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)""" , (_tbl_test_result_id,
+      sql,sqlval = self.oStatements['sCreateNewTestResult:tbl_result'], (_tbl_test_result_id,
                                                             _tbl_prj_variant,
                                                             _tbl_prj_project,
                                                             _tbl_prj_branch,
@@ -436,10 +1008,12 @@ linked to all other data by means of ``test_result_id``.
       self.__arExec(sql,sqlval)
 
       if _tbl_result_interpretation!='':
-         sql,sqlval = """update """ + self.db + """.tbl_result set interpretation=%s
-            where test_result_id='""" + _tbl_test_result_id + "'", (_tbl_result_interpretation,)
+         sql,sqlval = self.oStatements['sCreateNewTestResult:interpretation'], (_tbl_result_interpretation,
+                                                                               _tbl_test_result_id)
          self.__arExec(sql,sqlval)
 
+      self.oMetadataCache.vSet('result', _tbl_test_result_id,
+                               (_tbl_prj_project, _tbl_result_version_sw_target))
       return _tbl_test_result_id
 
    def nCreateNewFile(self,_tbl_file_name,
@@ -452,6 +1026,9 @@ linked to all other data by means of ``test_result_id``.
       """
 Create new file entry in ``tbl_file`` table.
 
+A new file ends the previous one: if the commit policy is due, the buffered test
+cases are flushed and the running transaction is committed before.
+
 **Arguments:**
 
 *  ``_tbl_file_name``
@@ -504,9 +1081,12 @@ Create new file entry in ``tbl_file`` table.
 
    ID of new entry.
       """
-      sql,sqlval ="""insert into """ + self.db + """.tbl_file (name,tester_account,
-                     tester_machine,time_start,time_end,test_result_id,origin)
-                     values (%s,%s,%s,%s,%s,%s,%s)""" , ( _tbl_file_name,
+      if self.oCommitPolicy.bIsCommitDue('file'):
+         if len(self.oTestCaseBuffer) > 0:
+            self.__vFlushTestCases()
+         self.__vWaitForWriter()
+         self.__vCommitIfDue('file')
+      sql,sqlval = self.oStatements['nCreateNewFile'], ( _tbl_file_name,
                                                          _tbl_file_tester_account,
                                                          _tbl_file_tester_machine,
                                                          _tbl_file_time_start,
@@ -514,6 +1094,8 @@ Create new file entry in ``tbl_file`` table.
                                                          _tbl_test_result_id,
                                                          _tbl_file_origin)
       iInsertedID = self.__arExec(sql,sqlval, bReturnInsertedID=True)
+      # the new file has the highest ID of the result
+      self.oMetadataCache.vSet('latest_file', _tbl_test_result_id, iInsertedID)
       return iInsertedID
 
    def vCreateNewHeader(self, _tbl_file_id,
@@ -724,40 +1306,7 @@ Create a new header entry in ``tbl_file_header`` table which is linked with the
 
 (*no returns*)
       """
-      sql,sqlval ="""insert into """ + self.db + """.tbl_file_header
-                        ( file_id,
-                          testtoolconfiguration_testtoolname,
-                          testtoolconfiguration_testtoolversionstring,
-                          testtoolconfiguration_projectname,
-                          testtoolconfiguration_logfileencoding,
-                          testtoolconfiguration_pythonversion,
-                          testtoolconfiguration_testfile,
-                          testtoolconfiguration_logfilepath,
-                          testtoolconfiguration_logfilemode,
-                          testtoolconfiguration_ctrlfilepath,
-                          testtoolconfiguration_configfile,
-                          testtoolconfiguration_confname,
-
-                          testfileheader_author,
-                          testfileheader_project,
-                          testfileheader_testfiledate,
-                          testfileheader_version_major,
-                          testfileheader_version_minor,
-                          testfileheader_version_patch,
-                          testfileheader_keyword,
-                          testfileheader_shortdescription,
-                          testexecution_useraccount,
-                          testexecution_computername,
-
-                          testrequirements_documentmanagement,
-                          testrequirements_testenvironment,
-
-                          testbenchconfig_name,
-                          testbenchconfig_data,
-                          preprocessor_filter,
-                          preprocessor_parameters)
-                  values ( %s, %s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s, %s,
-                           %s, %s, %s,%s,%s,%s,%s,%s,%s,%s,%s,%s)""" , \
+      sql,sqlval = self.oStatements['vCreateNewHeader'], \
                         ( _tbl_file_id,
                           _tbl_header_testtoolconfiguration_testtoolname,
                           _tbl_header_testtoolconfiguration_testtoolversionstring,
@@ -913,10 +1462,7 @@ Create single testcase entry in ``tbl_case`` table immediately.
       """
       if _tbl_case_lastlog == "":
          _tbl_case_lastlog = None
-      sql = """insert into """ + self.db + """.tbl_case (name, issue, tcid, fid,
-               testnumber, repeatcount, component, time_start, result_main, result_state,
-               result_return, counter_resets, lastlog, test_result_id, file_id)
-               values (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)"""
+      sql = self.oStatements['nCreateNewSingleTestCase']
       sqlval = (_tbl_case_name,
                 _tbl_case_issue,
                 _tbl_case_tcid,
@@ -960,7 +1506,7 @@ Create single testcase entry in ``tbl_case`` table immediately.
       """
 Create bulk of test case entries: new test cases are buffered and inserted as bulk.
 
-Once ``__NUM_BUFFERD_ELEMENTS_FOR_EXECUTEMANY`` is reached, the creation query is executed.
+The buffer is flushed once the flush policy's batch size or byte budget is reached.
 
 **Arguments:**
 
@@ -1060,29 +1606,361 @@ Once ``__NUM_BUFFERD_ELEMENTS_FOR_EXECUTEMANY`` is reached, the creation query i
       """
       if _tbl_case_lastlog == "":
          _tbl_case_lastlog = None
-      sqlval = (_tbl_case_name,
-                _tbl_case_issue,
-                _tbl_case_tcid,
-                _tbl_case_fid,
-                _tbl_case_testnumber,
-                _tbl_case_repeatcount,
-                _tbl_case_component,
-                _tbl_case_time_start,
-                _tbl_case_result_main,
-                _tbl_case_result_state,
-                _tbl_case_result_return,
-                _tbl_case_counter_resets,
-                _tbl_test_result_id,
-                _tbl_file_id,
-                _tbl_case_lastlog,
-                )
-      self.lTestCases.append(sqlval)
-      if len(self.lTestCases) >= DirectDBAccess.__NUM_BUFFERD_ELEMENTS_FOR_EXECUTEMANY:
-         self.vEnableForeignKeyCheck(False)
-         self.__vUploadTestCaseListToDb(self.lTestCases)
-         self.vEnableForeignKeyCheck(True)
-         # Clear test cases list
-         self.lTestCases = []
+      oBuffer = self.oTestCaseBuffer
+      oBuffer.vAppend(_tbl_case_name,
+                      _tbl_case_issue,
+                      _tbl_case_tcid,
+                      _tbl_case_fid,
+                      _tbl_case_testnumber,
+                      _tbl_case_repeatcount,
+                      _tbl_case_component,
+                      _tbl_case_time_start,
+                      _tbl_case_result_main,
+                      _tbl_case_result_state,
+                      _tbl_case_result_return,
+                      _tbl_case_counter_resets,
+                      _tbl_test_result_id,
+                      _tbl_file_id,
+                      _tbl_case_lastlog)
+      if self.oFlushPolicy.bIsFlushDue(oBuffer.nRows, oBuffer.nBytes):
+         self.__vFlushTestCases()
+
+   def arCreateNewTestCases(self, arTestCases):
+      """
+Create many test case entries in ``tbl_case`` with multi-row inserts and return
+their IDs.
+
+Buffered test cases of ``nCreateNewTestCase()`` are flushed before, so the order
+of test cases is kept.
+
+The IDs are derived from the auto-increment range of each multi-row insert if
+the server assigns consecutive values (``innodb_autoinc_lock_mode`` 0 or 1),
+otherwise they are read with one follow-up query per insert.
+
+**Arguments:**
+
+*  ``arTestCases``
+
+   / *Condition*: required / *Type*: list /
+
+   List of test cases, each a sequence of the arguments of
+   ``nCreateNewSingleTestCase()`` in the same order.
+
+**Returns:**
+
+*  ``arIDs``
+
+   / *Type*: list /
+
+   IDs of the new entries in the order of ``arTestCases``.
+      """
+      lRows = []
+      for (name, issue, tcid, fid, testnumber, repeatcount, component, time_start,
+           result_main, result_state, result_return, counter_resets, lastlog,
+           test_result_id, file_id) in arTestCases:
+         if lastlog == "":
+            lastlog = None
+         lRows.append((name, issue, tcid, fid, testnumber, repeatcount, component,
+                       time_start, result_main, result_state, result_return,
+                       counter_resets, test_result_id, file_id, lastlog))
+      if len(self.oTestCaseBuffer) > 0:
+         self.__vFlushTestCases()
+      self.__vWaitForWriter()
+
+      arIDs = []
+      with self.__oConLock:
+         with self.__oForeignKeyChecksDisabled('arCreateNewTestCases'):
+            for lChunk in self.oFlushPolicy.arSplit(lRows):
+               arIDs.extend(self.__arInsertTestCasesReturningIDs(lChunk))
+         if self.__bBulkLoadSession:
+            self.__setBulkLoadFileIDs.update(row[13] for row in lRows)
+         self.oCommitPolicy.vRecordRows(len(lRows))
+         self.__vCommitIfDue('rows')
+      return arIDs
+
+   def __arInsertTestCasesReturningIDs(self, lRows):
+      """
+Insert the given test cases with exactly one multi-row insert statement and
+return their IDs. A statement which is too large is split in halves.
+
+**Arguments:**
+
+*  ``lRows``
+
+   / *Condition*: required / *Type*: list /
+
+   List of test case tuples in the order of ``TBL_CASE_BULK_COLUMNS``.
+
+**Returns:**
+
+*  ``arIDs``
+
+   / *Type*: list /
+
+   IDs of the new entries in the order of ``lRows``.
+      """
+      try:
+         # no statement length limit: executemany must not split the rows into
+         # several statements, otherwise lastrowid belongs to the last one only
+         nFirstID = self.__vExecMany(self.oStatements['nCreateNewTestCase'], lRows,
+                                     nMaxStmtLength=sys.maxsize)
+      except db.Error as error:
+         if len(lRows) < 2 or not error.args or \
+            error.args[0] not in DirectDBAccess.__STATEMENT_TOO_LARGE_ERRORS:
+            raise
+         nHalf = len(lRows) // 2
+         return self.__arInsertTestCasesReturningIDs(lRows[:nHalf]) + \
+                self.__arInsertTestCasesReturningIDs(lRows[nHalf:])
+
+      if self.bConsecutiveAutoInc:
+         return list(range(nFirstID,
+                           nFirstID + len(lRows) * self.nAutoIncrementIncrement,
+                           self.nAutoIncrementIncrement))
+
+      # the rows of one statement get ascending IDs starting with nFirstID,
+      # the connection is locked, so there are no other new rows of these files
+      lFileIDs = sorted(set(row[13] for row in lRows))
+      sql = self.oStatements.sExpand('arCreateNewTestCases:ids', len(lFileIDs))
+      res = self.__arExec(sql, (nFirstID, *lFileIDs, len(lRows)), bHasResponse=True)
+      if len(res) != len(lRows):
+         raise Exception("Could not get IDs of inserted test cases: %s rows inserted, %s IDs found" %
+                         (len(lRows), len(res)))
+      return [row[0] for row in res]
+
+   def __vFlushTestCases(self):
+      """
+Upload all buffered test cases and clear the buffer.
+
+In background writer mode the full buffer is queued for the writer thread (this
+blocks while the queue is full) and the caller continues with a free buffer.
+Buffers are cleared and reused after their upload.
+A single writer thread uploads the buffers in the order of their creation, so the
+order of test cases per ``file_id`` is kept.
+
+If the upload fails, the buffered test cases are dropped (a part of them may be
+written within the transaction already) and their number and files are reported
+with the raised error (see ``__vRaiseLostTestCases()``).
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      oBuffer = self.oTestCaseBuffer
+      if self.__oWriter is None:
+         try:
+            self.__vUploadTestCaseBatch(oBuffer)
+         except Exception as error:
+            self.__vRecordLostTestCases(oBuffer)
+            self.__vRaiseLostTestCases(error)
+         finally:
+            oBuffer.vClear()
+         return
+
+      if self.__dqFreeBuffers:
+         self.oTestCaseBuffer = self.__dqFreeBuffers.pop()
+      else:
+         self.oTestCaseBuffer = TestCaseBuffer(self.oFlushPolicy.nBatchRows)
+      try:
+         self.__oWriter.vSubmit(oBuffer)
+      except Exception as error:
+         # an earlier buffer failed, this one is not queued
+         self.__vDiscardBuffer(oBuffer)
+         self.__vRaiseLostTestCases(error)
+
+   def __vUploadAndRecycleBuffer(self, oBuffer):
+      """
+Upload one buffer of test cases in the writer thread and return the cleared
+buffer for reuse. The test cases of a failed upload are recorded for the error
+report.
+
+**Arguments:**
+
+*  ``oBuffer``
+
+   / *Condition*: required / *Type*: TestCaseBuffer /
+
+   Buffer of test cases for creation.
+
+**Returns:**
+
+(*no returns*)
+      """
+      try:
+         self.__vUploadTestCaseBatch(oBuffer)
+      except BaseException:
+         self.__vRecordLostTestCases(oBuffer)
+         raise
+      finally:
+         oBuffer.vClear()
+         self.__dqFreeBuffers.append(oBuffer)
+
+   def __vDiscardBuffer(self, oBuffer):
+      """
+Drop a buffer of test cases which is not uploaded after an error of the writer
+thread, record its test cases for the error report and return the cleared buffer
+for reuse.
+
+**Arguments:**
+
+*  ``oBuffer``
+
+   / *Condition*: required / *Type*: TestCaseBuffer /
+
+   Buffer of test cases which is dropped.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.__vRecordLostTestCases(oBuffer)
+      oBuffer.vClear()
+      self.__dqFreeBuffers.append(oBuffer)
+
+   def __vRecordLostTestCases(self, oBuffer):
+      """
+Record the number and the file IDs of the test cases of a dropped buffer.
+      """
+      self.__nLostTestCases += len(oBuffer)
+      self.__setLostFileIDs.update(oBuffer.arColumn(TestCaseBuffer.FILE_ID))
+
+   def __vRaiseLostTestCases(self, error):
+      """
+Raise the error of a test case upload. If buffered test cases were dropped, an
+exception with their number and file IDs is raised instead, the upload error is
+its cause.
+
+**Arguments:**
+
+*  ``error``
+
+   / *Condition*: required / *Type*: Exception /
+
+   Error of the upload.
+
+**Returns:**
+
+(*no returns*)
+      """
+      nLost, self.__nLostTestCases = self.__nLostTestCases, 0
+      setFileIDs, self.__setLostFileIDs = self.__setLostFileIDs, set()
+      if nLost == 0:
+         raise error
+      raise Exception("%s buffered test case(s) of file(s) %s are not written: %s" %
+                      (nLost, ", ".join(sorted(map(str, setFileIDs))), error)) from error
+
+   def __vUploadTestCaseBatch(self, oBuffer):
+      """
+Upload one buffer of test cases with disabled foreign key checks.
+
+Within a bulk load session (see ``oBulkLoadSession()``) the session settings are
+used and the foreign key checks are not switched per buffer.
+
+The connection is locked for the whole upload, so no statement of the caller is
+executed in between. The duration of the upload is reported to the flush policy
+to adapt the batch size. Afterwards the transaction is committed if the commit
+policy is due.
+
+If the commit policy allows batch retries, the upload is protected by a savepoint.
+
+**Arguments:**
+
+*  ``oBuffer``
+
+   / *Condition*: required / *Type*: TestCaseBuffer /
+
+   Buffer of test cases for creation.
+
+**Returns:**
+
+(*no returns*)
+      """
+      # the buffer is passed as re-iterable rows, the row tuples are built while
+      # the statements are sent
+      with self.__oConLock:
+         fStart = time.monotonic()
+         with self.__oForeignKeyChecksDisabled('nCreateNewTestCase'):
+            if self.oCommitPolicy.nBatchRetries > 0:
+               self.__vUploadTestCaseBatchWithSavepoint(oBuffer)
+            else:
+               self.__vUploadTestCaseListToDb(oBuffer)
+         if self.__bBulkLoadSession:
+            self.__setBulkLoadFileIDs.update(oBuffer.arColumn(TestCaseBuffer.FILE_ID))
+         self.oFlushPolicy.vRecordFlush(len(oBuffer), time.monotonic() - fStart)
+         self.oCommitPolicy.vRecordRows(len(oBuffer))
+         self.__vCommitIfDue('rows')
+
+   @contextmanager
+   def __oForeignKeyChecksDisabled(self, sMethod):
+      """
+Disable ``foreign_key_checks`` for the upload of test cases, outside of a bulk
+load session (which has its own setting). The checks are enabled again also if
+the upload fails, so the connection is never returned to the pool without them.
+Both round trips are accounted to the upload method ``sMethod``.
+      """
+      sql = self.oStatements['vEnableForeignKeyCheck']
+      bToggleForeignKeyCheck = not self.__bBulkLoadSession
+      if bToggleForeignKeyCheck:
+         self.__arExec(sql, (0,), sMethod=sMethod)
+      try:
+         yield
+      except BaseException:
+         if bToggleForeignKeyCheck:
+            try:
+               self.__arExec(sql, (1,), sMethod=sMethod)
+            except Exception:
+               # raise the error of the upload, the pool resets the session
+               # of a broken connection at checkin
+               pass
+         raise
+      if bToggleForeignKeyCheck:
+         self.__arExec(sql, (1,), sMethod=sMethod)
+
+   def __vUploadTestCaseBatchWithSavepoint(self, rows):
+      """
+Upload one buffer of test cases behind a savepoint.
+
+If the upload fails with a retryable error (see ``CommitPolicy.RETRYABLE_ERRORS``),
+only the rows of this batch are rolled back to the savepoint and the batch is
+retried up to ``CommitPolicy.nBatchRetries`` times. The rows written before within
+the same transaction are kept. The retries are counted in ``batch_retries`` of
+``dGetTransactionStatistics()``.
+
+**Arguments:**
+
+*  ``rows``
+
+   / *Condition*: required / *Type*: iterable /
+
+   Test cases for creation (must be iterable again for a retry, e.g. a
+   ``TestCaseBuffer``).
+
+**Returns:**
+
+(*no returns*)
+      """
+      nAttempt = 0
+      while True:
+         self.__arExec(self.oStatements['nCreateNewTestCase:savepoint'])
+         try:
+            self.__vUploadTestCaseListToDb(rows)
+         except db.Error as error:
+            if nAttempt >= self.oCommitPolicy.nBatchRetries or not error.args or \
+               error.args[0] not in CommitPolicy.RETRYABLE_ERRORS:
+               raise
+            try:
+               self.__arExec(self.oStatements['nCreateNewTestCase:rollback_savepoint'])
+            except db.Error:
+               # the whole transaction was rolled back (e.g. deadlock), nothing to retry
+               raise error
+            nAttempt += 1
+            self.oCommitPolicy.vRecordRetry()
+            continue
+         self.__arExec(self.oStatements['nCreateNewTestCase:release_savepoint'])
+         return
 
    def __vUploadTestCaseListToDb(self, lTestCases):
       """
@@ -1092,19 +1970,135 @@ Bulk insert test case results.
 
 *  ``lTestCases``
 
+   / *Condition*: required / *Type*: iterable /
+
+   Test cases for creation (must be iterable again in bulk load mode, e.g. a
+   ``TestCaseBuffer``).
+
+**Returns:**
+
+(*no returns*)
+      """
+      if self.__bLoadDataLocalInfile('nCreateNewTestCase:load_data', lTestCases):
+         return
+
+      sql = self.oStatements['nCreateNewTestCase']
+      for lChunk in self.oFlushPolicy.arSplit(lTestCases):
+         self.__vExecManySplitting(sql, lChunk)
+
+   def __vExecManySplitting(self, command, values):
+      """
+Execute ``executemany`` with one statement per chunk. If the server still rejects
+the statement as larger than ``max_allowed_packet``, the chunk is split in halves
+and retried.
+
+**Arguments:**
+
+*  ``command``
+
    / *Condition*: required / *Type*: str /
 
-   List of test case for creation.
+   Query need to be executed.
+
+*  ``values``
+
+   / *Condition*: required / *Type*: list /
+
+   Sequence of parameters to be used with the query.
 
 **Returns:**
 
 (*no returns*)
       """
-      sql = """insert into """ + self.db + """.tbl_case (name, issue, tcid, fid,
-            testnumber, repeatcount, component, time_start, result_main, result_state,
-            result_return, counter_resets, test_result_id, file_id, lastlog)
-            values (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)"""
-      self.__vExecMany(sql, lTestCases)
+      try:
+         self.__vExecMany(command, values, nMaxStmtLength=self.oFlushPolicy.nByteBudget)
+      except db.Error as error:
+         if len(values) < 2 or not error.args or \
+            error.args[0] != DirectDBAccess.__PACKET_TOO_LARGE_ERROR:
+            raise
+         nHalf = len(values) // 2
+         self.__vExecManySplitting(command, values[:nHalf])
+         self.__vExecManySplitting(command, values[nHalf:])
+
+   def __bLoadDataLocalInfile(self, sStatement, rows):
+      """
+Bulk insert rows with ``LOAD DATA LOCAL INFILE`` in bulk load mode.
+
+If the server refuses local infile, the bulk load mode is switched off
+(``bBulkLoad`` is False) and the caller has to insert the rows with
+``executemany``.
+
+**Arguments:**
+
+*  ``sStatement``
+
+   / *Condition*: required / *Type*: str /
+
+   Name of the ``load data`` statement in the registry.
+
+*  ``rows``
+
+   / *Condition*: required / *Type*: iterable /
+
+   Rows for creation (must be iterable again if the load is refused).
+
+**Returns:**
+
+   / *Type*: bool /
+
+   True if the rows are loaded, False if the bulk load mode is off.
+      """
+      if not self.bBulkLoad:
+         return False
+      try:
+         self.__vLoadDataToDb(sStatement, rows)
+         return True
+      except db.Error as error:
+         if not error.args or error.args[0] not in DirectDBAccess.__LOCAL_INFILE_REFUSED_ERRORS:
+            raise
+         self.bBulkLoad = False
+         return False
+
+   def __vLoadDataToDb(self, sStatement, rows):
+      """
+Bulk insert rows with ``LOAD DATA LOCAL INFILE``.
+
+The rows are written as escaped tab separated values to a temporary file which
+is removed again after the upload.
+
+**Arguments:**
+
+*  ``sStatement``
+
+   / *Condition*: required / *Type*: str /
+
+   Name of the ``load data`` statement in the registry.
+
+*  ``rows``
+
+   / *Condition*: required / *Type*: iterable /
+
+   Rows for creation.
+
+**Returns:**
+
+(*no returns*)
+      """
+      outfile = tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', newline='',
+                                            suffix='.tsv', delete=False)
+      try:
+         nBytes = 0
+         with outfile:
+            for row in rows:
+               sLine = '\t'.join(map(_sTSVField, row)) + '\n'
+               outfile.write(sLine)
+               nBytes += len(sLine)
+         sql = self.oStatements[sStatement]
+         self.__arExec(sql, (outfile.name,))
+         # the file content is streamed by the client within the same statement
+         self.__vAccount(self.oStatements.sMethodOf(sql), 0, nBytes, nRoundTrips=0)
+      finally:
+         os.remove(outfile.name)
 
    def vCreateTags(self, _tbl_test_result_id, _tbl_usr_result_tags):
       """
@@ -1128,8 +2122,7 @@ Create tag entries.
 
 (*no returns*)
       """
-      sql,sqlval="""insert into """ + self.db + """.tbl_usr_result (test_result_id, tags)
-                    values (%s,%s)""", (_tbl_test_result_id , _tbl_usr_result_tags)
+      sql,sqlval = self.oStatements['vCreateTags'], (_tbl_test_result_id , _tbl_usr_result_tags)
       self.__arExec(sql,sqlval)
 
    def vSetCategory(self, _tbl_test_result_id, tbl_result_category_main):
@@ -1154,10 +2147,11 @@ Create category entry.
 
 (*no returns*)
       """
-      sql="""update """ + self.db + """.tbl_result set category_main='""" + \
-                  tbl_result_category_main + """' where test_result_id='""" + \
-                  _tbl_test_result_id + "'"
-      self.__arExec(sql)
+      if self.bDeferredUpdates:
+         self.__vDeferResultUpdate(_tbl_test_result_id, category_main=tbl_result_category_main)
+         return
+      sql,sqlval = self.oStatements['vSetCategory'], (tbl_result_category_main, _tbl_test_result_id)
+      self.__arExec(sql,sqlval)
 
    def vUpdateStartEndTime(self, _tbl_test_result_id, _tbl_result_time_start, _tbl_result_time_end):
       """
@@ -1187,9 +2181,12 @@ Create start-end time entry.
 
 (*no returns*)
       """
-      sql,sqlval="""update """ + self.db + """.tbl_result set time_start=%s, time_end=%s
-                  where test_result_id='""" + _tbl_test_result_id + "'" , \
-                  (_tbl_result_time_start, _tbl_result_time_end)
+      if self.bDeferredUpdates:
+         self.__vDeferResultUpdate(_tbl_test_result_id, time_start=_tbl_result_time_start,
+                                                        time_end=_tbl_result_time_end)
+         return
+      sql,sqlval = self.oStatements['vUpdateStartEndTime'], \
+                   (_tbl_result_time_start, _tbl_result_time_end, _tbl_test_result_id)
       self.__arExec(sql,sqlval)
 
    def arGetCategories(self):
@@ -1208,7 +2205,7 @@ Get existing categories.
 
    List of exsiting categories.
       """
-      sql="""select category from """ + self.db + """.tbl_result_categories"""
+      sql=self.oStatements['arGetCategories']
       res=self.__arExec(sql, bHasResponse=True)
       arCategories=[]
       for cat in res:
@@ -1250,12 +2247,10 @@ Create abort reason entry.
 
 (*no returns*)
       """
-      sql,sqlval = """insert into """ + self.db + """.tbl_abort
-                           (test_result_id, abort_reason, msg_detail)
-                           values (%s,%s,%s)""" , (_tbl_test_result_id,
-                                                   _tbl_abort_reason,
-                                                   _tbl_abort_message,
-                                                   )
+      sql,sqlval = self.oStatements['vCreateAbortReason'], (_tbl_test_result_id,
+                                                            _tbl_abort_reason,
+                                                            _tbl_abort_message,
+                                                            )
       self.__arExec(sql,sqlval)
 
    def vCreateReanimation(self, _tbl_test_result_id, _tbl_num_of_reanimation):
@@ -1280,8 +2275,10 @@ Create reanimation entry.
 
 (*no returns*)
       """
-      sql, sqlval = """update """ + self.db + """.tbl_result set num_of_reanimation=%s where
-                        test_result_id='""" + _tbl_test_result_id + "'", (_tbl_num_of_reanimation)
+      if self.bDeferredUpdates:
+         self.__vDeferResultUpdate(_tbl_test_result_id, num_of_reanimation=_tbl_num_of_reanimation)
+         return
+      sql, sqlval = self.oStatements['vCreateReanimation'], (_tbl_num_of_reanimation, _tbl_test_result_id)
       self.__arExec(sql, sqlval)
 
    def vCreateCCRdata(self, _tbl_test_case_id, lCCRdata):
@@ -1306,19 +2303,105 @@ Create CCR data per test case.
 
 (*no returns*)
       """
-      sql = """insert into """ + self.db + """.tbl_ccr (test_case_id, timestamp, MEM, CPU) values(%s,%s,%s,%s)"""
-      sqlVals = []
-      for row in lCCRdata:
-         row.insert(0, _tbl_test_case_id)
-         sqlVals.append(tuple(row))
-      self.__vExecMany(sql, sqlVals)
+      sqlVals = [(_tbl_test_case_id, *row) for row in lCCRdata]
+      self.__vInsertCCRRows(sqlVals, len(sqlVals))
+
+   def vCreateCCRdataColumns(self, _tbl_test_case_id, timestamps, mem, cpu):
+      """
+Create CCR data per test case from columns of samples.
+
+The columns can be lists, NumPy arrays or any objects which support the buffer
+protocol (e.g. ``array.array``). They are not changed. NumPy ``datetime64``
+timestamps are formatted vectorized as ``%Y-%m-%d %H:%M:%S[.%f]``.
+
+The rows are uploaded with ``LOAD DATA LOCAL INFILE`` in bulk load mode,
+otherwise with multi-row inserts.
+
+**Arguments:**
+
+*  ``_tbl_test_case_id``
+
+   / *Condition*: required / *Type*: int /
+
+   test case ID.
+
+*  ``timestamps``
+
+   / *Condition*: required / *Type*: sequence, buffer or numpy.ndarray /
+
+   Timestamps of the samples.
+
+*  ``mem``
+
+   / *Condition*: required / *Type*: sequence, buffer or numpy.ndarray /
+
+   Memory usage of the samples.
+
+*  ``cpu``
+
+   / *Condition*: required / *Type*: sequence, buffer or numpy.ndarray /
+
+   CPU usage of the samples.
+
+**Returns:**
+
+(*no returns*)
+      """
+      arTimestamps, arMEM, arCPU = arCCRColumns(timestamps, mem, cpu)
+      # rows are created lazily per chunk, the columns are iterated again if
+      # LOAD DATA is refused
+      rows = _ReiterableZip(repeat(_tbl_test_case_id, len(arTimestamps)), arTimestamps, arMEM, arCPU)
+      self.__vInsertCCRRows(rows, len(arTimestamps))
+
+   def __vInsertCCRRows(self, rows, nRows):
+      """
+Insert CCR rows with the fastest available bulk path.
+
+**Arguments:**
+
+*  ``rows``
+
+   / *Condition*: required / *Type*: iterable /
+
+   Rows ``(test_case_id, timestamp, MEM, CPU)``, iterable again if
+   ``LOAD DATA`` is refused.
+
+*  ``nRows``
+
+   / *Condition*: required / *Type*: int /
+
+   Number of rows.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if nRows == 0:
+         return
+      with self.__oConLock:
+         if not self.__bLoadDataLocalInfile('vCreateCCRdata:load_data', rows):
+            sql = self.oStatements['vCreateCCRdata']
+            itRows = iter(rows)
+            lChunk = list(islice(itRows, 1))
+            # CCR rows have about the same size, the first one sizes the chunks
+            nRowsPerChunk = max(1, self.oFlushPolicy.nByteBudget // self.oFlushPolicy.nRowSize(lChunk[0]))
+            lChunk.extend(islice(itRows, nRowsPerChunk - 1))
+            while lChunk:
+               self.__vExecManySplitting(sql, lChunk)
+               lChunk = list(islice(itRows, nRowsPerChunk))
+         self.oCommitPolicy.vRecordRows(nRows)
+         self.__vCommitIfDue('rows')
 
    def vFinishTestResult(self,_tbl_test_result_id):
       """
 Finish upload:
 
 * First do bulk insert of rest of test cases if buffer is not empty.
-* Then set state to "new report".
+* In background writer mode, wait until the writer thread has uploaded all test
+  cases and raise its error (if any).
+* Then set state to "new report" (together with the deferred updates of the
+  result in deferred-update mode).
+* Commit the transaction if the commit policy is due at the end of a result.
 
 **Arguments:**
 
@@ -1332,13 +2415,15 @@ Finish upload:
 
 (*no returns*)
       """
-      if len(self.lTestCases) > 0:
-         self.vEnableForeignKeyCheck(False)
-         self.__vUploadTestCaseListToDb(self.lTestCases)
-         self.vEnableForeignKeyCheck(True)
-      sql="""update """ + self.db + """.tbl_result set result_state="new report"
-                  where test_result_id='""" + _tbl_test_result_id + "'"
-      self.__arExec(sql)
+      if len(self.oTestCaseBuffer) > 0:
+         self.__vFlushTestCases()
+      self.__vWaitForWriter()
+      if _tbl_test_result_id in self.__dPendingResultUpdates:
+         self.__vDeferResultUpdate(_tbl_test_result_id, result_state="new report")
+         self.__vFlushResultUpdates(_tbl_test_result_id)
+      else:
+         self.__arExec(self.oStatements['vFinishTestResult'], (_tbl_test_result_id,))
+      self.__vCommitIfDue('result')
 
    def vUpdateEvtbls(self):
       """
@@ -1352,8 +2437,8 @@ Call ``update_evtbls`` stored procedure.
 
 (*no returns*)
       """
-      sql="""call """ + self.db + """.update_evtbls();"""
-      self.__arExec(sql)
+      self.flush()
+      self.__arExec(self.oStatements['vUpdateEvtbls'])
 
    def vUpdateEvtbl(self, _tbl_test_result_id):
       """
@@ -1371,8 +2456,8 @@ Call ``update_evtbl`` stored procedure to update provided ``test_result_id``.
 
 (*no returns*)
       """
-      sql="""call """ + self.db + """.update_evtbl('%s');"""%_tbl_test_result_id
-      self.__arExec(sql)
+      self.__vFlushResultUpdates(_tbl_test_result_id)
+      self.__arExec(self.oStatements['vUpdateEvtbl'], (_tbl_test_result_id,))
 
    def vEnableForeignKeyCheck(self, enable=True):
       """
@@ -1390,8 +2475,7 @@ Switch ``foreign_key_checks`` flag.
 
 (*no returns*)
       """
-      sql = "SET FOREIGN_KEY_CHECKS=%s;" %str(int(enable))
-      self.__arExec(sql)
+      self.__arExec(self.oStatements['vEnableForeignKeyCheck'], (int(enable),))
 
    def sGetLatestFileID(self, _tbl_test_result_id):
       """
@@ -1413,8 +2497,12 @@ Get latest file ID from ``tbl_file`` table.
 
    File ID.
       """
-      sql = "SELECT MAX(file_id) FROM %s.tbl_file WHERE test_result_id='%s'"%(self.db, _tbl_test_result_id)
-      _tbl_file_id = self.__arExec(sql,bHasResponse=True)[0][0]
+      _tbl_file_id = self.oMetadataCache.oGet('latest_file', _tbl_test_result_id)
+      if _tbl_file_id is not None:
+         return _tbl_file_id
+      _tbl_file_id = self.__arExec(self.oStatements['sGetLatestFileID'], (_tbl_test_result_id,),
+                                   bHasResponse=True)[0][0]
+      self.oMetadataCache.vSet('latest_file', _tbl_test_result_id, _tbl_file_id)
       return _tbl_file_id
 
    def vUpdateFileEndTime(self, _tbl_file_id, _tbl_file_time_end):
@@ -1439,8 +2527,7 @@ Update test file end time.
 
 (*no returns*)
       """
-      sql = "UPDATE %s.tbl_file SET time_end='%s' WHERE file_id=%s"%(self.db, _tbl_file_time_end, _tbl_file_id)
-      self.__arExec(sql)
+      self.__arExec(self.oStatements['vUpdateFileEndTime'], (_tbl_file_time_end, _tbl_file_id))
 
    def vUpdateResultEndTime(self, _tbl_test_result_id, _tbl_result_time_end):
       """
@@ -1464,8 +2551,10 @@ Update test result end time.
 
 (*no returns*)
       """
-      sql = "UPDATE %s.tbl_result SET time_end='%s' WHERE test_result_id='%s'"%(self.db, _tbl_result_time_end, _tbl_test_result_id)
-      self.__arExec(sql)
+      if self.bDeferredUpdates:
+         self.__vDeferResultUpdate(_tbl_test_result_id, time_end=_tbl_result_time_end)
+         return
+      self.__arExec(self.oStatements['vUpdateResultEndTime'], (_tbl_result_time_end, _tbl_test_result_id))
 
    def bExistingResultID(self, _tbl_test_result_id):
       """
@@ -1487,11 +2576,16 @@ Verify the given test result UUID is existing in ``tbl_result`` table or not.
 
    True if test result UUID is already existing.
       """
-      sql = "SELECT test_result_id FROM %s.tbl_result WHERE test_result_id='%s'"%(self.db, _tbl_test_result_id)
-      res = self.__arExec(sql, bHasResponse=True)
+      if self.oMetadataCache.oGet('result', _tbl_test_result_id) is not None:
+         return True
+      self.__vFlushResultUpdates(_tbl_test_result_id)
+      res = self.__arExec(self.oStatements['bExistingResultID'], (_tbl_test_result_id,),
+                          bHasResponse=True)
       bExisting = False
       if res and len(res)>0:
          bExisting = True
+         # project and version are not known yet
+         self.oMetadataCache.vSet('result', _tbl_test_result_id, True)
       return bExisting
 
    def arGetProjectVersionSWByID(self, _tbl_test_result_id):
@@ -1512,9 +2606,33 @@ Get the project and version_sw information of given `test_result_id`
 
    None if test result UUID is not existing, else the tuple which contains project and version_sw: (project, variant) is returned.
       """
-      sql = "SELECT project, version_sw_target FROM %s.tbl_result WHERE test_result_id='%s'"%(self.db, _tbl_test_result_id)
-      res = self.__arExec(sql, bHasResponse=True)
+      cached = self.oMetadataCache.oGet('result', _tbl_test_result_id)
+      if isinstance(cached, tuple):
+         return cached
+      self.__vFlushResultUpdates(_tbl_test_result_id)
+      res = self.__arExec(self.oStatements['arGetProjectVersionSWByID'], (_tbl_test_result_id,),
+                          bHasResponse=True)
       if res and len(res)>0:
+         self.oMetadataCache.vSet('result', _tbl_test_result_id, tuple(res[0]))
          return res[0]
 
       return None
+
+   def vInvalidateMetadata(self, _tbl_test_result_id=None):
+      """
+Drop cached metadata, e.g. after the result has been changed or deleted by
+another client.
+
+**Arguments:**
+
+*  ``_tbl_test_result_id``
+
+   / *Condition*: optional / *Type*: str / *Default*: None /
+
+   Result UUID whose metadata is dropped, all metadata if not given.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.oMetadataCache.vInvalidate(_tbl_test_result_id)
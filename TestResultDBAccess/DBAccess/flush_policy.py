@@ -0,0 +1,227 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: flush_policy.py
+#
+# This class decides when buffered rows are flushed to the database and how
+# they are split into statements.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#
+# ******************************************************************************
+
+class AdaptiveFlushPolicy(object):
+   """
+AdaptiveFlushPolicy drives the flush of buffered rows by a byte budget and a
+batch size which adapts to the measured flush latency.
+
+*  The byte budget is derived from the server's ``max_allowed_packet``, so one
+   statement never exceeds the packet limit.
+*  The batch size (number of rows) grows while flushes are fast and shrinks
+   when they get slower than ``target_latency``.
+   """
+
+   # default of max_allowed_packet for MySQL 5.7 / MariaDB 10.1
+   DEFAULT_MAX_ALLOWED_PACKET = 4 * 1024 * 1024
+
+   # the string estimation counts characters, the escaped statement can take
+   # up to the double size, therefore only half of the packet is used
+   PACKET_USAGE_RATIO = 0.5
+
+   MIN_BYTE_BUDGET = 64 * 1024
+
+   # estimated size of a non-string value and the per-field overhead
+   # (quotes and separator) within the statement
+   VALUE_SIZE     = 8
+   FIELD_OVERHEAD = 3
+
+   def __init__(self, max_allowed_packet = DEFAULT_MAX_ALLOWED_PACKET,
+                      initial_rows       = 100,
+                      min_rows           = 10,
+                      max_rows           = 10000,
+                      target_latency     = 0.25):
+      """
+Initializer of class ``AdaptiveFlushPolicy``.
+
+**Arguments:**
+
+*  ``max_allowed_packet``
+
+   / *Condition*: optional / *Type*: int / *Default*: 4 MiB /
+
+   The server's ``max_allowed_packet`` in bytes.
+
+*  ``initial_rows``
+
+   / *Condition*: optional / *Type*: int / *Default*: 100 /
+
+   Batch size which is used until the first flush has been measured.
+
+*  ``min_rows``, ``max_rows``
+
+   / *Condition*: optional / *Type*: int / *Default*: 10, 10000 /
+
+   Limits of the adaptive batch size.
+
+*  ``target_latency``
+
+   / *Condition*: optional / *Type*: float / *Default*: 0.25 /
+
+   Desired duration of one flush in seconds.
+      """
+      self.nMinRows       = min_rows
+      self.nMaxRows       = max_rows
+      self.nBatchRows     = max(min_rows, min(initial_rows, max_rows))
+      self.fTargetLatency = target_latency
+      self.vSetMaxAllowedPacket(max_allowed_packet)
+
+   def vSetMaxAllowedPacket(self, max_allowed_packet):
+      """
+Set the byte budget of one statement from the server's ``max_allowed_packet``.
+
+**Arguments:**
+
+*  ``max_allowed_packet``
+
+   / *Condition*: required / *Type*: int /
+
+   The server's ``max_allowed_packet`` in bytes.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.nMaxAllowedPacket = int(max_allowed_packet)
+      self.nByteBudget = max(AdaptiveFlushPolicy.MIN_BYTE_BUDGET,
+                             int(self.nMaxAllowedPacket * AdaptiveFlushPolicy.PACKET_USAGE_RATIO))
+
+   @staticmethod
+   def nRowSize(row):
+      """
+Estimate the size of the given row within an insert statement.
+
+**Arguments:**
+
+*  ``row``
+
+   / *Condition*: required / *Type*: tuple /
+
+   Row values.
+
+**Returns:**
+
+   / *Type*: int /
+
+   Estimated size in bytes.
+      """
+      nSize = 0
+      for value in row:
+         if isinstance(value, str):
+            nSize += len(value)
+         else:
+            nSize += AdaptiveFlushPolicy.VALUE_SIZE
+      return nSize + len(row) * AdaptiveFlushPolicy.FIELD_OVERHEAD
+
+   def bIsFlushDue(self, nRows, nBytes):
+      """
+Check whether buffered rows have to be flushed.
+
+**Arguments:**
+
+*  ``nRows``
+
+   / *Condition*: required / *Type*: int /
+
+   Number of buffered rows.
+
+*  ``nBytes``
+
+   / *Condition*: required / *Type*: int /
+
+   Estimated size of buffered rows.
+
+**Returns:**
+
+   / *Type*: bool /
+
+   True if the batch size or the byte budget is reached.
+      """
+      return nRows >= self.nBatchRows or nBytes >= self.nByteBudget
+
+   def vRecordFlush(self, nRows, fDuration):
+      """
+Adapt the batch size to the measured duration of a flush.
+
+**Arguments:**
+
+*  ``nRows``
+
+   / *Condition*: required / *Type*: int /
+
+   Number of flushed rows.
+
+*  ``fDuration``
+
+   / *Condition*: required / *Type*: float /
+
+   Duration of the flush in seconds.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if fDuration > self.fTargetLatency:
+         self.nBatchRows = max(self.nMinRows, self.nBatchRows // 2)
+      elif fDuration < self.fTargetLatency / 2 and nRows >= self.nBatchRows:
+         # only a full batch tells that a bigger batch would still be fast
+         self.nBatchRows = min(self.nMaxRows, self.nBatchRows * 2)
+
+   def arSplit(self, lRows):
+      """
+Split the given rows into chunks which fit into the byte budget.
+
+A single row which is larger than the budget gets its own chunk.
+
+**Arguments:**
+
+*  ``lRows``
+
+   / *Condition*: required / *Type*: list /
+
+   Rows to be split.
+
+**Returns:**
+
+   / *Type*: list /
+
+   List of chunks (lists of rows).
+      """
+      arChunks = []
+      lChunk   = []
+      nBytes   = 0
+      for row in lRows:
+         nRowSize = self.nRowSize(row)
+         if lChunk and nBytes + nRowSize > self.nByteBudget:
+            arChunks.append(lChunk)
+            lChunk = []
+            nBytes = 0
+         lChunk.append(row)
+         nBytes += nRowSize
+      if lChunk:
+         arChunks.append(lChunk)
+      return arChunks
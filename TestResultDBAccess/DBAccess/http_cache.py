@@ -0,0 +1,271 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: http_cache.py
+#
+# LRU cache of parsed REST API responses with conditional revalidation
+# (ETag / Last-Modified) for the read endpoints of RestApiDBAccess.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#
+# ******************************************************************************
+
+import threading
+import time
+from collections import OrderedDict
+
+class RestResponseCache(object):
+   """
+RestResponseCache is an LRU cache of the parsed data of successful GET responses.
+
+*  An entry is fresh for the time to live of its resource (``ttls``, by the first
+   segment of the resource path, e.g. ``results`` for ``results/<id>``) and is
+   returned without a request.
+*  A stale entry with an ``ETag`` or ``Last-Modified`` validator is revalidated
+   with ``If-None-Match`` / ``If-Modified-Since``, a ``304 Not Modified``
+   response keeps the cached data.
+*  Responses with ``Cache-Control: no-store`` are not cached. ``RestApiDBAccess``
+   does not cache empty data (e.g. of not existing results) either.
+
+The cache is thread-safe.
+   """
+
+   # default time to live in seconds per resource, other resources are not cached
+   TTLS = {
+      'categories' : 300,
+      'results'    : 30,
+   }
+
+   def __init__(self, ttls=None, max_size=256):
+      """
+Initializer of class ``RestResponseCache``.
+
+**Arguments:**
+
+*  ``ttls``
+
+   / *Condition*: optional / *Type*: dict / *Default*: None /
+
+   Time to live in seconds per resource, ``TTLS`` if not given. 0 revalidates
+   the entry at each access.
+
+*  ``max_size``
+
+   / *Condition*: optional / *Type*: int / *Default*: 256 /
+
+   Maximum number of entries. The least recently used entry is dropped first.
+      """
+      self.dTTLs    = dict(self.TTLS if ttls is None else ttls)
+      self.nMaxSize = max_size
+      self.__oLock    = threading.Lock()
+      self.__dEntries = OrderedDict()
+      self.vResetStatistics()
+
+   @staticmethod
+   def __sResourceType(resource):
+      return resource.split('?')[0].split('/')[0]
+
+   def bIsCached(self, resource):
+      """
+Check whether responses of the resource are cached.
+
+**Arguments:**
+
+*  ``resource``
+
+   / *Condition*: required / *Type*: str /
+
+   Resource path, e.g. ``results/<id>``.
+
+**Returns:**
+
+   / *Type*: bool /
+
+   True if the resource has a time to live.
+      """
+      return self.__sResourceType(resource) in self.dTTLs
+
+   def tLookup(self, url):
+      """
+Look up the cached data of a URL.
+
+**Arguments:**
+
+*  ``url``
+
+   / *Condition*: required / *Type*: str /
+
+   URL of the GET request.
+
+**Returns:**
+
+   / *Type*: tuple /
+
+   ``(data, fresh, headers)``: the cached data, whether it is fresh and the
+   conditional request headers to revalidate it. ``(None, False, {})`` if the
+   URL is not cached.
+      """
+      with self.__oLock:
+         entry = self.__dEntries.get(url)
+         if entry is None:
+            self.dStatistics['misses'] += 1
+            return (None, False, {})
+         self.__dEntries.move_to_end(url)
+         fExpiry, etag, last_modified, data = entry
+         if fExpiry > time.monotonic():
+            self.dStatistics['hits'] += 1
+            return (data, True, {})
+         if etag is None and last_modified is None:
+            # nothing to revalidate with
+            del self.__dEntries[url]
+            self.dStatistics['misses'] += 1
+            return (None, False, {})
+      dHeaders = {}
+      if etag is not None:
+         dHeaders['If-None-Match'] = etag
+      if last_modified is not None:
+         dHeaders['If-Modified-Since'] = last_modified
+      return (data, False, dHeaders)
+
+   def vStore(self, url, resource, data, headers):
+      """
+Store the data of a successful response.
+
+**Arguments:**
+
+*  ``url``
+
+   / *Condition*: required / *Type*: str /
+
+   URL of the GET request.
+
+*  ``resource``
+
+   / *Condition*: required / *Type*: str /
+
+   Resource path of the request, selects the time to live.
+
+*  ``data``
+
+   / *Condition*: required / *Type*: any /
+
+   Parsed data of the response.
+
+*  ``headers``
+
+   / *Condition*: required / *Type*: dict /
+
+   Headers of the response (``ETag``, ``Last-Modified``, ``Cache-Control``).
+
+**Returns:**
+
+(*no returns*)
+      """
+      if 'no-store' in (headers.get('Cache-Control') or "").lower():
+         return
+      fTTL = self.dTTLs.get(self.__sResourceType(resource), 0)
+      entry = (time.monotonic() + fTTL, headers.get('ETag'), headers.get('Last-Modified'), data)
+      with self.__oLock:
+         self.__dEntries[url] = entry
+         self.__dEntries.move_to_end(url)
+         while len(self.__dEntries) > self.nMaxSize:
+            self.__dEntries.popitem(last=False)
+
+   def oRevalidated(self, url, resource):
+      """
+Mark a cached entry as fresh again after a ``304 Not Modified`` response.
+
+**Arguments:**
+
+*  ``url``, ``resource``
+
+   / *Condition*: required / *Type*: str /
+
+   See ``vStore()``.
+
+**Returns:**
+
+   / *Type*: any /
+
+   The cached data, ``None`` if the entry has been dropped meanwhile.
+      """
+      fTTL = self.dTTLs.get(self.__sResourceType(resource), 0)
+      with self.__oLock:
+         entry = self.__dEntries.get(url)
+         if entry is None:
+            return None
+         self.__dEntries[url] = (time.monotonic() + fTTL,) + entry[1:]
+         self.dStatistics['revalidated'] += 1
+         return entry[3]
+
+   def vInvalidate(self, url):
+      """
+Drop the cached entries of a URL, e.g. after the resource has been modified.
+Entries of the URL with a query string are dropped as well.
+
+**Arguments:**
+
+*  ``url``
+
+   / *Condition*: required / *Type*: str /
+
+   URL of the resource.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self.__oLock:
+         for key in [key for key in self.__dEntries
+                     if key == url or key.startswith(url + '?')]:
+            del self.__dEntries[key]
+
+   def vClear(self):
+      """
+Drop all cached entries.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self.__oLock:
+         self.__dEntries.clear()
+
+   def vResetStatistics(self):
+      """
+Reset the numbers of ``hits`` (fresh entries), ``revalidated`` entries and
+``misses``.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self.__oLock:
+         self.dStatistics = {'hits': 0, 'revalidated': 0, 'misses': 0}
+
+   def __len__(self):
+      with self.__oLock:
+         return len(self.__dEntries)
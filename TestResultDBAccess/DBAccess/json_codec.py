@@ -0,0 +1,181 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: json_codec.py
+#
+# Pluggable JSON serializers for the REST API access. A fast JSON library is
+# used if it is installed, the standard library json module otherwise.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#
+# ******************************************************************************
+
+import json
+from json.encoder import encode_basestring
+
+class JSONSerializer(object):
+   """
+JSONSerializer encodes request payloads to UTF-8 JSON bytes and decodes response
+bodies, based on the standard library ``json`` module.
+
+Derived classes can use another JSON library, see ``oGetSerializer()``.
+   """
+
+   name = "json"
+   # encoding the single values into a pre-encoded template is faster than
+   # encoding a whole dict (see TestCasePayloadEncoder)
+   PRE_ENCODE = True
+
+   def __init__(self):
+      self.__oEncoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False,
+                                         separators=(',', ':'))
+      self.__oDecoder = json.JSONDecoder()
+
+   def bDumps(self, obj):
+      """
+Encode an object.
+
+**Arguments:**
+
+*  ``obj``
+
+   / *Condition*: required / *Type*: any /
+
+   JSON serializable object.
+
+**Returns:**
+
+   / *Type*: bytes /
+
+   UTF-8 encoded JSON.
+      """
+      return self.__oEncoder.encode(obj).encode('utf-8')
+
+   def oLoads(self, data):
+      """
+Decode a JSON document.
+
+**Arguments:**
+
+*  ``data``
+
+   / *Condition*: required / *Type*: bytes or str /
+
+   UTF-8 encoded JSON.
+
+**Returns:**
+
+   / *Type*: any /
+
+   Decoded object. Raises ``ValueError`` if ``data`` is no valid JSON.
+      """
+      if isinstance(data, (bytes, bytearray)):
+         data = data.decode('utf-8')
+      return self.__oDecoder.decode(data)
+
+   def sDumpsValue(self, value):
+      """
+Encode a single value to a JSON string.
+      """
+      if type(value) is str:
+         return encode_basestring(value)
+      return self.__oEncoder.encode(value)
+
+   def bFillTemplate(self, template, values):
+      """
+Insert encoded values into a template.
+
+**Arguments:**
+
+*  ``template``
+
+   / *Condition*: required / *Type*: str /
+
+   Pre-encoded JSON with a ``%s`` placeholder per value (``%`` escaped as ``%%``).
+
+*  ``values``
+
+   / *Condition*: required / *Type*: tuple /
+
+   Values of the placeholders.
+
+**Returns:**
+
+   / *Type*: bytes /
+
+   UTF-8 encoded JSON.
+      """
+      return (template % tuple(map(self.sDumpsValue, values))).encode('utf-8')
+
+class OrjsonSerializer(JSONSerializer):
+   """
+JSONSerializer based on ``orjson``.
+   """
+
+   name = "orjson"
+   # orjson encodes a whole dict faster than the single values
+   PRE_ENCODE = False
+
+   def __init__(self):
+      import orjson
+      super(OrjsonSerializer, self).__init__()
+      self.__fnDumps = orjson.dumps
+      self.__fnLoads = orjson.loads
+
+   def bDumps(self, obj):
+      return self.__fnDumps(obj)
+
+   def oLoads(self, data):
+      # orjson.JSONDecodeError is derived from ValueError
+      return self.__fnLoads(data)
+
+# serializers in order of preference
+SERIALIZERS = {
+   "orjson" : OrjsonSerializer,
+   "json"   : JSONSerializer,
+}
+
+def oGetSerializer(name=None):
+   """
+Get a JSON serializer.
+
+**Arguments:**
+
+*  ``name``
+
+   / *Condition*: optional / *Type*: str / *Default*: None /
+
+   Name of the serializer (``orjson`` or ``json``). If ``None``, the first
+   serializer of ``SERIALIZERS`` whose library is installed is used.
+
+**Returns:**
+
+   / *Type*: JSONSerializer /
+
+   The serializer.
+   """
+   if name is not None:
+      if name not in SERIALIZERS:
+         raise ValueError("Unknown JSON serializer '{}'".format(name))
+      return SERIALIZERS[name]()
+   for oClass in SERIALIZERS.values():
+      try:
+         return oClass()
+      except ImportError:
+         pass
+   return JSONSerializer()
@@ -0,0 +1,190 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: metadata_cache.py
+#
+# This class caches metadata of test results (existing results, their project and
+# version, latest file IDs) per connection of DirectDBAccess.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#
+# ******************************************************************************
+
+import threading
+from collections import OrderedDict
+
+class MetadataCache(object):
+   """
+MetadataCache is an LRU cache of metadata which ``DirectDBAccess`` knows from its
+own writes or has read before:
+
+*  ``result``: ``test_result_id`` -> ``(project, version_sw_target)`` of an
+   existing test result, ``True`` if only its existence is known.
+*  ``latest_file``: ``test_result_id`` -> latest ``file_id`` of the result.
+
+Only existing values are cached, so a missing result is always looked up in the
+database. The cache belongs to one connection and is cleared by ``connect()``,
+``disconnect()`` and ``cleanAllTables()``. Entries which were changed by other
+clients can be dropped with ``vInvalidate()``.
+   """
+
+   KINDS = ('result', 'latest_file')
+
+   def __init__(self, max_size=1024):
+      """
+Initializer of class ``MetadataCache``.
+
+**Arguments:**
+
+*  ``max_size``
+
+   / *Condition*: optional / *Type*: int / *Default*: 1024 /
+
+   Maximum number of entries. The least recently used entry is dropped first.
+      """
+      self.nMaxSize = max_size
+      self.__oLock    = threading.Lock()
+      self.__dEntries = OrderedDict()
+      self.vResetStatistics()
+
+   def oGet(self, kind, key):
+      """
+Get a cached value.
+
+**Arguments:**
+
+*  ``kind``
+
+   / *Condition*: required / *Type*: str /
+
+   Kind of the metadata (see ``KINDS``).
+
+*  ``key``
+
+   / *Condition*: required / *Type*: str /
+
+   ``test_result_id``.
+
+**Returns:**
+
+   / *Type*: any /
+
+   The cached value, ``None`` if it is not cached.
+      """
+      with self.__oLock:
+         value = self.__dEntries.get((kind, key))
+         if value is None:
+            self.dStatistics['misses'] += 1
+            return None
+         self.__dEntries.move_to_end((kind, key))
+         self.dStatistics['hits'] += 1
+         return value
+
+   def vSet(self, kind, key, value):
+      """
+Cache a value.
+
+**Arguments:**
+
+*  ``kind``, ``key``
+
+   / *Condition*: required / *Type*: str /
+
+   See ``oGet()``.
+
+*  ``value``
+
+   / *Condition*: required / *Type*: any /
+
+   Value, ``None`` drops the entry.
+
+**Returns:**
+
+(*no returns*)
+      """
+      if self.nMaxSize <= 0:
+         return
+      with self.__oLock:
+         if value is None:
+            self.__dEntries.pop((kind, key), None)
+            return
+         self.__dEntries[(kind, key)] = value
+         self.__dEntries.move_to_end((kind, key))
+         while len(self.__dEntries) > self.nMaxSize:
+            self.__dEntries.popitem(last=False)
+
+   def vInvalidate(self, key=None, kind=None):
+      """
+Drop cached values.
+
+**Arguments:**
+
+*  ``key``
+
+   / *Condition*: optional / *Type*: str / *Default*: None /
+
+   If given, only the values of this ``test_result_id`` are dropped.
+
+*  ``kind``
+
+   / *Condition*: optional / *Type*: str / *Default*: None /
+
+   If given, only the values of this kind are dropped.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self.__oLock:
+         for entry in [entry for entry in self.__dEntries
+                       if (kind is None or entry[0] == kind) and (key is None or entry[1] == key)]:
+            del self.__dEntries[entry]
+
+   def vClear(self):
+      """
+Drop all cached values.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self.__oLock:
+         self.__dEntries.clear()
+
+   def vResetStatistics(self):
+      """
+Reset the numbers of ``hits`` and ``misses``.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self.__oLock:
+         self.dStatistics = {'hits': 0, 'misses': 0}
+
+   def __len__(self):
+      with self.__oLock:
+         return len(self.__dEntries)
@@ -0,0 +1,152 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: project_cache.py
+#
+# This class caches the project/variant/branch triples which are known to exist
+# in TestResultWebApp's database.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#
+# ******************************************************************************
+
+import threading
+import time
+from collections import OrderedDict
+
+class ProjectKeyCache(object):
+   """
+ProjectKeyCache is an in-process LRU cache of project keys
+(target, project, variant, branch) which already exist in ``tbl_prj``.
+
+Entries expire after ``ttl`` seconds, so projects which were deleted on the
+server are created again after a while. The cache is thread-safe and shared by
+``DirectDBAccess`` and ``RestApiDBAccess`` (see ``oProjectKeyCache``).
+   """
+
+   def __init__(self, ttl=3600, max_size=1024):
+      """
+Initializer of class ``ProjectKeyCache``.
+
+**Arguments:**
+
+*  ``ttl``
+
+   / *Condition*: optional / *Type*: float / *Default*: 3600 /
+
+   Time to live of an entry in seconds.
+
+*  ``max_size``
+
+   / *Condition*: optional / *Type*: int / *Default*: 1024 /
+
+   Maximum number of entries. The least recently used entry is dropped first.
+      """
+      self.fTTL     = ttl
+      self.nMaxSize = max_size
+      self.__oLock    = threading.Lock()
+      self.__dEntries = OrderedDict()
+
+   def bContains(self, target, project, variant, branch):
+      """
+Check whether the given project key is known to exist.
+
+**Arguments:**
+
+*  ``target``
+
+   / *Condition*: required / *Type*: str /
+
+   Identifier of the database (e.g. host and database name), so that the same
+   project on different databases is cached separately.
+
+*  ``project``, ``variant``, ``branch``
+
+   / *Condition*: required / *Type*: str /
+
+   Project key.
+
+**Returns:**
+
+   / *Type*: bool /
+
+   True if the key is cached and not yet expired.
+      """
+      key = (target, project, variant, branch)
+      with self.__oLock:
+         fExpiry = self.__dEntries.get(key)
+         if fExpiry is None:
+            return False
+         if fExpiry < time.monotonic():
+            del self.__dEntries[key]
+            return False
+         self.__dEntries.move_to_end(key)
+         return True
+
+   def vAdd(self, target, project, variant, branch):
+      """
+Remember that the given project key exists.
+
+**Arguments:**
+
+*  ``target``, ``project``, ``variant``, ``branch``
+
+   / *Condition*: required / *Type*: str /
+
+   See ``bContains()``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      key = (target, project, variant, branch)
+      with self.__oLock:
+         self.__dEntries[key] = time.monotonic() + self.fTTL
+         self.__dEntries.move_to_end(key)
+         while len(self.__dEntries) > self.nMaxSize:
+            self.__dEntries.popitem(last=False)
+
+   def vClear(self, target=None):
+      """
+Drop cached project keys.
+
+**Arguments:**
+
+*  ``target``
+
+   / *Condition*: optional / *Type*: str / *Default*: None /
+
+   If given, only the keys of this database are dropped, otherwise all keys.
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self.__oLock:
+         if target is None:
+            self.__dEntries.clear()
+         else:
+            for key in [key for key in self.__dEntries if key[0] == target]:
+               del self.__dEntries[key]
+
+   def __len__(self):
+      with self.__oLock:
+         return len(self.__dEntries)
+
+# process-wide cache which is shared by all DBAccess instances
+oProjectKeyCache = ProjectKeyCache()
@@ -24,18 +24,94 @@
 # March 2024:
 #  - initial version
 #
+# October 2026:
+#  - cache known projects to skip the project lookup per test result
+#  - import requests_kerberos at the first Kerberos login
+#  - reuse a cached CA bundle and a shared SSL context for all instances
+#  - configurable transport with connection pool, timeouts and retries
+#  - opt-in pipelined test case creation with bounded in-flight requests
+#  - build the request payloads in module rest_payloads
+#  - array payloads for testcases, ccrs and fileheaders if the server supports them
+#  - decode each response once, pluggable JSON serializer, pre-encoded test cases
+#  - opt-in on-disk session cache to skip the login handshake
+#  - cache categories and results with ETag/Last-Modified revalidation
+#  - deferred-update mode which merges the PATCHes per resource
+#  - keep the cached session at disconnect
+#  - ask each server for its capabilities once per process
+#  - response cache is opt-in like the session cache
+#
 # ******************************************************************************
 
 import requests
+import threading
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from .ca_bundle import sGetCABundle
+from .rest_transport import RestTransportAdapter
 from .db_accesss_interface import DBAccessInterface
-from requests_kerberos import HTTPKerberosAuth, OPTIONAL
-import ssl
-import tempfile
+from .project_cache import oProjectKeyCache
+from .json_codec import oGetSerializer
+from .session_cache import RestSessionCache
+from .http_cache import RestResponseCache
+from .rest_payloads import dResultPayload, dFilePayload, dFileHeaderPayload, \
+                           dAbortPayload, dCCRPayload, TestCasePayloadEncoder
 
 from urllib3.exceptions import InsecureRequestWarning
 from urllib3 import disable_warnings
 disable_warnings(InsecureRequestWarning)
 
+# answers of GET capabilities by base URL, so each server is asked once per process
+_dCapabilities     = {}
+_oCapabilitiesLock = threading.Lock()
+
+def dGetCapabilities(base_url):
+   """
+Get the known capabilities of a server.
+
+**Arguments:**
+
+*  ``base_url``
+
+   / *Condition*: required / *Type*: str /
+
+   Base URL of the database (``<host>/<database>``).
+
+**Returns:**
+
+   / *Type*: dict /
+
+   Data of ``GET capabilities`` (empty if the server has no such endpoint),
+   ``None`` if the server has not been asked yet.
+   """
+   with _oCapabilitiesLock:
+      return _dCapabilities.get(base_url)
+
+def vSetCapabilities(base_url, capabilities):
+   """
+Store the capabilities of a server, see ``dGetCapabilities()``.
+
+**Arguments:**
+
+*  ``base_url``
+
+   / *Condition*: required / *Type*: str /
+
+   Base URL of the database.
+
+*  ``capabilities``
+
+   / *Condition*: required / *Type*: dict /
+
+   Data of ``GET capabilities``, ``None`` if the server has no such endpoint.
+
+**Returns:**
+
+(*no returns*)
+   """
+   with _oCapabilitiesLock:
+      _dCapabilities[base_url] = capabilities or {}
+
 class RestApiDBAccess(DBAccessInterface):
    """
 RestApiDBAccess class provide methods to interact with TestResultWebApp's REST 
@@ -47,9 +123,68 @@ creating, updating, and calling stored procedures in the database via RESTful
 API calls. 
    """
 
-   def __init__(self):
+   def __init__(self, transport=None, max_in_flight=0, batch_size=100, serializer=None,
+                      session_cache=None, response_cache=None, deferred_updates=False):
       """
 Initializes the RestApiDBAccess instance.
+
+**Arguments:**
+
+*  ``transport``
+
+   / *Condition*: optional / *Type*: RestTransportAdapter / *Default*: None /
+
+   Transport with the connection pool, timeout and retry settings of the session.
+   A default ``RestTransportAdapter`` if not given.
+
+*  ``max_in_flight``
+
+   / *Condition*: optional / *Type*: int / *Default*: 0 /
+
+   If greater than 0, ``nCreateNewTestCase()`` and ``arCreateNewTestCases()``
+   keep up to this number of POST requests in flight (pipelined mode).
+   The pool of the transport should keep at least this number of connections.
+
+*  ``batch_size``
+
+   / *Condition*: optional / *Type*: int / *Default*: 100 /
+
+   Maximum number of test cases, CCR samples or file headers which are sent in one
+   request if the server supports array payloads (see ``bProbeBatchSupport()``).
+   0 sends one request per record.
+
+*  ``serializer``
+
+   / *Condition*: optional / *Type*: str or JSONSerializer / *Default*: None /
+
+   JSON serializer of the request and response bodies, or its name (see
+   ``oGetSerializer()``). The fastest installed one if not given.
+
+*  ``session_cache``
+
+   / *Condition*: optional / *Type*: bool or RestSessionCache / *Default*: None /
+
+   Cache of authenticated sessions (``True`` for a default ``RestSessionCache``).
+   ``connect()`` reuses a cached session of the same host, database and user
+   instead of the login handshake and ``disconnect()`` keeps the session on the
+   server instead of logging out. No cache if not given.
+
+*  ``response_cache``
+
+   / *Condition*: optional / *Type*: bool or RestResponseCache / *Default*: None /
+
+   Cache of the responses of read endpoints (``categories``, ``results/<id>``),
+   ``True`` for a default ``RestResponseCache``. No cache if not given, so each
+   read is sent to the server.
+
+*  ``deferred_updates``
+
+   / *Condition*: optional / *Type*: bool / *Default*: False /
+
+   If True, the updates of results and files (``vCreateReanimation()``,
+   ``vSetCategory()``, ``vUpdateFileEndTime()``, ``vUpdateResultEndTime()`` and
+   ``vFinishTestResult()``) are merged per resource and sent as one PATCH by
+   ``flush()``, which is called by ``vFinishTestResult()`` and ``disconnect()``.
       """
       self.session  = requests.Session()
       self.base_url = ""
@@ -58,35 +193,56 @@ Initializes the RestApiDBAccess instance.
       }
       self.cookies = {}
       self.certs_file = self.get_certs_file()
+      if transport is None:
+         transport = RestTransportAdapter(pool_maxsize=max(10, max_in_flight))
+      self.transport = transport
+      self.nMaxInFlight = max_in_flight
+      self.__oExecutor = None
+      self.__dqPendingTestCases = deque()
+      self.__arTestCaseIDs = []
+      self.__arBatchTestCases = []
+      self.nBatchSize = batch_size
+      self.bBatchSupported = False
+      if serializer is None or isinstance(serializer, str):
+         serializer = oGetSerializer(serializer)
+      self.oSerializer = serializer
+      self.oTestCaseEncoder = TestCasePayloadEncoder(serializer)
+      if session_cache is True:
+         session_cache = RestSessionCache()
+      self.oSessionCache = session_cache if session_cache not in (None, False) else None
+      self.bCachedSession = False
+      self.__tLogin = None
+      self.__oLoginLock = threading.Lock()
+      if response_cache is True:
+         response_cache = RestResponseCache()
+      self.oResponseCache = response_cache if response_cache not in (None, False) else None
+      self.bDeferredUpdates = deferred_updates
+      self.__dDeferredPatches = OrderedDict()
+      self.__oDeferredLock = threading.Lock()
 
       if self.certs_file:
          self.session.verify = self.certs_file
+         self.transport.sCABundle = self.certs_file
       else:
          self.session.verify = False
+      self.session.mount("https://", self.transport)
+      self.session.mount("http://", self.transport)
    
    def get_certs_file(self):
       """
-Retrieves SSL certificates and saves them to a temporary file for request's 
+Retrieves SSL certificates of the system CA store as PEM file for request's 
 verification.
 
+The file is built once and shared by all instances (see ``sGetCABundle()``).
+
 **Returns:**
 
    / *Type*: str /
 
-   The path to the temporary file containing SSL certificates.
+   The path to the file containing SSL certificates.
+   ``None`` if the system CA store is empty.
       """
-      context = ssl.create_default_context() 
-      der_certs = context.get_ca_certs(binary_form=True) 
-      pem_certs = [ssl.DER_cert_to_PEM_cert(der) for der in der_certs] 
-      if len(pem_certs):
-         with tempfile.NamedTemporaryFile(mode='w', delete=False) as outfile: 
-            path2pem = outfile.name
-            for pem in pem_certs:
-               outfile.write("{}\n".format(pem))
-
-         return path2pem
-      else:
-         return None
+      return sGetCABundle()
 
    @staticmethod
    def encrypt_password(password, pubkey):
@@ -130,6 +286,43 @@ Encrypts a password using a public key.
          raise Exception("Cannot encrypt given password with public key. Reason: {}".format(error))
 
    # Methods to handle api request
+   def __bEncode(self, payload):
+      """
+Encode the payload of a request (JSON bytes are sent as they are).
+      """
+      if payload is None or isinstance(payload, bytes):
+         return payload
+      return self.oSerializer.bDumps(payload)
+
+   def __oDecode(self, res):
+      """
+Decode the JSON body of a response once. ``None`` if the body is no JSON.
+      """
+      try:
+         return self.oSerializer.oLoads(res.content)
+      except ValueError:
+         return None
+
+   def __tSend(self, method, url, payload=None, headers=None):
+      """
+Send a request and decode the response.
+
+If the server rejects a session of the session cache (status 401 or 403, or a
+redirect to a page which is no JSON, e.g. the login page of the SSO system), the
+cached session is removed and the request is sent again after a full login.
+      """
+      bCachedSession = self.bCachedSession
+      res = self.session.request(method, url, data=self.__bEncode(payload), headers=headers,
+                                 allow_redirects=True)
+      data = self.__oDecode(res)
+      if bCachedSession and \
+         (res.status_code in (401, 403) or (data is None and res.history)):
+         self.__vRenewSession()
+         res = self.session.request(method, url, data=self.__bEncode(payload), headers=headers,
+                                    allow_redirects=True)
+         data = self.__oDecode(res)
+      return res, data
+
    def __get_request(self, resource):
       """
 Sends a GET request to the API endpoint specified by the resource.
@@ -149,10 +342,29 @@ Sends a GET request to the API endpoint specified by the resource.
    The response data if the request is successful.
    Otherwise returns ``None``.
       """
-      res = self.session.get("{}/{}".format(self.base_url, resource), 
-                             allow_redirects=True)
-      if res.status_code == 200 and res.json()['success']:
-         return res.json()['data']
+      if self.__dDeferredPatches:
+         # read the own deferred updates of the resource
+         self.__vFlushPatch(resource.split('?')[0])
+      url = "{}/{}".format(self.base_url, resource)
+      oCache = self.oResponseCache
+      bCached = oCache is not None and oCache.bIsCached(resource)
+      headers = None
+      if bCached:
+         cached, bFresh, headers = oCache.tLookup(url)
+         if bFresh:
+            return cached
+      res, data = self.__tSend('GET', url, headers=headers)
+      if res.status_code == 304 and bCached:
+         cached = oCache.oRevalidated(url, resource)
+         if cached is not None:
+            return cached
+         # dropped meanwhile
+         res, data = self.__tSend('GET', url)
+      if res.status_code == 200 and data and data['success']:
+         if bCached and data['data']:
+            # not existing records are not cached, they may be created meanwhile
+            oCache.vStore(url, resource, data['data'], res.headers)
+         return data['data']
       else:
          # raise Exception(res.json()['message'])
          return None
@@ -171,9 +383,9 @@ Sends a POST request to the API endpoint specified by the resource.
 
 *  ``payload``
 
-   / *Condition*: optional / *Type*: bool / *Default*: None /
+   / *Condition*: optional / *Type*: dict or bytes / *Default*: None /
 
-   The payload for POST request.
+   The payload for POST request, bytes are sent as pre-encoded JSON.
 
 **Returns:**
 
@@ -182,13 +394,17 @@ Sends a POST request to the API endpoint specified by the resource.
    The response data if the request is successful.
    Otherwise raise Exception with error message.
       """
-      res = self.session.post("{}/{}".format(self.base_url, resource), 
-                              json=payload, 
-                              allow_redirects=True)
-      if res.status_code == 201 and res.json()['success']:
-         return res.json()['data']
+      url = "{}/{}".format(self.base_url, resource)
+      try:
+         res, data = self.__tSend('POST', url, payload)
+      finally:
+         if self.oResponseCache is not None and self.oResponseCache.bIsCached(resource):
+            # the cached data of the resource is outdated
+            self.oResponseCache.vInvalidate(url)
+      if res.status_code == 201 and data and data['success']:
+         return data['data']
       else:
-         raise Exception(res.json()['message'])
+         raise Exception(data['message'] if data else "HTTP status {}".format(res.status_code))
 
    def __patch_request(self, resource, resource_id, payload=None):
       """
@@ -210,9 +426,9 @@ Sends a PATCH request to the API endpoint specified by the resource and its id.
 
 *  ``payload``
 
-   / *Condition*: optional / *Type*: bool / *Default*: None /
+   / *Condition*: optional / *Type*: dict or bytes / *Default*: None /
 
-   The payload for PATCH request.
+   The payload for PATCH request, bytes are sent as pre-encoded JSON.
 
 **Returns:**
 
@@ -221,13 +437,17 @@ Sends a PATCH request to the API endpoint specified by the resource and its id.
    The response data if the request is successful.
    Otherwise raise Exception with error message.
       """
-      res = self.session.patch("{}/{}/{}".format(self.base_url, resource, resource_id), 
-                               json=payload, allow_redirects=True)
-      
-      if res.status_code == 200 and res.json()['success']:
-         return res.json()['data']
+      url = "{}/{}/{}".format(self.base_url, resource, resource_id)
+      try:
+         res, data = self.__tSend('PATCH', url, payload)
+      finally:
+         if self.oResponseCache is not None and self.oResponseCache.bIsCached(resource):
+            # the cached data of the resource is outdated
+            self.oResponseCache.vInvalidate(url)
+      if res.status_code == 200 and data and data['success']:
+         return data['data']
       else:
-         raise Exception(res.json()['message'])
+         raise Exception(data['message'] if data else "HTTP status {}".format(res.status_code))
 
    def __get_wam_cookies(self):
       """
@@ -249,6 +469,8 @@ If the request is successful, the authorized session is reused for subsequent
       """
       try:
          # Try with kerberos
+         # requests_kerberos (and its GSSAPI/SSPI backend) is only needed for the login
+         from requests_kerberos import HTTPKerberosAuth, OPTIONAL
          kerberos_auth = HTTPKerberosAuth(mutual_authentication=OPTIONAL)
          res = self.session.get("{}/loggedin".format(self.base_url), 
                                 auth=kerberos_auth, allow_redirects=True)
@@ -295,7 +517,48 @@ Connects to the database via REST API using the provided credentials.
 (*no returns*)
       """
       self.base_url = "{}/{}".format(host, database)
+      self.__tLogin = (host, user, passwd, database)
+
+      self.bCachedSession = self.__bRestoreSession()
+      if not self.bCachedSession:
+         self.__vLogin()
+      self.bProbeBatchSupport()
 
+   def __bRestoreSession(self):
+      """
+Restore the cookies of a cached session of the host, database and user.
+      """
+      if self.oSessionCache is None:
+         return False
+      host, user, _, database = self.__tLogin
+      dSession = self.oSessionCache.dLoad(host, database, user)
+      if dSession is None:
+         return False
+      for dCookie in dSession['cookies']:
+         self.session.cookies.set(dCookie['name'], dCookie['value'],
+                                  domain=dCookie['domain'], path=dCookie['path'],
+                                  expires=dCookie['expires'], secure=dCookie['secure'])
+      return True
+
+   def __vRenewSession(self):
+      """
+Replace a rejected session of the session cache by a full login.
+      """
+      with self.__oLoginLock:
+         # requests of other threads may have renewed the session already
+         if self.bCachedSession:
+            host, user, _, database = self.__tLogin
+            self.oSessionCache.vRemove(host, database, user)
+            self.session.cookies.clear()
+            self.bCachedSession = False
+            self.__vLogin()
+
+   def __vLogin(self):
+      """
+Login handshake: Kerberos login, public key and login with the encrypted
+password. The cookies of the session are saved in the session cache.
+      """
+      host, user, passwd, database = self.__tLogin
       self.__get_wam_cookies()
       try:
          res = self.session.get("{}/getPubKey".format(self.base_url), 
@@ -318,11 +581,90 @@ Connects to the database via REST API using the provided credentials.
          print("  > Login successfully!")
       else:
          raise Exception('Login failed!')
+      if self.oSessionCache is not None:
+         self.oSessionCache.vSave(host, database, user, self.session.cookies)
+
+   def bProbeBatchSupport(self):
+      """
+Ask the server whether it accepts array payloads for ``testcases``, ``ccrs`` and
+``fileheaders`` (``GET capabilities``). The batch size is limited to the maximum
+batch size of the server. Servers without this endpoint are accessed with one
+request per record. The answer is cached per base URL (see
+``dGetCapabilities()``), so the server is asked once per process.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+   / *Type*: bool /
+
+   True if records are sent in batches.
+      """
+      self.bBatchSupported = False
+      if self.nBatchSize > 1:
+         data = dGetCapabilities(self.base_url)
+         if data is None:
+            try:
+               data = self.__get_request('capabilities')
+            except Exception:
+               # not cached, the server is asked again at the next connect()
+               return False
+            vSetCapabilities(self.base_url, data)
+            data = dGetCapabilities(self.base_url)
+         if data.get('batch'):
+            self.bBatchSupported = True
+            if data.get('max_batch_size'):
+               self.nBatchSize = min(self.nBatchSize, int(data['max_batch_size']))
+      return self.bBatchSupported
+
+   def __arPostRecords(self, resource, arPayloads):
+      """
+POST the records as array payloads of up to ``batch_size`` records, or one by one
+if the server does not support array payloads.
+
+**Arguments:**
+
+*  ``resource``
+
+   / *Condition*: required / *Type*: str /
+
+   The resource endpoint to send the POST requests to.
+
+*  ``arPayloads``
+
+   / *Condition*: required / *Type*: list /
+
+   Payloads of the records (objects or pre-encoded JSON bytes).
+
+**Returns:**
+
+   / *Type*: list /
+
+   The response data of the records in the order of the payloads.
+      """
+      if not self.bBatchSupported:
+         return [self.__post_request(resource, payload) for payload in arPayloads]
+      arData = []
+      for nStart in range(0, len(arPayloads), self.nBatchSize):
+         arBatch = arPayloads[nStart:nStart + self.nBatchSize]
+         # the records may be pre-encoded
+         data = self.__post_request(resource,
+                                    b'[' + b','.join(map(self.__bEncode, arBatch)) + b']')
+         if not isinstance(data, list) or len(data) != len(arBatch):
+            raise Exception("Unexpected response of {} for {} records".format(resource,
+                                                                              len(arBatch)))
+         arData.extend(data)
+      return arData
 
    def disconnect(self):
       """
 Disconnect from TestResultWebApp's database.
 
+With a session cache, the session is not logged out, so the next ``connect()``
+can reuse it.
+
 **Arguments:**
 
 (*no arguments*)
@@ -331,12 +673,90 @@ Disconnect from TestResultWebApp's database.
 
 (*no returns*)
       """
+      try:
+         self.arWaitForTestCases()
+         self.flush()
+      finally:
+         if self.__oExecutor is not None:
+            self.__oExecutor.shutdown(wait=True)
+            self.__oExecutor = None
+      if self.oSessionCache is not None:
+         return
       res = self.session.get(self.base_url+'/logout', allow_redirects=True)
       if res.status_code == 200:
          print("  > Logout successfully!")
       else:
          raise Exception('Logout failed!')
 
+   def __vPatch(self, resource, resource_id, payload):
+      """
+Send a PATCH request, or merge its payload into the deferred PATCH of the
+resource in deferred-update mode (later values of a field win).
+      """
+      if not self.bDeferredUpdates:
+         self.__patch_request(resource, resource_id, payload)
+         return
+      with self.__oDeferredLock:
+         self.__dDeferredPatches.setdefault("{}/{}".format(resource, resource_id),
+                                            (resource, resource_id, {}))[2].update(payload)
+
+   def __vSendDeferredPatch(self, key, resource, resource_id, payload):
+      try:
+         self.__patch_request(resource, resource_id, payload)
+      except Exception:
+         # keep the fields for the next flush, newer updates of them win
+         with self.__oDeferredLock:
+            _, _, dNewer = self.__dDeferredPatches.pop(key, (None, None, {}))
+            payload.update(dNewer)
+            self.__dDeferredPatches[key] = (resource, resource_id, payload)
+            self.__dDeferredPatches.move_to_end(key, last=False)
+         raise
+
+   def __vFlushPatch(self, key):
+      """
+Send the deferred PATCH of a resource (``<resource>/<id>``) if there is one.
+      """
+      with self.__oDeferredLock:
+         entry = self.__dDeferredPatches.pop(key, None)
+      if entry is not None:
+         self.__vSendDeferredPatch(key, *entry)
+
+   def flush(self):
+      """
+Send the deferred updates, one PATCH per resource in the order of their first
+update.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      while True:
+         with self.__oDeferredLock:
+            if not self.__dDeferredPatches:
+               return
+            key, entry = self.__dDeferredPatches.popitem(last=False)
+         self.__vSendDeferredPatch(key, *entry)
+
+   def dGetTransportStatistics(self):
+      """
+Get the statistics of the connection pool and retries of the transport.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+   / *Type*: dict /
+
+   See ``RestTransportAdapter.dGetStatistics()``.
+      """
+      return self.transport.dGetStatistics()
+
    # Methods to retrieve (GET) information from database
    def arGetCategories(self):
       """
@@ -435,6 +855,39 @@ Get the project and version_sw information of given ``result_id``
          return (data['project'], data['version_sw_target'])
       return None
 
+   def __vEnsureProject(self, project, variant, branch):
+      """
+Create the given project if it is not existing yet.
+
+If the creation fails because a concurrent uploader has just created the same
+project, this is not handled as an error.
+
+**Arguments:**
+
+*  ``project``, ``variant``, ``branch``
+
+   / *Condition*: required / *Type*: str /
+
+   Project information.
+
+**Returns:**
+
+(*no returns*)
+      """
+      prj_resource = 'projects?project={}&variant={}&branch={}'.format(project, variant, branch)
+      if self.__get_request(prj_resource):
+         return
+      req_prj = {
+         "project": project,
+         "variant": variant,
+         "branch": branch
+      }
+      try:
+         self.__post_request('projects', req_prj)
+      except Exception:
+         if not self.__get_request(prj_resource):
+            raise
+
    # Methods to create new record(s) (POST) in database
    def sCreateNewTestResult(self, project, variant, branch, 
                                   result_id,
@@ -532,30 +985,22 @@ Creates a new test result.
 
    ``test_result_id`` of new test result.
       """
-      data_prj = self.__get_request('projects?project={}&variant={}&branch={}'.format(project, variant, branch))
-      if not data_prj:
-         req_prj = {
-            "project": project,
-            "variant": variant,
-            "branch": branch
-         }
-         self.__post_request('projects', req_prj)
-      
-      req_result = {
-         "test_result_id" : result_id,
-         "project" : project,
-         "variant" : variant,
-         "branch" : branch,
-         "time_start" : result_start_time,
-         "time_end" : result_end_time,
-         "version_sw_target" : result_version_sw_target,
-         "version_sw_test" : result_version_sw_test,
-         "version_hardware" : result_version_hw,
-         "jenkinsurl" : result_build_url,
-         "reporting_qualitygate" : result_report_qualitygate,
-         "interpretation" : result_interpretation,
-         "result_state" : "in progress"
-      }
+      if not oProjectKeyCache.bContains(self.base_url, project, variant, branch):
+         self.__vEnsureProject(project, variant, branch)
+         oProjectKeyCache.vAdd(self.base_url, project, variant, branch)
+
+      req_result = dResultPayload(project,
+                                  variant,
+                                  branch,
+                                  result_id,
+                                  result_interpretation,
+                                  result_start_time,
+                                  result_end_time,
+                                  result_version_sw_target,
+                                  result_version_sw_test,
+                                  result_version_hw,
+                                  result_build_url,
+                                  result_report_qualitygate)
       self.__post_request('results', req_result)
 
       return result_id
@@ -620,15 +1065,13 @@ Create new result file.
 
    ID of new entry.
       """
-      req_file = {
-         "test_result_id" : result_id,
-         "name" : file_name,
-         "tester_account" : file_tester_account,
-         "tester_machine" : file_tester_machine,
-         "time_start" : file_time_start,
-         "time_end" : file_time_end,
-         "origin" : file_origin
-      }
+      req_file = dFilePayload(file_name,
+                              file_tester_account,
+                              file_tester_machine,
+                              file_time_start,
+                              file_time_end,
+                              result_id,
+                              file_origin)
       data = self.__post_request('files', req_file)
       return data['id']
 
@@ -841,38 +1284,54 @@ Create a new result file header.
 (*no returns*)
       """
 
-      req_fileheader = {
-         "file_id" : int(file_id),
-         "testtoolconfiguration_testtoolname" : testtoolconfiguration_testtoolname,
-         "testtoolconfiguration_testtoolversionstring" : testtoolconfiguration_testtoolversionstring,
-         "testtoolconfiguration_projectname" : testtoolconfiguration_projectname,
-         "testtoolconfiguration_logfileencoding" : testtoolconfiguration_logfileencoding,
-         "testtoolconfiguration_pythonversion" : testtoolconfiguration_pythonversion,
-         "testtoolconfiguration_testfile" : testtoolconfiguration_testfile,
-         "testtoolconfiguration_logfilepath" : testtoolconfiguration_logfilepath,
-         "testtoolconfiguration_logfilemode" : testtoolconfiguration_logfilemode,
-         "testtoolconfiguration_ctrlfilepath" : testtoolconfiguration_ctrlfilepath,
-         "testtoolconfiguration_configfile" : testtoolconfiguration_configfile,
-         "testtoolconfiguration_confname" : testtoolconfiguration_confname,
-         "testfileheader_author" : testfileheader_author,
-         "testfileheader_project" : testfileheader_project,
-         "testfileheader_testfiledate" : testfileheader_testfiledate,
-         "testfileheader_version_major" : testfileheader_version_major,
-         "testfileheader_version_minor" : testfileheader_version_minor,
-         "testfileheader_version_patch" : testfileheader_version_patch,
-         "testfileheader_keyword" : testfileheader_keyword,
-         "testfileheader_shortdescription" : testfileheader_shortdescription,
-         "testexecution_useraccount" : testexecution_useraccount,
-         "testexecution_computername" : testexecution_computername,
-         "testrequirements_documentmanagement" : testrequirements_documentmanagement,
-         "testrequirements_testenvironment" : testrequirements_testenvironment,
-         "testbenchconfig_name" : testbenchconfig_name,
-         "testbenchconfig_data" : testbenchconfig_data,
-         "preprocessor_parameters" : preprocessor_parameters,
-         "preprocessor_filter" : preprocessor_filter
-      }
+      req_fileheader = dFileHeaderPayload(file_id,
+                                          testtoolconfiguration_testtoolname,
+                                          testtoolconfiguration_testtoolversionstring,
+                                          testtoolconfiguration_projectname,
+                                          testtoolconfiguration_logfileencoding,
+                                          testtoolconfiguration_pythonversion,
+                                          testtoolconfiguration_testfile,
+                                          testtoolconfiguration_logfilepath,
+                                          testtoolconfiguration_logfilemode,
+                                          testtoolconfiguration_ctrlfilepath,
+                                          testtoolconfiguration_configfile,
+                                          testtoolconfiguration_confname,
+                                          testfileheader_author,
+                                          testfileheader_project,
+                                          testfileheader_testfiledate,
+                                          testfileheader_version_major,
+                                          testfileheader_version_minor,
+                                          testfileheader_version_patch,
+                                          testfileheader_keyword,
+                                          testfileheader_shortdescription,
+                                          testexecution_useraccount,
+                                          testexecution_computername,
+                                          testrequirements_documentmanagement,
+                                          testrequirements_testenvironment,
+                                          testbenchconfig_name,
+                                          testbenchconfig_data,
+                                          preprocessor_filter,
+                                          preprocessor_parameters)
       self.__post_request('fileheaders', req_fileheader)
 
+   def vCreateNewHeaders(self, arHeaders):
+      """
+Create many result file headers, in batches if the server supports array payloads.
+
+**Arguments:**
+
+*  ``arHeaders``
+
+   / *Condition*: required / *Type*: list /
+
+   File headers, each a sequence of the arguments of ``vCreateNewHeader()``.
+
+**Returns:**
+
+(*no returns*)
+      """
+      self.__arPostRecords('fileheaders', [dFileHeaderPayload(*header) for header in arHeaders])
+
    def nCreateNewSingleTestCase(self, case_name,
                                       case_issue,
                                       case_tcid,
@@ -989,23 +1448,21 @@ Create single test case.
 
    ID of new entry.
       """
-      req_test = {
-         "name"            : case_name,
-         "issue"           : case_issue,
-         "tcid"            : case_tcid,
-         "fid"             : case_fid,
-         "component"       : case_component,
-         "time_start"      : case_time_start,
-         "result_main"     : case_result_main,
-         "result_state"    : case_result_state,
-         "result_return"   : int(case_result_return),
-         "counter_resets"  : int(case_counter_resets),
-         "lastlog"         : case_lastlog,
-         "testnumber"      : str(case_testnumber),
-         "repeatcount"     : str(case_repeatcount),
-         "test_result_id"  : result_id,
-         "file_id"         : int(file_id)
-      }
+      req_test = self.oTestCaseEncoder.bEncode(case_name,
+                                               case_issue,
+                                               case_tcid,
+                                               case_fid,
+                                               case_testnumber,
+                                               case_repeatcount,
+                                               case_component,
+                                               case_time_start,
+                                               case_result_main,
+                                               case_result_state,
+                                               case_result_return,
+                                               case_counter_resets,
+                                               case_lastlog,
+                                               result_id,
+                                               file_id)
       data = self.__post_request('testcases', req_test)
       return data['id']
 
@@ -1013,9 +1470,120 @@ Create single test case.
       """
 Alias for nCreateNewSingleTestCase, used in older import tools to import a bulk 
 of test cases at once. 
+
+In pipelined mode (``max_in_flight``), the test case is posted in the background
+and ``None`` is returned. The IDs are returned in order by ``arWaitForTestCases()``.
+If the server supports array payloads, ``batch_size`` test cases are posted
+together.
       """
+      if self.nMaxInFlight > 0:
+         self.__vSubmitTestCase(args)
+         return None
       return self.nCreateNewSingleTestCase(*args)
 
+   def arCreateNewTestCases(self, arTestCases):
+      """
+Create many test cases and return their IDs in input order.
+
+If the server supports array payloads, ``batch_size`` test cases are posted in
+one request. In pipelined mode (``max_in_flight``), up to ``max_in_flight``
+requests are in flight.
+
+**Arguments:**
+
+*  ``arTestCases``
+
+   / *Condition*: required / *Type*: list /
+
+   Test cases, each a sequence of the arguments of ``nCreateNewSingleTestCase()``.
+
+**Returns:**
+
+   / *Type*: list /
+
+   IDs of the new test cases.
+      """
+      if self.nMaxInFlight <= 0:
+         if not self.bBatchSupported:
+            return super(RestApiDBAccess, self).arCreateNewTestCases(arTestCases)
+         return self.__arCreateTestCaseBatch(arTestCases)
+      # IDs of test cases which were created before by nCreateNewTestCase()
+      # are kept for arWaitForTestCases()
+      self.__vWaitForPendingTestCases()
+      nStart = len(self.__arTestCaseIDs)
+      for testcase in arTestCases:
+         self.__vSubmitTestCase(testcase)
+      self.__vWaitForPendingTestCases()
+      arIDs = self.__arTestCaseIDs[nStart:]
+      del self.__arTestCaseIDs[nStart:]
+      return arIDs
+
+   def arWaitForTestCases(self):
+      """
+Wait until all test cases of the pipelined mode are created (barrier).
+
+The first error (in the order of the test cases) is raised, the requests after
+it are cancelled.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+   / *Type*: list /
+
+   IDs of the test cases which were created by ``nCreateNewTestCase()`` since the
+   last barrier, in the order of the calls.
+      """
+      self.__vWaitForPendingTestCases()
+      arIDs, self.__arTestCaseIDs = self.__arTestCaseIDs, []
+      return arIDs
+
+   def __arCreateTestCaseBatch(self, arTestCases):
+      if not self.bBatchSupported:
+         return [self.nCreateNewSingleTestCase(*testcase) for testcase in arTestCases]
+      arData = self.__arPostRecords('testcases',
+                                    [self.oTestCaseEncoder.bEncode(*testcase)
+                                     for testcase in arTestCases])
+      return [data['id'] for data in arData]
+
+   def __vSubmitTestCase(self, testcase):
+      self.__arBatchTestCases.append(testcase)
+      if not self.bBatchSupported or len(self.__arBatchTestCases) >= self.nBatchSize:
+         self.__vSubmitTestCaseBatch()
+
+   def __vSubmitTestCaseBatch(self):
+      if self.__oExecutor is None:
+         self.__oExecutor = ThreadPoolExecutor(max_workers=self.nMaxInFlight,
+                                               thread_name_prefix="TestResultDBAccess-rest")
+      # bounded: wait for the oldest request before the next one is sent
+      while len(self.__dqPendingTestCases) >= self.nMaxInFlight:
+         self.__vCollectOldestTestCase()
+      arBatch, self.__arBatchTestCases = self.__arBatchTestCases, []
+      self.__dqPendingTestCases.append(
+         self.__oExecutor.submit(self.__arCreateTestCaseBatch, arBatch))
+
+   def __vWaitForPendingTestCases(self):
+      if self.__arBatchTestCases:
+         self.__vSubmitTestCaseBatch()
+      while self.__dqPendingTestCases:
+         self.__vCollectOldestTestCase()
+
+   def __vCollectOldestTestCase(self):
+      oFuture = self.__dqPendingTestCases.popleft()
+      try:
+         self.__arTestCaseIDs.extend(oFuture.result())
+      except BaseException:
+         for oPending in self.__dqPendingTestCases:
+            oPending.cancel()
+         for oPending in self.__dqPendingTestCases:
+            if not oPending.cancelled():
+               oPending.exception()
+         self.__dqPendingTestCases.clear()
+         self.__arTestCaseIDs = []
+         raise
+
    def vCreateAbortReason(self, result_id,
                                 abort_reason,
                                 abort_message):
@@ -1046,17 +1614,16 @@ Create abort reason entry.
 
 (*no returns*)
       """
-      req_abort = {
-         "test_result_id"  : result_id,
-         "abort_reason"    : abort_reason,
-         "msg_detail"      : abort_message
-      }
+      req_abort = dAbortPayload(result_id, abort_reason, abort_message)
       self.__post_request('aborts', req_abort)
 
    def vCreateCCRdata(self, test_case_id, lCCRdata):
       """
 Create CCR data per test case.
 
+If the server supports array payloads, ``batch_size`` samples are sent in one
+request.
+
 **Arguments:**
 
 *  ``_tbl_test_case_id``
@@ -1075,14 +1642,15 @@ Create CCR data per test case.
 
 (*no returns*)
       """
-      for row in lCCRdata:
-         req_ccr = {
-            "test_case_id" : test_case_id,
-            "timestamp"    : row[0],
-            "MEM_RSS"      : row[1],
-            "CPU"          : row[2]
-         }
-         self.__post_request('ccrs', req_ccr)
+      if not self.bBatchSupported:
+         for row in lCCRdata:
+            self.__post_request('ccrs', dCCRPayload(test_case_id, row))
+         return
+      itCCRdata = iter(lCCRdata)
+      arBatch = list(islice(itCCRdata, self.nBatchSize))
+      while arBatch:
+         self.__arPostRecords('ccrs', [dCCRPayload(test_case_id, row) for row in arBatch])
+         arBatch = list(islice(itCCRdata, self.nBatchSize))
 
    def vCreateTags(self, result_id, tags):
       """
@@ -1138,7 +1706,7 @@ Create reanimation entry.
       req_reanimation = {
          "num_of_reanimation"  : num_of_reanimation
       }
-      self.__patch_request('results', result_id, req_reanimation)
+      self.__vPatch('results', result_id, req_reanimation)
 
    def vSetCategory(self, result_id, category_main):
       """
@@ -1165,7 +1733,7 @@ Create category entry.
       req_category = {
          "category_main"  : category_main
       }
-      self.__patch_request('results', result_id, req_category)
+      self.__vPatch('results', result_id, req_category)
 
    def vUpdateFileEndTime(self, file_id, time_end):
       """
@@ -1192,7 +1760,7 @@ Update test file end time.
       req_endtime = {
          "time_end"  : time_end
       }
-      self.__patch_request('files', file_id, req_endtime)
+      self.__vPatch('files', file_id, req_endtime)
 
    def vUpdateResultEndTime(self, result_id, time_end):
       """
@@ -1219,12 +1787,16 @@ Update test result end time.
       req_endtime = {
          "time_end"  : time_end
       }
-      self.__patch_request('results', result_id, req_endtime)
+      self.__vPatch('results', result_id, req_endtime)
 
    def vFinishTestResult(self, result_id):
       """
 Update state of given test result to "new report".
 
+In pipelined mode (``max_in_flight``), waits until all test cases are created.
+In deferred-update mode, sends all deferred updates; the update of the result is
+sent last.
+
 **Arguments:**
 
 *  ``result_id``
@@ -1237,10 +1809,19 @@ Update state of given test result to "new report".
 
 (*no returns*)
       """
+      # all test cases of the result must be created before it is finished
+      self.arWaitForTestCases()
       req_finish_result = {
          "result_state"  : "new report"
       }
-      self.__patch_request('results', result_id, req_finish_result)
+      if self.bDeferredUpdates:
+         self.__vPatch('results', result_id, req_finish_result)
+         with self.__oDeferredLock:
+            # the files are complete before the result is finished
+            self.__dDeferredPatches.move_to_end("results/{}".format(result_id))
+         self.flush()
+      else:
+         self.__patch_request('results', result_id, req_finish_result)
 
    # Methods to call Stored Procedures of database
    def vUpdateEvtbl(self, result_id):
@@ -1259,6 +1840,7 @@ Call ``update_evtbl`` stored procedure to update given ``result_id``.
 
 (*no returns*)
       """
+      self.flush()
       self.__patch_request('evtblresults', result_id)
 
    def vUpdateEvtbls(self):
@@ -1273,4 +1855,5 @@ Call ``update_evtbls`` stored procedure.
 
 (*no returns*)
       """
+      self.flush()
       self.__post_request('evtblresults')
\ No newline at end of file
@@ -0,0 +1,291 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: rest_payloads.py
+#
+# Request payloads of TestResultWebApp's REST APIs, shared by RestApiDBAccess
+# and AsyncRestApiDBAccess.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#
+# ******************************************************************************
+
+def dResultPayload(project,
+                   variant,
+                   branch,
+                   result_id,
+                   result_interpretation,
+                   result_start_time,
+                   result_end_time,
+                   result_version_sw_target,
+                   result_version_sw_test,
+                   result_version_hw,
+                   result_build_url,
+                   result_report_qualitygate):
+   """
+Payload of a new test result (``results``).
+
+The arguments are the arguments of ``RestApiDBAccess.sCreateNewTestResult()``.
+   """
+   return {
+      "test_result_id" : result_id,
+      "project" : project,
+      "variant" : variant,
+      "branch" : branch,
+      "time_start" : result_start_time,
+      "time_end" : result_end_time,
+      "version_sw_target" : result_version_sw_target,
+      "version_sw_test" : result_version_sw_test,
+      "version_hardware" : result_version_hw,
+      "jenkinsurl" : result_build_url,
+      "reporting_qualitygate" : result_report_qualitygate,
+      "interpretation" : result_interpretation,
+      "result_state" : "in progress"
+   }
+
+def dFilePayload(file_name,
+                 file_tester_account,
+                 file_tester_machine,
+                 file_time_start,
+                 file_time_end,
+                 result_id,
+                 file_origin="ROBFW"):
+   """
+Payload of a new result file (``files``).
+
+The arguments are the arguments of ``RestApiDBAccess.nCreateNewFile()``.
+   """
+   return {
+      "test_result_id" : result_id,
+      "name" : file_name,
+      "tester_account" : file_tester_account,
+      "tester_machine" : file_tester_machine,
+      "time_start" : file_time_start,
+      "time_end" : file_time_end,
+      "origin" : file_origin
+   }
+
+def dFileHeaderPayload(file_id,
+                       testtoolconfiguration_testtoolname,
+                       testtoolconfiguration_testtoolversionstring,
+                       testtoolconfiguration_projectname,
+                       testtoolconfiguration_logfileencoding,
+                       testtoolconfiguration_pythonversion,
+                       testtoolconfiguration_testfile,
+                       testtoolconfiguration_logfilepath,
+                       testtoolconfiguration_logfilemode,
+                       testtoolconfiguration_ctrlfilepath,
+                       testtoolconfiguration_configfile,
+                       testtoolconfiguration_confname,
+                       testfileheader_author,
+                       testfileheader_project,
+                       testfileheader_testfiledate,
+                       testfileheader_version_major,
+                       testfileheader_version_minor,
+                       testfileheader_version_patch,
+                       testfileheader_keyword,
+                       testfileheader_shortdescription,
+                       testexecution_useraccount,
+                       testexecution_computername,
+                       testrequirements_documentmanagement,
+                       testrequirements_testenvironment,
+                       testbenchconfig_name,
+                       testbenchconfig_data,
+                       preprocessor_filter,
+                       preprocessor_parameters):
+   """
+Payload of a new file header (``fileheaders``).
+
+The arguments are the arguments of ``RestApiDBAccess.vCreateNewHeader()``.
+   """
+   return {
+      "file_id" : int(file_id),
+      "testtoolconfiguration_testtoolname" : testtoolconfiguration_testtoolname,
+      "testtoolconfiguration_testtoolversionstring" : testtoolconfiguration_testtoolversionstring,
+      "testtoolconfiguration_projectname" : testtoolconfiguration_projectname,
+      "testtoolconfiguration_logfileencoding" : testtoolconfiguration_logfileencoding,
+      "testtoolconfiguration_pythonversion" : testtoolconfiguration_pythonversion,
+      "testtoolconfiguration_testfile" : testtoolconfiguration_testfile,
+      "testtoolconfiguration_logfilepath" : testtoolconfiguration_logfilepath,
+      "testtoolconfiguration_logfilemode" : testtoolconfiguration_logfilemode,
+      "testtoolconfiguration_ctrlfilepath" : testtoolconfiguration_ctrlfilepath,
+      "testtoolconfiguration_configfile" : testtoolconfiguration_configfile,
+      "testtoolconfiguration_confname" : testtoolconfiguration_confname,
+      "testfileheader_author" : testfileheader_author,
+      "testfileheader_project" : testfileheader_project,
+      "testfileheader_testfiledate" : testfileheader_testfiledate,
+      "testfileheader_version_major" : testfileheader_version_major,
+      "testfileheader_version_minor" : testfileheader_version_minor,
+      "testfileheader_version_patch" : testfileheader_version_patch,
+      "testfileheader_keyword" : testfileheader_keyword,
+      "testfileheader_shortdescription" : testfileheader_shortdescription,
+      "testexecution_useraccount" : testexecution_useraccount,
+      "testexecution_computername" : testexecution_computername,
+      "testrequirements_documentmanagement" : testrequirements_documentmanagement,
+      "testrequirements_testenvironment" : testrequirements_testenvironment,
+      "testbenchconfig_name" : testbenchconfig_name,
+      "testbenchconfig_data" : testbenchconfig_data,
+      "preprocessor_parameters" : preprocessor_parameters,
+      "preprocessor_filter" : preprocessor_filter
+   }
+
+def dTestCasePayload(case_name,
+                     case_issue,
+                     case_tcid,
+                     case_fid,
+                     case_testnumber,
+                     case_repeatcount,
+                     case_component,
+                     case_time_start,
+                     case_result_main,
+                     case_result_state,
+                     case_result_return,
+                     case_counter_resets,
+                     case_lastlog,
+                     result_id,
+                     file_id):
+   """
+Payload of a new test case (``testcases``).
+
+The arguments are the arguments of ``RestApiDBAccess.nCreateNewSingleTestCase()``.
+   """
+   return {
+      "name"            : case_name,
+      "issue"           : case_issue,
+      "tcid"            : case_tcid,
+      "fid"             : case_fid,
+      "component"       : case_component,
+      "time_start"      : case_time_start,
+      "result_main"     : case_result_main,
+      "result_state"    : case_result_state,
+      "result_return"   : int(case_result_return),
+      "counter_resets"  : int(case_counter_resets),
+      "lastlog"         : case_lastlog,
+      "testnumber"      : str(case_testnumber),
+      "repeatcount"     : str(case_repeatcount),
+      "test_result_id"  : result_id,
+      "file_id"         : int(file_id)
+   }
+
+def dAbortPayload(result_id, abort_reason, abort_message):
+   """
+Payload of a new abort reason (``aborts``).
+
+The arguments are the arguments of ``RestApiDBAccess.vCreateAbortReason()``.
+   """
+   return {
+      "test_result_id"  : result_id,
+      "abort_reason"    : abort_reason,
+      "msg_detail"      : abort_message
+   }
+
+def dCCRPayload(test_case_id, row):
+   """
+Payload of one CCR sample ``(timestamp, MEM, CPU)`` of a test case (``ccrs``).
+   """
+   return {
+      "test_case_id" : test_case_id,
+      "timestamp"    : row[0],
+      "MEM_RSS"      : row[1],
+      "CPU"          : row[2]
+   }
+
+class TestCasePayloadEncoder(object):
+   """
+TestCasePayloadEncoder encodes the payload of ``dTestCasePayload()`` directly to
+JSON bytes. The keys are encoded once, the values ``test_result_id`` and
+``file_id`` (which are the same for all test cases of a file) are encoded once
+per file, only the other values are encoded per test case.
+
+Serializers without ``PRE_ENCODE`` (which encode a whole dict faster than the
+single values) encode ``dTestCasePayload()`` instead.
+   """
+
+   __test__ = False
+
+   # keys of dTestCasePayload() in the same order, without test_result_id and file_id
+   KEYS = ("name", "issue", "tcid", "fid", "component", "time_start", "result_main",
+           "result_state", "result_return", "counter_resets", "lastlog", "testnumber",
+           "repeatcount")
+
+   def __init__(self, serializer):
+      """
+Initializer of class ``TestCasePayloadEncoder``.
+
+**Arguments:**
+
+*  ``serializer``
+
+   / *Condition*: required / *Type*: JSONSerializer /
+
+   Serializer which encodes the values.
+      """
+      self.oSerializer = serializer
+      self.__sKeys = "{" + ",".join('"%s":%%s' % key for key in self.KEYS)
+      # (result_id, file_id, template with the encoded constant values), replaced
+      # as a whole so the encoder can be used by several threads
+      self.__tConstant = (None, None, None)
+
+   def bEncode(self, case_name,
+                     case_issue,
+                     case_tcid,
+                     case_fid,
+                     case_testnumber,
+                     case_repeatcount,
+                     case_component,
+                     case_time_start,
+                     case_result_main,
+                     case_result_state,
+                     case_result_return,
+                     case_counter_resets,
+                     case_lastlog,
+                     result_id,
+                     file_id):
+      """
+Encode the payload of a new test case (``testcases``).
+
+The arguments are the arguments of ``RestApiDBAccess.nCreateNewSingleTestCase()``.
+
+**Returns:**
+
+   / *Type*: bytes /
+
+   UTF-8 encoded JSON object, equal to ``dTestCasePayload()``.
+      """
+      if not self.oSerializer.PRE_ENCODE:
+         return self.oSerializer.bDumps(dTestCasePayload(case_name, case_issue, case_tcid,
+                                                         case_fid, case_testnumber,
+                                                         case_repeatcount, case_component,
+                                                         case_time_start, case_result_main,
+                                                         case_result_state, case_result_return,
+                                                         case_counter_resets, case_lastlog,
+                                                         result_id, file_id))
+      tConstant = self.__tConstant
+      if tConstant[0] != result_id or tConstant[1] != file_id:
+         tConstant = (result_id, file_id,
+                      self.__sKeys + ',"test_result_id":' +
+                      self.oSerializer.sDumpsValue(result_id).replace("%", "%%") +
+                      ',"file_id":' + self.oSerializer.sDumpsValue(int(file_id)) + '}')
+         self.__tConstant = tConstant
+      return self.oSerializer.bFillTemplate(tConstant[2],
+                                            (case_name, case_issue, case_tcid, case_fid,
+                                             case_component, case_time_start,
+                                             case_result_main, case_result_state,
+                                             int(case_result_return),
+                                             int(case_counter_resets), case_lastlog,
+                                             str(case_testnumber), str(case_repeatcount)))
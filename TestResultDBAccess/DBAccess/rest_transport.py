@@ -0,0 +1,226 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: rest_transport.py
+#
+# Configurable HTTP transport (connection pool, keep-alive, timeouts, retries)
+# of RestApiDBAccess with statistics of the pool usage.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#
+# ******************************************************************************
+
+import threading
+
+from urllib3.util.retry import Retry
+from .ca_bundle import SSLContextAdapter
+
+def _oCountingPoolClass(oPoolClass, fnCount):
+   """
+Derive a connection pool class whose connections call ``fnCount`` at each connect.
+   """
+   class CountingConnection(oPoolClass.ConnectionCls):
+      def connect(self):
+         fnCount()
+         return super(CountingConnection, self).connect()
+   return type(oPoolClass.__name__, (oPoolClass,), {'ConnectionCls': CountingConnection})
+
+class RestTransportAdapter(SSLContextAdapter):
+   """
+RestTransportAdapter is the transport adapter of the ``requests`` session of
+``RestApiDBAccess``.
+
+*  ``pool_maxsize`` connections per host are kept open and reused (keep-alive),
+   so parallel uploaders do not open a new connection per request. With
+   ``pool_block`` a request waits for a free connection instead of opening a
+   connection which is not kept in the pool.
+*  ``connect_timeout`` and ``read_timeout`` are used for all requests without an
+   explicit timeout.
+*  Idempotent requests (``RETRY_METHODS``) are retried up to ``retries`` times
+   after connection errors, read errors and responses with a status of
+   ``RETRY_STATUS``. The waiting time between the retries grows exponentially
+   with ``backoff_factor``.
+
+The defaults keep the previous behavior: no timeouts and no retries.
+   """
+
+   RETRY_METHODS = frozenset(['GET', 'PATCH'])
+   RETRY_STATUS  = (429, 502, 503, 504)
+
+   def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False,
+                      keep_alive=True, connect_timeout=None, read_timeout=None,
+                      retries=0, backoff_factor=0.5, ca_bundle=None):
+      """
+Initializer of class ``RestTransportAdapter``.
+
+**Arguments:**
+
+*  ``pool_connections``
+
+   / *Condition*: optional / *Type*: int / *Default*: 10 /
+
+   Number of hosts for which a connection pool is kept.
+
+*  ``pool_maxsize``
+
+   / *Condition*: optional / *Type*: int / *Default*: 10 /
+
+   Maximum number of connections per host which are kept open. Should be at
+   least the number of parallel requests.
+
+*  ``pool_block``
+
+   / *Condition*: optional / *Type*: bool / *Default*: False /
+
+   Wait for a free connection if ``pool_maxsize`` connections are in use.
+
+*  ``keep_alive``
+
+   / *Condition*: optional / *Type*: bool / *Default*: True /
+
+   Keep the connections open for the next requests. If ``False``, each request
+   asks the server to close the connection.
+
+*  ``connect_timeout``, ``read_timeout``
+
+   / *Condition*: optional / *Type*: float / *Default*: None /
+
+   Timeouts in seconds of requests without explicit timeout, ``None`` waits
+   forever.
+
+*  ``retries``
+
+   / *Condition*: optional / *Type*: int / *Default*: 0 /
+
+   Number of retries of idempotent requests.
+
+*  ``backoff_factor``
+
+   / *Condition*: optional / *Type*: float / *Default*: 0.5 /
+
+   Base of the exponential waiting time between retries in seconds.
+
+*  ``ca_bundle``
+
+   / *Condition*: optional / *Type*: str / *Default*: None /
+
+   Path of the CA bundle which is replaced by the shared SSL context.
+      """
+      self.bKeepAlive  = keep_alive
+      self.timeout     = (connect_timeout, read_timeout)
+      self.__oLock     = threading.Lock()
+      self.__nInFlight = 0
+      self.vResetStatistics()
+      if retries:
+         oRetry = Retry(total=retries, connect=retries, read=retries, status=retries,
+                        backoff_factor=backoff_factor,
+                        allowed_methods=self.RETRY_METHODS,
+                        status_forcelist=self.RETRY_STATUS,
+                        raise_on_status=False)
+      else:
+         # as the default of requests: read errors are raised as they are
+         oRetry = Retry(0, read=False)
+      super(RestTransportAdapter, self).__init__(ca_bundle=ca_bundle,
+                                                 pool_connections=pool_connections,
+                                                 pool_maxsize=pool_maxsize,
+                                                 pool_block=pool_block,
+                                                 max_retries=oRetry)
+
+   def init_poolmanager(self, *args, **kwargs):
+      super(RestTransportAdapter, self).init_poolmanager(*args, **kwargs)
+      # connection pools whose connections count each connect (also reconnects
+      # of a connection object after the server closed the connection)
+      self.poolmanager.pool_classes_by_scheme = dict(
+         (sScheme, _oCountingPoolClass(oPoolClass, self.__vCountConnect))
+         for sScheme, oPoolClass in self.poolmanager.pool_classes_by_scheme.items())
+
+   def __vCountConnect(self):
+      with self.__oLock:
+         self.dStatistics['connections'] += 1
+
+   def add_headers(self, request, **kwargs):
+      if not self.bKeepAlive:
+         request.headers['Connection'] = 'close'
+
+   def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+      if timeout is None:
+         timeout = self.timeout
+      with self.__oLock:
+         self.__nInFlight += 1
+         self.dStatistics['requests'] += 1
+         self.dStatistics['max_in_flight'] = max(self.dStatistics['max_in_flight'],
+                                                 self.__nInFlight)
+      try:
+         response = super(RestTransportAdapter, self).send(request, stream=stream,
+                                                           timeout=timeout, verify=verify,
+                                                           cert=cert, proxies=proxies)
+      except Exception:
+         with self.__oLock:
+            self.dStatistics['errors'] += 1
+         raise
+      finally:
+         with self.__oLock:
+            self.__nInFlight -= 1
+      oRetries = getattr(response.raw, 'retries', None)
+      if oRetries is not None and oRetries.history:
+         with self.__oLock:
+            self.dStatistics['retries'] += len(oRetries.history)
+      return response
+
+   def dGetStatistics(self):
+      """
+Get the statistics of the transport.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+   / *Type*: dict /
+
+   Number of ``requests``, failed requests (``errors``), ``retries``,
+   ``max_in_flight`` parallel requests, opened ``connections`` and ``reused``
+   connections (requests without a new connection) and number of connection
+   ``pools``.
+      """
+      with self.__oLock:
+         dStatistics = dict(self.dStatistics)
+      dStatistics['reused']      = max(dStatistics['requests'] + dStatistics['retries'] -
+                                       dStatistics['connections'], 0)
+      dStatistics['pools']       = len(self.poolmanager.pools)
+      return dStatistics
+
+   def vResetStatistics(self):
+      """
+Reset the statistics of the transport.
+
+**Arguments:**
+
+(*no arguments*)
+
+**Returns:**
+
+(*no returns*)
+      """
+      with self.__oLock:
+         self.dStatistics = {'requests'      : 0,
+                             'errors'        : 0,
+                             'retries'       : 0,
+                             'connections'   : 0,
+                             'max_in_flight' : self.__nInFlight}
@@ -0,0 +1,207 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: session_cache.py
+#
+# On-disk cache of authenticated REST API sessions, so a new process can reuse
+# the session of a previous login instead of the login handshake.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#  - share the user cache directory and the permission check with ca_bundle
+#  - move sUserCacheDirectory() and bIsPrivate() to user_cache
+#
+# ******************************************************************************
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from .user_cache import bIsPrivate, sUserCacheDirectory
+
+class RestSessionCache(object):
+   """
+RestSessionCache stores the cookies of authenticated REST API sessions on disk,
+one file per host, database and user.
+
+*  The directory is only accessible by its owner (mode 0700), the session files
+   are only readable and writable by their owner (mode 0600). Files which are
+   accessible by other users are ignored.
+*  A session expires with the first of its cookies, but at the latest ``ttl``
+   seconds after the login.
+   """
+
+   def __init__(self, directory=None, ttl=8 * 3600):
+      """
+Initializer of class ``RestSessionCache``.
+
+**Arguments:**
+
+*  ``directory``
+
+   / *Condition*: optional / *Type*: str / *Default*: None /
+
+   Directory of the session files, a ``TestResultDBAccess/sessions`` directory in
+   the user's cache directory by default.
+
+*  ``ttl``
+
+   / *Condition*: optional / *Type*: int / *Default*: 28800 /
+
+   Maximum lifetime of a cached session in seconds.
+      """
+      self.sDirectory = directory or sUserCacheDirectory("sessions")
+      self.nTTL = ttl
+
+   def sGetPath(self, host, database, user):
+      """
+Get the path of the session file of a host, database and user.
+
+**Arguments:**
+
+*  ``host``, ``database``, ``user``
+
+   / *Condition*: required / *Type*: str /
+
+   Key of the session.
+
+**Returns:**
+
+   / *Type*: str /
+
+   Path of the session file.
+      """
+      sKey = "\n".join((host, database, user)).encode('utf-8')
+      return os.path.join(self.sDirectory,
+                          "session-%s.json" % hashlib.sha256(sKey).hexdigest()[:32])
+
+   def dLoad(self, host, database, user):
+      """
+Load a valid session.
+
+**Arguments:**
+
+*  ``host``, ``database``, ``user``
+
+   / *Condition*: required / *Type*: str /
+
+   Key of the session.
+
+**Returns:**
+
+   / *Type*: dict /
+
+   Session with ``cookies`` (list of dict with ``name``, ``value``, ``domain``,
+   ``path``, ``expires`` and ``secure``) and ``expires`` (timestamp). ``None`` if
+   there is no valid session.
+      """
+      sPath = self.sGetPath(host, database, user)
+      try:
+         with open(sPath, 'r', encoding='utf-8') as infile:
+            if not bIsPrivate(os.fstat(infile.fileno())):
+               return None
+            dSession = json.load(infile)
+      except (OSError, ValueError):
+         return None
+      if not isinstance(dSession, dict) or \
+         (dSession.get('host'), dSession.get('database'), dSession.get('user')) != \
+         (host, database, user) or \
+         not dSession.get('cookies') or dSession.get('expires', 0) <= time.time():
+         return None
+      return dSession
+
+   def vSave(self, host, database, user, cookies):
+      """
+Save the cookies of a session after the login.
+
+**Arguments:**
+
+*  ``host``, ``database``, ``user``
+
+   / *Condition*: required / *Type*: str /
+
+   Key of the session.
+
+*  ``cookies``
+
+   / *Condition*: required / *Type*: http.cookiejar.CookieJar /
+
+   Cookies of the authenticated session.
+
+**Returns:**
+
+(*no returns*)
+      """
+      fNow = time.time()
+      fExpires = fNow + self.nTTL
+      arCookies = []
+      for cookie in cookies:
+         if cookie.expires is not None:
+            if cookie.expires <= fNow:
+               continue
+            fExpires = min(fExpires, cookie.expires)
+         arCookies.append({'name'    : cookie.name,
+                           'value'   : cookie.value,
+                           'domain'  : cookie.domain,
+                           'path'    : cookie.path,
+                           'expires' : cookie.expires,
+                           'secure'  : cookie.secure})
+      if not arCookies:
+         return
+
+      os.makedirs(self.sDirectory, mode=0o700, exist_ok=True)
+      sPath = self.sGetPath(host, database, user)
+      # mkstemp creates the file with mode 0600, the rename replaces the previous
+      # session at once
+      fd, sTmpFile = tempfile.mkstemp(prefix="session-", suffix=".tmp", dir=self.sDirectory)
+      try:
+         with os.fdopen(fd, 'w', encoding='utf-8') as outfile:
+            json.dump({'host'     : host,
+                       'database' : database,
+                       'user'     : user,
+                       'expires'  : fExpires,
+                       'cookies'  : arCookies}, outfile)
+         os.replace(sTmpFile, sPath)
+      except BaseException:
+         try:
+            os.remove(sTmpFile)
+         except OSError:
+            pass
+         raise
+
+   def vRemove(self, host, database, user):
+      """
+Remove a session, e.g. after the server rejected it.
+
+**Arguments:**
+
+*  ``host``, ``database``, ``user``
+
+   / *Condition*: required / *Type*: str /
+
+   Key of the session.
+
+**Returns:**
+
+(*no returns*)
+      """
+      try:
+         os.remove(self.sGetPath(host, database, user))
+      except OSError:
+         pass
@@ -0,0 +1,384 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: statement_registry.py
+#
+# This class holds all SQL statements of DirectDBAccess, compiled once for the
+# connected database.
+#
+# History:
+#
+# October 2026:
+#  - initial version
+#
+# ******************************************************************************
+
+# column order of the buffered test case tuples
+TBL_CASE_BULK_COLUMNS = """name, issue, tcid, fid, testnumber, repeatcount,
+            component, time_start, result_main, result_state, result_return,
+            counter_resets, test_result_id, file_id, lastlog"""
+
+class StatementRegistry(object):
+   """
+StatementRegistry provides the fully parameterized SQL statements of
+``DirectDBAccess``.
+
+The templates are formatted once with the database name when the registry is
+created in ``DirectDBAccess.connect()``. All values are passed as query
+parameters, so the statement text is the same for every call.
+
+The statements are named after the ``DirectDBAccess`` method which executes
+them, optionally followed by ``:`` and the name of the step. ``sMethodOf()``
+maps a statement back to this method for the round trip accounting.
+
+Statements with a variable number of values (``IN`` lists) contain a
+``{values}`` placeholder which is expanded by ``sExpand()``, statements with a
+variable list of updated columns contain a ``{columns}`` placeholder which is
+expanded by ``sExpandColumns()``.
+
+**Note:** ``MySQLdb`` (mysqlclient) only supports client-side parameter
+interpolation, there is no server-side prepared statement API which could be
+used here.
+   """
+
+   __TEMPLATES = {
+      'connect:server_settings' :
+         """select @@max_allowed_packet, @@auto_increment_increment,
+                   @@innodb_autoinc_lock_mode""",
+
+      'cleanAllTables' : (
+         """delete from {db}.evtbl_result_main where test_result_id!="" """,
+         """delete from {db}.evtbl_failed_unknown_per_component where test_result_id!="" """,
+         """delete from {db}.tbl_usr_case where test_case_id>0""",
+         """delete from {db}.tbl_usr_case_history where test_case_id>0""",
+         """delete from {db}.tbl_usr_comments where test_case_id>0""",
+         """delete from {db}.tbl_usr_links where test_case_id>0""",
+         """delete from {db}.tbl_usr_result where test_result_id!="" """,
+         """delete from {db}.tbl_usr_result_history where test_result_id!="" """,
+         """delete from {db}.tbl_file_header where file_id>0""",
+         """delete from {db}.tbl_case where test_case_id>0""",
+         """delete from {db}.tbl_file where file_id>0""",
+         """delete from {db}.tbl_result where test_result_id!="" """,
+         """delete from {db}.tbl_prj where project<>"a" """,
+      ),
+
+      'sCreateNewTestResult:tbl_prj' :
+         """insert into {db}.tbl_prj
+         ( variant,project, branch) values (%s, %s, %s)
+         on duplicate key update project=project""",
+
+      'sCreateNewTestResult:tbl_result' :
+         """insert into {db}.tbl_result (test_result_id,
+         variant,project,branch, time_start,time_end, version_sw_target,
+         version_sw_test,version_hardware,jenkinsurl,reporting_qualitygate,result_state)
+         values (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)""",
+
+      'sCreateNewTestResult:interpretation' :
+         """update {db}.tbl_result set interpretation=%s
+            where test_result_id=%s""",
+
+      'nCreateNewFile' :
+         """insert into {db}.tbl_file (name,tester_account,
+                     tester_machine,time_start,time_end,test_result_id,origin)
+                     values (%s,%s,%s,%s,%s,%s,%s)""",
+
+      'vCreateNewHeader' :
+         """insert into {db}.tbl_file_header
+                        ( file_id,
+                          testtoolconfiguration_testtoolname,
+                          testtoolconfiguration_testtoolversionstring,
+                          testtoolconfiguration_projectname,
+                          testtoolconfiguration_logfileencoding,
+                          testtoolconfiguration_pythonversion,
+                          testtoolconfiguration_testfile,
+                          testtoolconfiguration_logfilepath,
+                          testtoolconfiguration_logfilemode,
+                          testtoolconfiguration_ctrlfilepath,
+                          testtoolconfiguration_configfile,
+                          testtoolconfiguration_confname,
+
+                          testfileheader_author,
+                          testfileheader_project,
+                          testfileheader_testfiledate,
+                          testfileheader_version_major,
+                          testfileheader_version_minor,
+                          testfileheader_version_patch,
+                          testfileheader_keyword,
+                          testfileheader_shortdescription,
+                          testexecution_useraccount,
+                          testexecution_computername,
+
+                          testrequirements_documentmanagement,
+                          testrequirements_testenvironment,
+
+                          testbenchconfig_name,
+                          testbenchconfig_data,
+                          preprocessor_filter,
+                          preprocessor_parameters)
+                  values ( %s, %s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s, %s,
+                           %s, %s, %s,%s,%s,%s,%s,%s,%s,%s,%s,%s)""",
+
+      'nCreateNewSingleTestCase' :
+         """insert into {db}.tbl_case (name, issue, tcid, fid,
+               testnumber, repeatcount, component, time_start, result_main, result_state,
+               result_return, counter_resets, lastlog, test_result_id, file_id)
+               values (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)""",
+
+      'nCreateNewTestCase' :
+         """insert into {db}.tbl_case (""" + TBL_CASE_BULK_COLUMNS + """)
+            values (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)""",
+
+      'nCreateNewTestCase:load_data' :
+         """load data local infile %s into table {db}.tbl_case
+               character set utf8mb4
+               fields terminated by '\\t' escaped by '\\\\'
+               lines terminated by '\\n'
+               (""" + TBL_CASE_BULK_COLUMNS + """)""",
+
+      # IDs of the rows which were inserted by the last multi-row insert into given files
+      'arCreateNewTestCases:ids' :
+         """SELECT test_case_id FROM {db}.tbl_case
+               WHERE test_case_id>=%s AND file_id IN ({{values}})
+               ORDER BY test_case_id LIMIT %s""",
+
+      'nCreateNewTestCase:savepoint' :
+         """SAVEPOINT tbl_case_batch""",
+
+      'nCreateNewTestCase:rollback_savepoint' :
+         """ROLLBACK TO SAVEPOINT tbl_case_batch""",
+
+      'nCreateNewTestCase:release_savepoint' :
+         """RELEASE SAVEPOINT tbl_case_batch""",
+
+      'vCreateTags' :
+         """insert into {db}.tbl_usr_result (test_result_id, tags)
+                    values (%s,%s)""",
+
+      'vSetCategory' :
+         """update {db}.tbl_result set category_main=%s where test_result_id=%s""",
+
+      'vUpdateStartEndTime' :
+         """update {db}.tbl_result set time_start=%s, time_end=%s
+                  where test_result_id=%s""",
+
+      'arGetCategories' :
+         """select category from {db}.tbl_result_categories""",
+
+      'vCreateAbortReason' :
+         """insert into {db}.tbl_abort
+                           (test_result_id, abort_reason, msg_detail)
+                           values (%s,%s,%s)""",
+
+      'vCreateReanimation' :
+         """update {db}.tbl_result set num_of_reanimation=%s where
+                        test_result_id=%s""",
+
+      'vCreateCCRdata' :
+         """insert into {db}.tbl_ccr (test_case_id, timestamp, MEM, CPU) values(%s,%s,%s,%s)""",
+
+      'vCreateCCRdata:load_data' :
+         """load data local infile %s into table {db}.tbl_ccr
+               character set utf8mb4
+               fields terminated by '\\t' escaped by '\\\\'
+               lines terminated by '\\n'
+               (test_case_id, timestamp, MEM, CPU)""",
+
+      'vFinishTestResult' :
+         """update {db}.tbl_result set result_state="new report"
+                  where test_result_id=%s""",
+
+      # deferred updates of a result (see DirectDBAccess.flush)
+      'flush:tbl_result' :
+         """update {db}.tbl_result set {{columns}} where test_result_id=%s""",
+
+      'vUpdateEvtbls' :
+         """call {db}.update_evtbls();""",
+
+      'vUpdateEvtbl' :
+         """call {db}.update_evtbl(%s);""",
+
+      'vEnableForeignKeyCheck' :
+         """SET FOREIGN_KEY_CHECKS=%s;""",
+
+      'oBulkLoadSession:read' :
+         """SELECT @@SESSION.foreign_key_checks, @@SESSION.unique_checks""",
+
+      'oBulkLoadSession:set' :
+         """SET SESSION foreign_key_checks=%s, unique_checks=%s""",
+
+      # test cases of given files which have no matching file or result
+      'oBulkLoadSession:integrity_check' :
+         """SELECT c.file_id, COUNT(*) FROM {db}.tbl_case c
+               LEFT JOIN {db}.tbl_file f
+                  ON f.file_id=c.file_id AND f.test_result_id=c.test_result_id
+               LEFT JOIN {db}.tbl_result r
+                  ON r.test_result_id=c.test_result_id
+               WHERE c.file_id IN ({{values}})
+                  AND (f.file_id IS NULL OR r.test_result_id IS NULL)
+               GROUP BY c.file_id""",
+
+      'sGetLatestFileID' :
+         """SELECT MAX(file_id) FROM {db}.tbl_file WHERE test_result_id=%s""",
+
+      'vUpdateFileEndTime' :
+         """UPDATE {db}.tbl_file SET time_end=%s WHERE file_id=%s""",
+
+      'vUpdateResultEndTime' :
+         """UPDATE {db}.tbl_result SET time_end=%s WHERE test_result_id=%s""",
+
+      'bExistingResultID' :
+         """SELECT test_result_id FROM {db}.tbl_result WHERE test_result_id=%s""",
+
+      'arGetProjectVersionSWByID' :
+         """SELECT project, version_sw_target FROM {db}.tbl_result WHERE test_result_id=%s""",
+   }
+
+   def __init__(self, database):
+      """
+Initializer of class ``StatementRegistry``.
+
+**Arguments:**
+
+*  ``database``
+
+   / *Condition*: required / *Type*: str /
+
+   Database name which is used to qualify all tables.
+      """
+      self.database = database
+      self.__dStatements = {}
+      self.__dMethods = {}
+      self.__dExpanded = {}
+      for name, template in StatementRegistry.__TEMPLATES.items():
+         sMethod = name.split(':')[0]
+         if isinstance(template, tuple):
+            self.__dStatements[name] = tuple(t.format(db=database) for t in template)
+            for sql in self.__dStatements[name]:
+               self.__dMethods[sql] = sMethod
+         else:
+            self.__dStatements[name] = template.format(db=database)
+            self.__dMethods[self.__dStatements[name]] = sMethod
+
+   def __getitem__(self, name):
+      """
+Get the compiled statement of given name.
+
+**Arguments:**
+
+*  ``name``
+
+   / *Condition*: required / *Type*: str /
+
+   Statement name.
+
+**Returns:**
+
+   / *Type*: str /
+
+   The SQL statement (a tuple of statements for ``cleanAllTables``).
+      """
+      return self.__dStatements[name]
+
+   def __contains__(self, name):
+      return name in self.__dStatements
+
+   def sExpand(self, name, nValues):
+      """
+Get the compiled statement of given name with ``nValues`` parameter placeholders
+in place of ``{values}``. The expanded statements are cached per length.
+
+**Arguments:**
+
+*  ``name``
+
+   / *Condition*: required / *Type*: str /
+
+   Statement name.
+
+*  ``nValues``
+
+   / *Condition*: required / *Type*: int /
+
+   Number of values of the ``IN`` list.
+
+**Returns:**
+
+   / *Type*: str /
+
+   The SQL statement.
+      """
+      key = (name, nValues)
+      sql = self.__dExpanded.get(key)
+      if sql is None:
+         sql = self.__dStatements[name].format(values=','.join(['%s'] * nValues))
+         self.__dExpanded[key] = sql
+         self.__dMethods[sql] = name.split(':')[0]
+      return sql
+
+   def sExpandColumns(self, name, tColumns):
+      """
+Get the compiled statement of given name with one ``<column>=%s`` assignment per
+column in place of ``{columns}``. The expanded statements are cached per column
+tuple.
+
+**Arguments:**
+
+*  ``name``
+
+   / *Condition*: required / *Type*: str /
+
+   Statement name.
+
+*  ``tColumns``
+
+   / *Condition*: required / *Type*: tuple /
+
+   Names of the updated columns. They are part of the statement text, so they
+   must be fixed names of the caller, never values.
+
+**Returns:**
+
+   / *Type*: str /
+
+   The SQL statement.
+      """
+      key = (name, tColumns)
+      sql = self.__dExpanded.get(key)
+      if sql is None:
+         sql = self.__dStatements[name].format(columns=', '.join('%s=%%s' % sColumn
+                                                                 for sColumn in tColumns))
+         self.__dExpanded[key] = sql
+         self.__dMethods[sql] = name.split(':')[0]
+      return sql
+
+   def sMethodOf(self, sql):
+      """
+Get the name of the method which executes the given statement.
+
+**Arguments:**
+
+*  ``sql``
+
+   / *Condition*: required / *Type*: str /
+
+   SQL statement which was taken from this registry.
+
+**Returns:**
+
+   / *Type*: str /
+
+   Method name, ``other`` for statements which are not part of the registry.
+      """
+      return self.__dMethods.get(sql, 'other')
@@ -0,0 +1,84 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# ******************************************************************************
+#
+# File: user_cache.py
+#
+# Location of the user's cache directory and the check of private files, used
+# by the session cache and the CA bundle.
+#
+# History:
+#
+# October 2026:
+#  - initial version, moved from session_cache
+#
+# ******************************************************************************
+
+import os
+import sys
+
+def sUserCacheDirectory(name):
+   """
+Get the path of a directory of TestResultDBAccess in the user's cache directory.
+
+**Arguments:**
+
+*  ``name``
+
+   / *Condition*: required / *Type*: str /
+
+   Name of the directory, e.g. ``sessions``.
+
+**Returns:**
+
+   / *Type*: str /
+
+   Path of the directory (which may not exist yet).
+   """
+   if sys.platform == 'win32':
+      sBase = os.environ.get('LOCALAPPDATA') or os.path.expanduser("~")
+   else:
+      sBase = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser("~"), ".cache")
+   return os.path.join(sBase, "TestResultDBAccess", name)
+
+def bIsPrivate(oStat, mask=0o077):
+   """
+Check whether a file or directory is owned by the current user and not
+accessible by other users.
+
+**Arguments:**
+
+*  ``oStat``
+
+   / *Condition*: required / *Type*: os.stat_result /
+
+   Status of the file or directory.
+
+*  ``mask``
+
+   / *Condition*: optional / *Type*: int / *Default*: 0o077 /
+
+   Permission bits which must not be set.
+
+**Returns:**
+
+   / *Type*: bool /
+
+   True if the file or directory is private, always True without POSIX
+   permissions.
+   """
+   if not hasattr(os, 'getuid'):
+      # no POSIX permissions
+      return True
+   return oStat.st_uid == os.getuid() and not (oStat.st_mode & mask)
@@ -25,15 +25,49 @@
 # March 2024:
 #  - initial version
 #
+# October 2026:
+#  - pass keyword arguments (e.g. connection pool) to the created DBAccess
+#  - import only the backend of the requested access method
+#  - add access method "rest_async" for AsyncRestApiDBAccess
+#
 # ******************************************************************************
 
-from .DBAccess import DirectDBAccess, RestApiDBAccess
-
 class DBAccessFactory:
-   def create(self, access_method):
+   def create(self, access_method, **kwargs):
+      """
+Create the DBAccess object for given access method.
+
+**Arguments:**
+
+*  ``access_method``
+
+   / *Condition*: required / *Type*: str /
+
+   ``db`` for direct database access, ``rest`` for access via REST APIs,
+   ``rest_async`` for asynchronous access via REST APIs (coroutines).
+
+*  ``kwargs``
+
+   / *Condition*: optional / *Type*: dict /
+
+   Keyword arguments which are passed to the constructor of the DBAccess class,
+   e.g. ``pool`` to get a handle which uses a ``DirectDBConnectionPool``.
+
+**Returns:**
+
+   / *Type*: DBAccessInterface /
+
+   The created DBAccess object.
+      """
+      # import the backend only when it is used (MySQLdb resp. requests)
       if access_method == "db":
-         return DirectDBAccess()
+         from .DBAccess.direct_db_accesss import DirectDBAccess
+         return DirectDBAccess(**kwargs)
       elif access_method == "rest":
-         return RestApiDBAccess()
+         from .DBAccess.rest_api_db_access import RestApiDBAccess
+         return RestApiDBAccess(**kwargs)
+      elif access_method == "rest_async":
+         from .DBAccess.async_rest_api_db_access import AsyncRestApiDBAccess
+         return AsyncRestApiDBAccess(**kwargs)
       else:
          raise ValueError("Invalid access_method argument")
\ No newline at end of file
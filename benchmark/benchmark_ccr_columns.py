@@ -0,0 +1,85 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: benchmark_ccr_columns.py
+#
+# Microbenchmark of the client CPU which is spent to prepare CCR samples for the
+# upload: list of rows which are changed in place (as before vCreateCCRdataColumns)
+# versus columns (array.array, and NumPy arrays with datetime64 timestamps if
+# NumPy is installed).
+#
+# Usage:
+#    python benchmark_ccr_columns.py [--samples 500000]
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import argparse
+import datetime
+import os
+import sys
+import time
+from array import array
+from itertools import repeat
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from TestResultDBAccess.DBAccess.ccr_columns import arCCRColumns
+
+TEST_CASE_ID = 4711
+
+# row building as it was done in vCreateCCRdata before
+def legacy_rows(lCCRdata):
+   sqlVals = []
+   for row in lCCRdata:
+      row.insert(0, TEST_CASE_ID)
+      sqlVals.append(tuple(row))
+   return sqlVals
+
+def column_rows(timestamps, mem, cpu):
+   arTimestamps, arMEM, arCPU = arCCRColumns(timestamps, mem, cpu)
+   return list(zip(repeat(TEST_CASE_ID, len(arTimestamps)), arTimestamps, arMEM, arCPU))
+
+def fCPU(func, *args):
+   fStart = time.process_time()
+   func(*args)
+   return time.process_time() - fStart
+
+if __name__ == "__main__":
+   oParser = argparse.ArgumentParser(description="Benchmark CCR sample preparation")
+   oParser.add_argument("--samples", type=int, default=500000)
+   args = oParser.parse_args()
+
+   oStart = datetime.datetime(2026, 10, 1)
+   arTimestamps = [(oStart + datetime.timedelta(milliseconds=100*i)).strftime("%Y-%m-%d %H:%M:%S.%f")
+                   for i in range(args.samples)]
+   arMEM = [1024 * i for i in range(args.samples)]
+   arCPU = [(i % 100) / 10.0 for i in range(args.samples)]
+
+   lCCRdata = [[t, m, c] for t, m, c in zip(arTimestamps, arMEM, arCPU)]
+   arCases = [("list of rows (legacy)", legacy_rows, (lCCRdata,)),
+              ("array.array columns", column_rows, (arTimestamps, array('q', arMEM), array('d', arCPU)))]
+   try:
+      import numpy
+      arCases.append(("numpy columns", column_rows,
+                      (numpy.datetime64('2026-10-01T00:00:00.000') +
+                          numpy.arange(args.samples) * numpy.timedelta64(100, 'ms'),
+                       numpy.array(arMEM, dtype=numpy.int64),
+                       numpy.array(arCPU))))
+   except ImportError:
+      print("NumPy is not installed, skip numpy columns")
+
+   print("%-24s %12s %14s" % ("input", "CPU [s]", "samples/s"))
+   for sName, func, func_args in arCases:
+      fSeconds = fCPU(func, *func_args)
+      print("%-24s %12.3f %14.0f" % (sName, fSeconds, args.samples / fSeconds))
@@ -0,0 +1,98 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: benchmark_import_time.py
+#
+# Import time benchmark of the package: runs `python -X importtime -c <statement>`
+# in a fresh process per statement and reports the cumulative import time of
+# the modules imported by the statement (the interpreter startup is excluded).
+#
+# Usage:
+#    python benchmark_import_time.py [--repeat 5] [--top 10]
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+STATEMENTS = [
+   ("package",        "import TestResultDBAccess"),
+   ("factory + db",   "from TestResultDBAccess import DBAccessFactory; "
+                      "DBAccessFactory().create('db')"),
+   ("factory + rest", "from TestResultDBAccess import DBAccessFactory; "
+                      "DBAccessFactory().create('rest')"),
+]
+
+# backend dependencies which should only be imported by the backend using them
+BACKEND_MODULES = ("MySQLdb", "requests", "requests_kerberos", "urllib3")
+
+# import time: self [us] | cumulative | imported package
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def dImportTimes(sStatement):
+   """
+Run the statement in a fresh interpreter and return the cumulative import time
+[us] of each top level import and the set of all imported modules.
+   """
+   oProcess = subprocess.run([sys.executable, "-X", "importtime", "-c", sStatement],
+                             cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                             universal_newlines=True)
+   if oProcess.returncode != 0:
+      raise Exception("'%s' failed:\n%s" % (sStatement, oProcess.stderr))
+   dCumulative = {}
+   setModules  = set()
+   for sLine in oProcess.stderr.splitlines():
+      oMatch = IMPORTTIME_LINE.match(sLine)
+      if oMatch is None:
+         continue
+      sModule = oMatch.group(4)
+      setModules.add(sModule)
+      # one space of indentation is a module imported at top level
+      if len(oMatch.group(3)) == 1:
+         dCumulative[sModule] = dCumulative.get(sModule, 0) + int(oMatch.group(2))
+   return dCumulative, setModules
+
+if __name__ == "__main__":
+   oParser = argparse.ArgumentParser(description="Benchmark import time of TestResultDBAccess")
+   oParser.add_argument("--repeat", type=int, default=5,
+                        help="number of runs per statement, the minimum is reported")
+   oParser.add_argument("--top", type=int, default=10,
+                        help="number of the slowest top level imports to report")
+   args = oParser.parse_args()
+
+   # modules which the interpreter imports at startup anyway
+   _, setStartup = dImportTimes("pass")
+
+   for sName, sStatement in STATEMENTS:
+      dBest = {}
+      for _ in range(args.repeat):
+         dCumulative, setModules = dImportTimes(sStatement)
+         for sModule, nTime in dCumulative.items():
+            if sModule in setStartup:
+               continue
+            dBest[sModule] = min(nTime, dBest.get(sModule, nTime))
+      nTotal = sum(dBest.values())
+      print("%s: %s" % (sName, sStatement))
+      print("   total import time %10.1f ms" % (nTotal / 1000.0))
+      print("   backend modules   %s" % (", ".join(sModule for sModule in BACKEND_MODULES
+                                                   if sModule in setModules) or "-"))
+      for sModule, nTime in sorted(dBest.items(), key=lambda item: -item[1])[:args.top]:
+         print("   %-30s %10.1f ms" % (sModule, nTime / 1000.0))
+      print()
@@ -0,0 +1,86 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: benchmark_rest_async.py
+#
+# Throughput benchmark of test case creation via REST API against the local stub
+# server (pytest/testcases/rest_stub_server.py) with a simulated link latency:
+# RestApiDBAccess sequential and pipelined versus AsyncRestApiDBAccess.
+#
+# Usage:
+#    python benchmark_rest_async.py [--cases 500] [--latency 0.02] [--in-flight 16]
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "pytest", "testcases"))
+
+from rest_stub_server import RestStubServer
+from TestResultDBAccess.DBAccess.rest_api_db_access import RestApiDBAccess
+
+RESULT_ID = "3d8c6f0e-4c7b-4a5e-9d0e-3b1f2d4e5a6b"
+
+def arTestCases(nCases):
+   return [("test case %d" % i, "", "TC-%d" % i, "", i, 1, "component",
+            "2026-10-01 10:00:00", "PASSED", "complete", 0, 0, "", RESULT_ID, 1)
+           for i in range(nCases)]
+
+def run_sync(sBaseURL, arCases, nInFlight):
+   oDBAccess = RestApiDBAccess(max_in_flight=nInFlight)
+   oDBAccess.base_url = sBaseURL
+   fStart = time.perf_counter()
+   oDBAccess.arCreateNewTestCases(arCases)
+   return time.perf_counter() - fStart
+
+def run_async(sBaseURL, arCases, nInFlight):
+   from TestResultDBAccess.DBAccess.async_rest_api_db_access import AsyncRestApiDBAccess
+   async def scenario():
+      oDBAccess = AsyncRestApiDBAccess(max_in_flight=nInFlight)
+      oDBAccess.base_url = sBaseURL
+      fStart = time.perf_counter()
+      await oDBAccess.arCreateNewTestCases(arCases)
+      fDuration = time.perf_counter() - fStart
+      await oDBAccess.session.close()
+      return fDuration
+   return asyncio.run(scenario())
+
+if __name__ == "__main__":
+   oParser = argparse.ArgumentParser(description="Benchmark REST test case creation")
+   oParser.add_argument("--cases", type=int, default=500)
+   oParser.add_argument("--latency", type=float, default=0.02,
+                        help="response latency of the stub server in seconds")
+   oParser.add_argument("--in-flight", type=int, default=16)
+   args = oParser.parse_args()
+
+   arCases = arTestCases(args.cases)
+   arVariants = [("sync sequential", run_sync, 0),
+                 ("sync pipelined", run_sync, args.in_flight)]
+   try:
+      import aiohttp
+      arVariants.append(("async", run_async, args.in_flight))
+   except ImportError:
+      print("aiohttp is not installed, AsyncRestApiDBAccess is skipped")
+
+   print("%-16s %10s %12s" % ("variant", "time [s]", "cases/s"))
+   for sName, fnRun, nInFlight in arVariants:
+      with RestStubServer(latency=args.latency) as oServer:
+         fDuration = fnRun(oServer.base_url, arCases, nInFlight)
+      print("%-16s %10.2f %12.0f" % (sName, fDuration, args.cases / fDuration))
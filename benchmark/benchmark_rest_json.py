@@ -0,0 +1,130 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: benchmark_rest_json.py
+#
+# Client CPU cost of the JSON handling of REST test case creation: the previous
+# request helper (json= payload, response parsed twice) versus the helpers of
+# RestApiDBAccess (pre-encoded payload, response parsed once) with each
+# installed JSON serializer. The stub server runs in another process, so only
+# the CPU time of the client is measured (requests per client CPU second).
+# The JSON handling alone (encoding of the payload, decoding of the response) is
+# reported per request as well.
+#
+# Usage:
+#    python benchmark_rest_json.py [--cases 3000] [--repeat 3]
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "pytest", "testcases"))
+
+from requests.utils import guess_json_utf
+from TestResultDBAccess.DBAccess.json_codec import SERIALIZERS, oGetSerializer
+from TestResultDBAccess.DBAccess.rest_payloads import dTestCasePayload, TestCasePayloadEncoder
+from TestResultDBAccess.DBAccess.rest_api_db_access import RestApiDBAccess
+
+RESULT_ID = "3d8c6f0e-4c7b-4a5e-9d0e-3b1f2d4e5a6b"
+
+def arTestCases(nCases):
+   return [("test case %d" % i, "", "TC-%d" % i, "", i, 1, "component",
+            "2026-10-01 10:00:00", "PASSED", "complete", 0, 0, "log line " * 20, RESULT_ID, 1)
+           for i in range(nCases)]
+
+def serve(oConnection):
+   from rest_stub_server import RestStubServer
+   with RestStubServer() as oServer:
+      oConnection.send(oServer.base_url)
+      oConnection.recv()
+
+def run_legacy(oDBAccess, arCases):
+   # request helper before the JSON serializer
+   for testcase in arCases:
+      res = oDBAccess.session.post("{}/{}".format(oDBAccess.base_url, 'testcases'),
+                                   json=dTestCasePayload(*testcase), allow_redirects=True)
+      if res.status_code == 201 and res.json()['success']:
+         res.json()['data']['id']
+      else:
+         raise Exception(res.json()['message'])
+
+def run_current(oDBAccess, arCases):
+   for testcase in arCases:
+      oDBAccess.nCreateNewTestCase(*testcase)
+
+RESPONSE = b'{"success":true,"data":{"id":1234},"message":null}'
+
+def json_legacy(testcase):
+   # json= payload of requests and two calls of res.json()
+   json.dumps(dTestCasePayload(*testcase), allow_nan=False).encode('utf-8')
+   for _ in range(2):
+      json.loads(RESPONSE.decode(guess_json_utf(RESPONSE)))
+
+def json_current(sSerializer):
+   oSerializer = oGetSerializer(sSerializer)
+   oEncoder = TestCasePayloadEncoder(oSerializer)
+   def run(testcase):
+      oEncoder.bEncode(*testcase)
+      oSerializer.oLoads(RESPONSE)
+   return run
+
+if __name__ == "__main__":
+   oParser = argparse.ArgumentParser(description="Benchmark client CPU of REST JSON handling")
+   oParser.add_argument("--cases", type=int, default=3000)
+   oParser.add_argument("--repeat", type=int, default=3)
+   args = oParser.parse_args()
+
+   oConnection, oChildConnection = multiprocessing.Pipe()
+   oProcess = multiprocessing.Process(target=serve, args=(oChildConnection,), daemon=True)
+   oProcess.start()
+   sBaseURL = oConnection.recv()
+
+   arCases = arTestCases(args.cases)
+   arVariants = [("legacy", run_legacy, "json")]
+   for sName in SERIALIZERS:
+      try:
+         SERIALIZERS[sName]()
+      except ImportError:
+         print("%s is not installed, skipped" % sName)
+         continue
+      arVariants.append(("parse once (%s)" % sName, run_current, sName))
+
+   print("%-22s %14s %16s %12s" % ("variant", "CPU time [s]", "requests/CPU s",
+                                   "JSON [us]"))
+   try:
+      for sName, fnRun, sSerializer in arVariants:
+         fnJSON = json_legacy if fnRun is run_legacy else json_current(sSerializer)
+         fJSON = min(timeit.repeat(lambda: fnJSON(arCases[1]), number=10000,
+                                   repeat=args.repeat)) / 10000 * 1e6
+         oDBAccess = RestApiDBAccess(serializer=sSerializer)
+         oDBAccess.base_url = sBaseURL
+         fnRun(oDBAccess, arCases[:50])   # warm up the connection
+         fBest = None
+         for _ in range(args.repeat):
+            fStart = time.process_time()
+            fnRun(oDBAccess, arCases)
+            fDuration = time.process_time() - fStart
+            fBest = fDuration if fBest is None else min(fBest, fDuration)
+         print("%-22s %14.2f %16.0f %12.1f" % (sName, fBest, args.cases / fBest, fJSON))
+   finally:
+      oConnection.send(None)
+      oProcess.join(5)
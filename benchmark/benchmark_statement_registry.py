@@ -0,0 +1,97 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: benchmark_statement_registry.py
+#
+# Microbenchmark of the client CPU which is spent per call to get the SQL
+# statement: concatenation per call (as before StatementRegistry) versus the
+# statements compiled once per connect().
+#
+# Usage:
+#    python benchmark_statement_registry.py [--calls 200000]
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from TestResultDBAccess.DBAccess.statement_registry import StatementRegistry
+
+DATABASE  = "test_result_db"
+RESULT_ID = "3d8c6f0e-4c7b-4a5e-9d0e-3b1f2d4e5a6b"
+
+# statement building as it was done in every call before StatementRegistry
+def legacy_vSetCategory(db, result_id, category):
+   return """update """ + db + """.tbl_result set category_main='""" + \
+                  category + """' where test_result_id='""" + \
+                  result_id + "'", None
+
+def legacy_nCreateNewFile(db, result_id):
+   return """insert into """ + db + """.tbl_file (name,tester_account,
+                     tester_machine,time_start,time_end,test_result_id,origin)
+                     values (%s,%s,%s,%s,%s,%s,%s)""" , ("file", "tester", "machine",
+                                                         "start", "end", result_id, "ROBFW")
+
+def legacy_bExistingResultID(db, result_id):
+   return "SELECT test_result_id FROM %s.tbl_result WHERE test_result_id='%s'"%(db, result_id), None
+
+def legacy_sGetLatestFileID(db, result_id):
+   return "SELECT MAX(file_id) FROM %s.tbl_file WHERE test_result_id='%s'"%(db, result_id), None
+
+def registry_vSetCategory(oStatements, result_id, category):
+   return oStatements['vSetCategory'], (category, result_id)
+
+def registry_nCreateNewFile(oStatements, result_id):
+   return oStatements['nCreateNewFile'], ("file", "tester", "machine",
+                                          "start", "end", result_id, "ROBFW")
+
+def registry_bExistingResultID(oStatements, result_id):
+   return oStatements['bExistingResultID'], (result_id,)
+
+def registry_sGetLatestFileID(oStatements, result_id):
+   return oStatements['sGetLatestFileID'], (result_id,)
+
+def fCPUPerCall(func, args, nCalls):
+   fStart = time.process_time()
+   for _ in range(nCalls):
+      func(*args)
+   return (time.process_time() - fStart) / nCalls
+
+if __name__ == "__main__":
+   oParser = argparse.ArgumentParser(description="Benchmark SQL statement building")
+   oParser.add_argument("--calls", type=int, default=200000)
+   args = oParser.parse_args()
+
+   oStatements = StatementRegistry(DATABASE)
+   arCases = [
+      ("vSetCategory",      legacy_vSetCategory,      (DATABASE, RESULT_ID, "regression"),
+                            registry_vSetCategory,    (oStatements, RESULT_ID, "regression")),
+      ("nCreateNewFile",    legacy_nCreateNewFile,    (DATABASE, RESULT_ID),
+                            registry_nCreateNewFile,  (oStatements, RESULT_ID)),
+      ("bExistingResultID", legacy_bExistingResultID, (DATABASE, RESULT_ID),
+                            registry_bExistingResultID, (oStatements, RESULT_ID)),
+      ("sGetLatestFileID",  legacy_sGetLatestFileID,  (DATABASE, RESULT_ID),
+                            registry_sGetLatestFileID, (oStatements, RESULT_ID)),
+   ]
+
+   print("%-20s %14s %16s %8s" % ("method", "legacy ns/call", "registry ns/call", "drop"))
+   for sName, legacy, legacy_args, registry, registry_args in arCases:
+      fLegacy   = fCPUPerCall(legacy, legacy_args, args.calls)
+      fRegistry = fCPUPerCall(registry, registry_args, args.calls)
+      print("%-20s %14.0f %16.0f %7.0f%%" % (sName, fLegacy * 1e9, fRegistry * 1e9,
+                                              (1 - fRegistry / fLegacy) * 100))
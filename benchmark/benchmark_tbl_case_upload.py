@@ -0,0 +1,80 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: benchmark_tbl_case_upload.py
+#
+# Compares the upload rate (rows/second) of buffered test cases into tbl_case
+# with executemany and with LOAD DATA LOCAL INFILE against a local MariaDB/MySQL
+# database with TestResultWebApp's schema.
+#
+# All uploaded data is rolled back at the end of each run.
+#
+# Usage:
+#    python benchmark_tbl_case_upload.py --host localhost --user root --passwd xxx --database test_db
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from TestResultDBAccess.DBAccess import DirectDBAccess
+
+def fUploadRate(args, bBulkLoad):
+   oDBAccess = DirectDBAccess(bulk_load=bBulkLoad)
+   oDBAccess.connect(args.host, args.user, args.passwd, args.database)
+   try:
+      sResultID = str(uuid.uuid4())
+      oDBAccess.sCreateNewTestResult("benchmark", "variant", "branch", sResultID, "",
+                                     "2024-01-01 00:00:00", "2024-01-01 00:00:00",
+                                     "sw", "test", "hw", "", "")
+      iFileID = oDBAccess.nCreateNewFile("benchmark.robot", "tester", "machine",
+                                         "2024-01-01 00:00:00", "2024-01-01 00:00:00",
+                                         sResultID)
+      fStart = time.perf_counter()
+      for i in range(args.rows):
+         sLastLog = "Traceback line\twith tab\n" * (i % 5)
+         oDBAccess.nCreateNewTestCase("test case %d" % i, "", "TC-%d" % i, "", i, 1,
+                                      "component%d" % (i % 10), "2024-01-01 00:00:00",
+                                      "PASSED" if i % 7 else "FAILED", "complete",
+                                      0, 0, sLastLog, sResultID, iFileID)
+      oDBAccess.vFinishTestResult(sResultID)
+      fDuration = time.perf_counter() - fStart
+      bUsedBulkLoad = oDBAccess.bBulkLoad
+   finally:
+      # keep the database clean
+      oDBAccess.con.rollback()
+      oDBAccess.con.close()
+   if bBulkLoad and not bUsedBulkLoad:
+      print("  (server refused LOAD DATA LOCAL INFILE, executemany was used)")
+   return args.rows / fDuration
+
+if __name__ == "__main__":
+   oParser = argparse.ArgumentParser(description="Benchmark tbl_case upload paths")
+   oParser.add_argument("--host", default="localhost")
+   oParser.add_argument("--user", required=True)
+   oParser.add_argument("--passwd", required=True)
+   oParser.add_argument("--database", required=True)
+   oParser.add_argument("--rows", type=int, default=200000)
+   args = oParser.parse_args()
+
+   fExecMany = fUploadRate(args, bBulkLoad=False)
+   print("executemany           : %10.0f rows/s" % fExecMany)
+   fLoadData = fUploadRate(args, bBulkLoad=True)
+   print("LOAD DATA LOCAL INFILE: %10.0f rows/s" % fLoadData)
+   print("speedup               : %10.2fx" % (fLoadData / fExecMany))
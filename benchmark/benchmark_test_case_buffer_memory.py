@@ -0,0 +1,110 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: benchmark_test_case_buffer_memory.py
+#
+# Memory benchmark of pending test case rows: list of tuples (as before
+# TestCaseBuffer) versus the columnar TestCaseBuffer with interned values.
+# Each flush (and the final one) iterates the rows as they are handed to
+# executemany, so the row tuples built by the flush are part of the peak RSS and
+# of the CPU time. Each variant runs in its own process, the peak RSS of this
+# process is reported.
+#
+# Usage:
+#    python benchmark_test_case_buffer_memory.py [--rows 1000000] [--flushes 10]
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import argparse
+import collections
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+COMPONENTS = ["component_%d" % i for i in range(20)]
+RESULTS    = ["PASSED", "FAILED", "UNKNOWN"]
+
+def rows(nRows):
+   """
+Test case rows as a parser delivers them: the repeated values are equal but
+distinct string objects.
+   """
+   for i in range(nRows):
+      yield ("test case %d" % i, "", "TC-%d" % i, "", i, 1,
+             "%s" % "".join(COMPONENTS[i % 20]), "2026-10-01 10:00:00",
+             "".join(RESULTS[i % 3]), "".join("complete"), 0, 0,
+             "".join("3d8c6f0e-4c7b-4a5e-9d0e-3b1f2d4e5a6b"), 1 + i // 1000, None)
+
+def nPeakRSS():
+   # ru_maxrss is in KiB on Linux
+   return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def flush(itRows):
+   """
+Consume the rows like executemany does.
+   """
+   collections.deque(itRows, maxlen=0)
+
+def run_variant(sVariant, nRows, nFlushes):
+   nRowsPerFlush = nRows // nFlushes
+   if sVariant == "list":
+      from TestResultDBAccess.DBAccess.flush_policy import AdaptiveFlushPolicy
+      lTestCases = []
+      nBytes = 0
+      for row in rows(nRows):
+         # the size estimate of the flush policy per buffered row
+         nBytes += AdaptiveFlushPolicy.nRowSize(row)
+         lTestCases.append(row)
+         if len(lTestCases) == nRowsPerFlush and nFlushes > 1:
+            flush(lTestCases)
+            lTestCases = []
+      flush(lTestCases)
+   else:
+      from TestResultDBAccess.DBAccess.case_buffer import TestCaseBuffer
+      oBuffer = TestCaseBuffer(nRowsPerFlush)
+      for row in rows(nRows):
+         # nCreateNewTestCase() passes its arguments to vAppend()
+         oBuffer.vAppend(*row)
+         if len(oBuffer) == nRowsPerFlush and nFlushes > 1:
+            flush(oBuffer.itRows())
+            oBuffer.vClear()
+      flush(oBuffer.itRows())
+   return nPeakRSS()
+
+if __name__ == "__main__":
+   oParser = argparse.ArgumentParser(description="Benchmark peak RSS of pending test case rows")
+   oParser.add_argument("--rows", type=int, default=1000000)
+   oParser.add_argument("--flushes", type=int, default=1,
+                        help="number of flushes, 1 keeps all rows pending until the end")
+   oParser.add_argument("--variant", choices=["list", "columnar"], help=argparse.SUPPRESS)
+   args = oParser.parse_args()
+
+   if args.variant:
+      fStart = time.process_time()
+      nRSS = run_variant(args.variant, args.rows, args.flushes)
+      print(nRSS, time.process_time() - fStart)
+      sys.exit(0)
+
+   print("%-10s %14s %10s" % ("buffer", "peak RSS [MiB]", "CPU [s]"))
+   for sVariant in ("list", "columnar"):
+      sOutput = subprocess.check_output([sys.executable, __file__, "--variant", sVariant,
+                                         "--rows", str(args.rows), "--flushes", str(args.flushes)],
+                                        universal_newlines=True)
+      sRSS, sCPU = sOutput.split()
+      print("%-10s %14.1f %10.2f" % (sVariant, int(sRSS) / 1024.0, float(sCPU)))
@@ -0,0 +1,264 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: rest_stub_server.py
+#
+# Local stub of the TestResultWebApp REST API for tests and benchmarks of
+# RestApiDBAccess. Created records are kept in memory.
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import hashlib
+import json
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class _RestStubHandler(BaseHTTPRequestHandler):
+   protocol_version = "HTTP/1.1"
+   # send each response at once, otherwise delayed ACKs slow down keep-alive
+   wbufsize = -1
+   disable_nagle_algorithm = True
+
+   def log_message(self, *args):
+      pass
+
+   def __vReply(self, nStatus, data=None, message=None, cookie=None, etag=False):
+      body = json.dumps({"success": 200 <= nStatus < 300, "data": data,
+                         "message": message}).encode('utf-8')
+      if etag:
+         sETag = '"%s"' % hashlib.sha1(body).hexdigest()
+         if self.headers.get('If-None-Match') == sETag:
+            self.send_response(304)
+            self.send_header('ETag', sETag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+      self.send_response(nStatus)
+      self.send_header('Content-Type', 'application/json')
+      if etag:
+         self.send_header('ETag', sETag)
+      if cookie:
+         self.send_header('Set-Cookie', "session=%s; Path=/" % cookie)
+      self.send_header('Content-Length', str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+   def __arPath(self):
+      # /<database>/<resource>[/<id>], the query string is ignored
+      return self.path.split('?')[0].strip('/').split('/')[1:]
+
+   def __oPayload(self):
+      nLength = int(self.headers.get('Content-Length') or 0)
+      return json.loads(self.rfile.read(nLength)) if nLength else None
+
+   def __vHandle(self, sMethod):
+      oServer = self.server.oStub
+      payload = self.__oPayload()
+      arPath  = self.__arPath()
+      oServer.vRecordRequest(sMethod, arPath, payload)
+      try:
+         self.__vAnswer(sMethod, arPath, payload)
+      finally:
+         oServer.vLeaveRequest()
+
+   def __sSession(self):
+      oCookie = SimpleCookie(self.headers.get('Cookie') or "")
+      return oCookie['session'].value if 'session' in oCookie else None
+
+   def __vAnswer(self, sMethod, arPath, payload):
+      oServer = self.server.oStub
+      if oServer.fLatency:
+         time.sleep(oServer.fLatency)
+      sResource = arPath[0] if arPath else ""
+
+      if oServer.bSessions and sResource not in ('getPubKey', 'login', 'loggedin') and \
+         not oServer.bValidSession(self.__sSession()):
+         self.__vReply(401, message="not logged in")
+         return
+
+      if sMethod == 'GET':
+         if sResource == 'capabilities':
+            if oServer.bBatch:
+               self.__vReply(200, {"batch": True, "max_batch_size": oServer.nMaxBatchSize})
+            else:
+               self.__vReply(404, message="not found")
+         elif sResource == 'logout':
+            oServer.vLogout(self.__sSession())
+            self.__vReply(200)
+         elif sResource == 'getPubKey':
+            body = json.dumps({"pubKey": ""}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+         else:
+            self.__vReply(200, oServer.oGet(arPath), etag=oServer.bETag)
+      elif sMethod == 'POST':
+         if sResource == 'login':
+            self.__vReply(200, "login_success", cookie=oServer.sLogin())
+         elif sResource in oServer.setFailResources:
+            self.__vReply(400, message="cannot create {}".format(sResource))
+         elif isinstance(payload, list):
+            if not oServer.bBatch:
+               self.__vReply(400, message="array payload is not supported")
+            elif oServer.nMaxBatchSize and len(payload) > oServer.nMaxBatchSize:
+               self.__vReply(413, message="too many records")
+            else:
+               self.__vReply(201, [{"id": oServer.nCreate(sResource, record)}
+                                   for record in payload])
+         else:
+            self.__vReply(201, {"id": oServer.nCreate(sResource, payload)})
+      else:
+         if sResource in oServer.setFailResources:
+            self.__vReply(400, message="cannot update {}".format(sResource))
+         else:
+            oServer.vUpdate(sResource, arPath[1] if len(arPath) > 1 else None, payload)
+            self.__vReply(200, {})
+
+   def do_GET(self):
+      self.__vHandle('GET')
+
+   def do_POST(self):
+      self.__vHandle('POST')
+
+   def do_PATCH(self):
+      self.__vHandle('PATCH')
+
+class RestStubServer(object):
+   """
+Local stub of the TestResultWebApp REST API.
+
+*  POST creates a record with a new ID (``dRecords``), PATCH records the update
+   of a record (``dUpdates``).
+*  ``latency`` delays each response (e.g. to simulate a remote server).
+*  POST and PATCH requests to a resource in ``setFailResources`` are rejected.
+*  With ``batch``, POST accepts array payloads of up to ``max_batch_size``
+   records, which is announced by ``GET capabilities``. Without ``batch``, array
+   payloads are rejected and there is no ``capabilities`` endpoint.
+*  With ``sessions``, ``POST login`` sets a session cookie (``nLogins`` counts
+   the logins) and other requests without a valid session are rejected with 401.
+   ``GET logout`` and ``vExpireSessions()`` invalidate the session / all sessions.
+*  With ``etag``, GET responses of records have an ``ETag`` and ``If-None-Match``
+   with the current ``ETag`` is answered with 304.
+*  A single record is addressed by its ID or its ``test_result_id``, PATCH
+   updates the record as well.
+   """
+
+   def __init__(self, latency=0.0, database="db", batch=False, max_batch_size=50,
+                      sessions=False, etag=False):
+      self.fLatency         = latency
+      self.bETag            = etag
+      self.bBatch           = batch
+      self.bSessions        = sessions
+      self.nLogins          = 0
+      self.__setSessions    = set()
+      self.nMaxBatchSize    = max_batch_size
+      self.sDatabase        = database
+      self.setFailResources = set()
+      self.dRecords         = {}
+      self.dUpdates         = {}
+      self.arRequests       = []
+      self.nMaxInFlight     = 0
+      self.__nInFlight      = 0
+      self.__nNextID        = 0
+      self.__oLock          = threading.Lock()
+      self.__oHTTPServer    = ThreadingHTTPServer(("127.0.0.1", 0), _RestStubHandler)
+      self.__oHTTPServer.daemon_threads = True
+      self.__oHTTPServer.oStub = self
+      self.__oThread = None
+
+   @property
+   def host(self):
+      return "http://127.0.0.1:%d" % self.__oHTTPServer.server_address[1]
+
+   @property
+   def base_url(self):
+      return "%s/%s" % (self.host, self.sDatabase)
+
+   def __enter__(self):
+      self.__oThread = threading.Thread(target=self.__oHTTPServer.serve_forever, daemon=True)
+      self.__oThread.start()
+      return self
+
+   def __exit__(self, *args):
+      self.__oHTTPServer.shutdown()
+      self.__oHTTPServer.server_close()
+
+   def vRecordRequest(self, sMethod, arPath, payload):
+      with self.__oLock:
+         self.arRequests.append((sMethod, "/".join(arPath), payload))
+         self.__nInFlight += 1
+         self.nMaxInFlight = max(self.nMaxInFlight, self.__nInFlight)
+
+   def vLeaveRequest(self):
+      with self.__oLock:
+         self.__nInFlight -= 1
+
+   def sLogin(self):
+      with self.__oLock:
+         self.nLogins += 1
+         sSession = "s%d" % self.nLogins
+         self.__setSessions.add(sSession)
+         return sSession
+
+   def bValidSession(self, sSession):
+      with self.__oLock:
+         return sSession in self.__setSessions
+
+   def vLogout(self, sSession):
+      with self.__oLock:
+         self.__setSessions.discard(sSession)
+
+   def vExpireSessions(self):
+      with self.__oLock:
+         self.__setSessions.clear()
+
+   def nCreate(self, sResource, payload):
+      with self.__oLock:
+         self.__nNextID += 1
+         self.dRecords.setdefault(sResource, {})[self.__nNextID] = payload
+         return self.__nNextID
+
+   def __oFind(self, sResource, sID):
+      dRecords = self.dRecords.get(sResource, {})
+      if sID is not None and sID.isdigit():
+         return dRecords.get(int(sID))
+      for record in dRecords.values():
+         if isinstance(record, dict) and record.get('test_result_id') == sID:
+            return record
+      return None
+
+   def vUpdate(self, sResource, sID, payload):
+      with self.__oLock:
+         self.dUpdates.setdefault(sResource, {}).setdefault(sID, {}).update(payload or {})
+         record = self.__oFind(sResource, sID)
+         if isinstance(record, dict):
+            record.update(payload or {})
+
+   def oGet(self, arPath):
+      with self.__oLock:
+         if len(arPath) > 1:
+            return self.__oFind(arPath[0], arPath[1])
+         return list(self.dRecords.get(arPath[0], {}).values()) if arPath else None
+
+   def arRecords(self, sResource):
+      """
+Records of the resource in the order of their IDs.
+      """
+      with self.__oLock:
+         dRecords = self.dRecords.get(sResource, {})
+         return [dRecords[nID] for nID in sorted(dRecords)]
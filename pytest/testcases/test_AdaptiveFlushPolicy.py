@@ -0,0 +1,64 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_AdaptiveFlushPolicy.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+from TestResultDBAccess.DBAccess.flush_policy import AdaptiveFlushPolicy
+
+# --------------------------------------------------------------------------------------------------------------
+
+class Test_AdaptiveFlushPolicy:
+   """AdaptiveFlushPolicy tests"""
+
+   def test_byte_budget(self):
+      oPolicy = AdaptiveFlushPolicy(max_allowed_packet=16*1024*1024)
+      assert oPolicy.nByteBudget == 8*1024*1024
+      assert not oPolicy.bIsFlushDue(10, 1024)
+      assert oPolicy.bIsFlushDue(10, 8*1024*1024)
+      assert oPolicy.bIsFlushDue(100, 1024)
+
+   def test_minimum_byte_budget(self):
+      oPolicy = AdaptiveFlushPolicy(max_allowed_packet=1024)
+      assert oPolicy.nByteBudget == AdaptiveFlushPolicy.MIN_BYTE_BUDGET
+
+   def test_adapt_batch_size(self):
+      oPolicy = AdaptiveFlushPolicy(initial_rows=100, min_rows=10, max_rows=400, target_latency=1.0)
+      oPolicy.vRecordFlush(100, 0.1)
+      assert oPolicy.nBatchRows == 200
+      oPolicy.vRecordFlush(200, 0.1)
+      oPolicy.vRecordFlush(400, 0.1)
+      assert oPolicy.nBatchRows == 400
+      # a partial batch (e.g. the final flush) does not grow the batch size
+      oPolicy.vRecordFlush(5, 0.1)
+      assert oPolicy.nBatchRows == 400
+      oPolicy.vRecordFlush(400, 2.0)
+      assert oPolicy.nBatchRows == 200
+      for _ in range(10):
+         oPolicy.vRecordFlush(10, 2.0)
+      assert oPolicy.nBatchRows == 10
+
+   def test_split(self):
+      oPolicy = AdaptiveFlushPolicy()
+      nBudget = oPolicy.nByteBudget
+      lRows = [("a" * (nBudget // 2),), ("b",), ("c" * nBudget,), ("d",)]
+      arChunks = oPolicy.arSplit(lRows)
+      assert [len(chunk) for chunk in arChunks] == [2, 1, 1]
+      assert sum(arChunks, []) == lRows
@@ -0,0 +1,131 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_AsyncRestApiDBAccess.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+import asyncio
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(os.path.dirname(__file__))
+aiohttp = pytest.importorskip("aiohttp")
+from rest_stub_server import RestStubServer
+from TestResultDBAccess.DBAccess.async_rest_api_db_access import AsyncRestApiDBAccess
+
+RESULT_ID = "3d8c6f0e-4c7b-4a5e-9d0e-3b1f2d4e5a6b"
+
+# --------------------------------------------------------------------------------------------------------------
+
+def oTestCase(i):
+   return ("test case %d" % i, "", "TC-%d" % i, "", i, 1, "component",
+           "2026-10-01 10:00:00", "PASSED", "complete", 0, 0, "", RESULT_ID, 1)
+
+def run(oServer, fnScenario, **kwargs):
+   async def scenario():
+      oDBAccess = AsyncRestApiDBAccess(**kwargs)
+      # connect() needs the Kerberos login of the real server
+      oDBAccess.base_url = oServer.base_url
+      try:
+         return await fnScenario(oDBAccess)
+      finally:
+         await oDBAccess.session.close()
+   return asyncio.run(scenario())
+
+class Test_AsyncRestApiDBAccess:
+   """AsyncRestApiDBAccess tests against a local stub server"""
+
+   def test_test_cases_in_order(self):
+      """pytest test case IDs are returned in input order with bounded concurrency"""
+      with RestStubServer(latency=0.05) as oServer:
+         async def scenario(oDBAccess):
+            return await oDBAccess.arCreateNewTestCases([oTestCase(i) for i in range(12)])
+         arIDs = run(oServer, scenario, max_in_flight=4)
+         arRecords = oServer.arRecords('testcases')
+         assert [arRecords[nID - 1]['name'] for nID in arIDs] == \
+                ["test case %d" % i for i in range(12)]
+         assert 1 < oServer.nMaxInFlight <= 4
+
+   def test_stream_and_finish(self):
+      """pytest test cases and CCR samples from async generators, then finish the result"""
+      with RestStubServer() as oServer:
+         async def itTestCases():
+            for i in range(5):
+               yield oTestCase(i)
+         async def scenario(oDBAccess):
+            nCount = await oDBAccess.nCreateNewTestCases(itTestCases())
+            await oDBAccess.vCreateCCRdataStream(1, (("2026-10-01 10:00:00", i, 1.0)
+                                                     for i in range(7)))
+            await oDBAccess.vFinishTestResult(RESULT_ID)
+            return nCount
+         assert run(oServer, scenario, max_in_flight=3) == 5
+         assert len(oServer.arRecords('ccrs')) == 7
+         assert oServer.dUpdates['results'][RESULT_ID]['result_state'] == "new report"
+
+   def test_first_error(self):
+      """pytest the error of a failed request is raised"""
+      with RestStubServer() as oServer:
+         oServer.setFailResources.add('testcases')
+         async def scenario(oDBAccess):
+            await oDBAccess.arCreateNewTestCases([oTestCase(i) for i in range(5)])
+         with pytest.raises(Exception, match="cannot create testcases"):
+            run(oServer, scenario, max_in_flight=2)
+
+   @pytest.mark.parametrize("bBatch, nRequests", [(True, 2), (False, 5)])
+   def test_headers_and_flush(self, bBatch, nRequests):
+      """pytest file headers are created (in batches if supported) and flush can be awaited"""
+      with RestStubServer(batch=bBatch) as oServer:
+         async def scenario(oDBAccess):
+            await oDBAccess.bProbeBatchSupport()
+            await oDBAccess.vCreateNewHeaders([(i,) + ("",) * 27 for i in range(5)])
+            await oDBAccess.flush()
+         run(oServer, scenario, batch_size=3)
+         # the batches are sent concurrently
+         assert sorted(record['file_id'] for record in oServer.arRecords('fileheaders')) == list(range(5))
+         assert [sPath for _, sPath, _ in oServer.arRequests].count('fileheaders') == nRequests
+
+   @pytest.mark.parametrize("bBatch, nRequests", [(True, 5), (False, 12)])
+   def test_batch_test_cases(self, bBatch, nRequests):
+      """pytest test cases are posted in batches if the server supports them, IDs in input order"""
+      with RestStubServer(batch=bBatch) as oServer:
+         async def itTestCases():
+            for i in range(7):
+               yield oTestCase(i)
+         async def scenario(oDBAccess):
+            await oDBAccess.bProbeBatchSupport()
+            arIDs = await oDBAccess.arCreateNewTestCases([oTestCase(i) for i in range(5)])
+            nCount = await oDBAccess.nCreateNewTestCases(itTestCases())
+            return arIDs, nCount
+         arIDs, nCount = run(oServer, scenario, batch_size=3)
+         arRecords = oServer.arRecords('testcases')
+         assert [arRecords[nID - 1]['name'] for nID in arIDs] == \
+                ["test case %d" % i for i in range(5)]
+         assert nCount == 7
+         assert len(arRecords) == 12
+         assert [sPath for _, sPath, _ in oServer.arRequests].count('testcases') == nRequests
+
+   @pytest.mark.parametrize("bBatch, nRequests", [(True, 3), (False, 7)])
+   def test_batch_ccr_data(self, bBatch, nRequests):
+      """pytest CCR samples are posted in batches if the server supports them"""
+      with RestStubServer(batch=bBatch) as oServer:
+         async def scenario(oDBAccess):
+            await oDBAccess.bProbeBatchSupport()
+            await oDBAccess.vCreateCCRdataStream(5, (("2026-10-01 10:00:00", i, 1.0)
+                                                     for i in range(7)))
+         run(oServer, scenario, batch_size=3)
+         assert sorted(record['MEM_RSS'] for record in oServer.arRecords('ccrs')) == list(range(7))
+         assert [sPath for _, sPath, _ in oServer.arRequests].count('ccrs') == nRequests
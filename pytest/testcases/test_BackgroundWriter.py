@@ -0,0 +1,82 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_BackgroundWriter.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+from TestResultDBAccess.DBAccess.background_writer import BackgroundWriter
+
+# --------------------------------------------------------------------------------------------------------------
+
+class Test_BackgroundWriter:
+   """BackgroundWriter tests"""
+
+   def test_order(self):
+      lFlushed = []
+      oWriter = BackgroundWriter(lFlushed.append, queue_size=2)
+      for i in range(20):
+         oWriter.vSubmit([i])
+      oWriter.vBarrier()
+      assert lFlushed == [[i] for i in range(20)]
+      oWriter.vStop()
+
+   def test_back_pressure(self):
+      oRelease = threading.Event()
+      oWriter = BackgroundWriter(lambda batch: oRelease.wait(), queue_size=1)
+      oWriter.vSubmit(1)   # taken by the writer thread
+      oWriter.vSubmit(2)   # waits in the queue
+      oBlocked = threading.Thread(target=oWriter.vSubmit, args=(3,))
+      oBlocked.start()
+      oBlocked.join(0.1)
+      assert oBlocked.is_alive()
+      oRelease.set()
+      oBlocked.join()
+      oWriter.vStop()
+
+   def test_first_error(self):
+      lFlushed = []
+      oSubmitted = threading.Event()
+      def flush(batch):
+         # all batches are queued before the error occurs
+         oSubmitted.wait()
+         if batch == 2:
+            raise ValueError("batch %s" % batch)
+         lFlushed.append(batch)
+      lDiscarded = []
+      oWriter = BackgroundWriter(flush, queue_size=4, fnDiscard=lDiscarded.append)
+      for i in range(1, 5):
+         oWriter.vSubmit(i)
+      oSubmitted.set()
+      with pytest.raises(ValueError, match="batch 2"):
+         oWriter.vBarrier()
+      # batches after the failed one are dropped and handed to fnDiscard
+      assert lFlushed == [1]
+      assert lDiscarded == [3, 4]
+      oWriter.vBarrier()
+      oWriter.vStop()
+
+   def test_stop_raises_error(self):
+      def flush(batch):
+         raise ValueError("failed")
+      oWriter = BackgroundWriter(flush)
+      oWriter.vSubmit(1)
+      with pytest.raises(ValueError):
+         oWriter.vStop()
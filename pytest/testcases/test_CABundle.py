@@ -0,0 +1,92 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_CABundle.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+import stat
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+import requests
+from TestResultDBAccess.DBAccess import ca_bundle
+
+# --------------------------------------------------------------------------------------------------------------
+
+needs_ca_store = pytest.mark.skipif(not ca_bundle.oGetSSLContext().get_ca_certs(),
+                                    reason="system CA store is empty")
+posix_only = pytest.mark.skipif(not hasattr(os, 'getuid'), reason="no POSIX permissions")
+
+class Test_CABundle:
+   """CA bundle tests"""
+
+   def test_shared_ssl_context(self):
+      """pytest the SSL context is created once"""
+      assert ca_bundle.oGetSSLContext() is ca_bundle.oGetSSLContext()
+
+   @needs_ca_store
+   def test_bundle_is_reused(self, tmp_path):
+      """pytest the CA bundle is written once and reused"""
+      sBundle = ca_bundle.sGetCABundle(str(tmp_path))
+      assert os.path.basename(sBundle).startswith(ca_bundle.CA_BUNDLE_PREFIX)
+      with open(sBundle) as infile:
+         assert infile.read().count("BEGIN CERTIFICATE") == len(ca_bundle.oGetSSLContext().get_ca_certs())
+      nMTime = os.stat(sBundle).st_mtime_ns
+      assert ca_bundle.sGetCABundle(str(tmp_path)) == sBundle
+      assert os.stat(sBundle).st_mtime_ns == nMTime
+      assert os.listdir(str(tmp_path)) == [os.path.basename(sBundle)]
+
+   @needs_ca_store
+   def test_stale_bundles_removed(self, tmp_path):
+      """pytest bundles of another CA store are removed"""
+      sStale = os.path.join(str(tmp_path), ca_bundle.CA_BUNDLE_PREFIX + "0000000000000000.pem")
+      sOther = os.path.join(str(tmp_path), "other.pem")
+      for sFile in (sStale, sOther):
+         open(sFile, 'w').close()
+      sBundle = ca_bundle.sGetCABundle(str(tmp_path))
+      assert sorted(os.listdir(str(tmp_path))) == sorted([os.path.basename(sBundle), "other.pem"])
+
+   @needs_ca_store
+   @posix_only
+   def test_untrusted_bundles(self, tmp_path):
+      """pytest bundles which other users can write and shared directories are not trusted"""
+      sBundle = ca_bundle.sGetCABundle(str(tmp_path))
+      with open(sBundle, 'w') as outfile:
+         outfile.write("planted")
+      os.chmod(sBundle, 0o666)
+      assert ca_bundle.sGetCABundle(str(tmp_path)) == sBundle
+      with open(sBundle) as infile:
+         assert "BEGIN CERTIFICATE" in infile.read()
+      assert stat.S_IMODE(os.stat(sBundle).st_mode) == 0o644
+
+      sShared = tmp_path / "shared"
+      sShared.mkdir()
+      os.chmod(str(sShared), 0o777)
+      sBundle = ca_bundle.sGetCABundle(str(sShared))
+      assert os.path.dirname(sBundle) != str(sShared)
+      assert stat.S_IMODE(os.stat(os.path.dirname(sBundle)).st_mode) == 0o700
+      assert os.listdir(str(sShared)) == []
+
+   def test_adapter_uses_shared_context(self):
+      """pytest the adapter replaces the CA bundle by the shared SSL context"""
+      oAdapter = ca_bundle.SSLContextAdapter(ca_bundle=__file__)
+      oRequest = requests.Request("GET", "https://localhost/").prepare()
+      _, dPoolKwargs = oAdapter.build_connection_pool_key_attributes(oRequest, __file__)
+      assert dPoolKwargs["ssl_context"] is ca_bundle.oGetSSLContext()
+      assert "ca_certs" not in dPoolKwargs
+      _, dPoolKwargs = oAdapter.build_connection_pool_key_attributes(oRequest, False)
+      assert "ssl_context" not in dPoolKwargs
@@ -0,0 +1,86 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_CCRColumns.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+import types
+from array import array
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+from TestResultDBAccess.DBAccess.ccr_columns import arCCRColumns, arColumnValues
+
+# --------------------------------------------------------------------------------------------------------------
+
+class Test_CCRColumns:
+   """CCR column helper tests"""
+
+   def test_sequences(self):
+      timestamps = ["2026-10-01 10:00:00", "2026-10-01 10:00:01"]
+      assert arColumnValues(timestamps) is timestamps
+      assert arColumnValues(range(3)) == [0, 1, 2]
+
+   def test_buffer_protocol(self):
+      mem = array('q', [1024, 2048])
+      assert arColumnValues(mem) == [1024, 2048]
+      assert arColumnValues(memoryview(array('d', [0.5]))) == [0.5]
+      assert mem == array('q', [1024, 2048])
+
+   def test_length_mismatch(self):
+      with pytest.raises(Exception, match="differ in length"):
+         arCCRColumns([1, 2], array('q', [1]), [0.5, 0.7])
+
+   def test_numpy(self):
+      numpy = pytest.importorskip("numpy")
+      timestamps = numpy.array(["2026-10-01T10:00:00", "2026-10-01T10:00:01"], dtype='datetime64[s]')
+      fine = numpy.array(["2026-10-01T10:00:00.250"], dtype='datetime64[ms]')
+      cpu = numpy.array([12.5, 13.0])
+      assert arColumnValues(timestamps) == ["2026-10-01 10:00:00", "2026-10-01 10:00:01"]
+      assert arColumnValues(fine) == ["2026-10-01 10:00:00.250000"]
+      assert arColumnValues(cpu) == [12.5, 13.0]
+      assert str(timestamps[0]) == "2026-10-01T10:00:00"
+
+   def test_datetime64_branch(self, monkeypatch):
+      """pytest the datetime64 branch with a stand-in of the NumPy API, so it runs without NumPy"""
+      lUnits = []
+      class ndarray(list):
+         def __init__(self, values, dtype):
+            super(ndarray, self).__init__(values)
+            self.dtype = dtype
+         def tolist(self):
+            return list(self)
+      def datetime_as_string(column, unit):
+         lUnits.append(unit)
+         return ndarray(column, "str")
+      numpy = types.ModuleType("numpy")
+      numpy.ndarray = ndarray
+      numpy.datetime64 = "datetime64"
+      numpy.issubdtype = lambda dtype, kind: dtype.startswith(kind)
+      numpy.datetime_data = lambda dtype: (dtype[len("datetime64["):-1], 1)
+      numpy.datetime_as_string = datetime_as_string
+      numpy.char = types.SimpleNamespace(
+         replace=lambda column, old, new: ndarray([value.replace(old, new) for value in column], "str"))
+      monkeypatch.setitem(sys.modules, "numpy", numpy)
+
+      timestamps = ndarray(["2026-10-01T10:00:00"], "datetime64[s]")
+      assert arColumnValues(timestamps) == ["2026-10-01 10:00:00"]
+      assert arColumnValues(ndarray(["2026-10-01T10:00:00.250000"], "datetime64[ms]")) == \
+             ["2026-10-01 10:00:00.250000"]
+      assert lUnits == ["s", "us"]
+      assert arColumnValues(ndarray([12.5], "float64")) == [12.5]
+      assert timestamps == ["2026-10-01T10:00:00"]
@@ -0,0 +1,83 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_CommitPolicy.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+from TestResultDBAccess.DBAccess.commit_policy import CommitPolicy
+
+# --------------------------------------------------------------------------------------------------------------
+
+class Test_CommitPolicy:
+   """CommitPolicy tests"""
+
+   def test_default_never_due(self):
+      oPolicy = CommitPolicy()
+      oPolicy.vRecordStatement()
+      oPolicy.vRecordRows(100000)
+      for sBoundary in ('rows', 'file', 'result'):
+         assert not oPolicy.bIsCommitDue(sBoundary)
+
+   def test_no_transaction_not_due(self):
+      oPolicy = CommitPolicy(per_result=True)
+      assert not oPolicy.bIsCommitDue('result')
+
+   def test_rows(self):
+      oPolicy = CommitPolicy(rows=100)
+      oPolicy.vRecordStatement()
+      oPolicy.vRecordRows(60)
+      assert not oPolicy.bIsCommitDue('rows')
+      oPolicy.vRecordRows(40)
+      assert oPolicy.bIsCommitDue('rows')
+      oPolicy.vRecordCommit()
+      assert not oPolicy.bIsCommitDue('rows')
+
+   def test_per_file_and_result(self):
+      oPolicy = CommitPolicy(per_file=True)
+      oPolicy.vRecordStatement()
+      assert not oPolicy.bIsCommitDue('rows')
+      assert oPolicy.bIsCommitDue('file')
+      assert oPolicy.bIsCommitDue('result')
+      oPolicy = CommitPolicy(per_result=True)
+      oPolicy.vRecordStatement()
+      assert not oPolicy.bIsCommitDue('file')
+      assert oPolicy.bIsCommitDue('result')
+
+   def test_interval(self):
+      oPolicy = CommitPolicy(interval=0.01)
+      oPolicy.vRecordStatement()
+      assert not oPolicy.bIsCommitDue('rows')
+      time.sleep(0.02)
+      assert oPolicy.bIsCommitDue('rows')
+
+   def test_statistics(self):
+      oPolicy = CommitPolicy(rows=10)
+      oPolicy.vRecordCommit()
+      assert oPolicy.dGetStatistics()['transactions'] == 0
+      oPolicy.vRecordStatement()
+      oPolicy.vRecordRows(10)
+      oPolicy.vRecordCommit()
+      dStatistics = oPolicy.dGetStatistics()
+      assert dStatistics['transactions'] == 1
+      assert dStatistics['rows'] == 10
+      assert dStatistics['max_duration'] >= dStatistics['last_duration'] >= 0
+      oPolicy.vResetStatistics()
+      assert oPolicy.dGetStatistics()['transactions'] == 0
@@ -20,6 +20,7 @@
 # --------------------------------------------------------------------------------------------------------------
 
 import pytest
+import subprocess
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
@@ -38,6 +39,16 @@ class Test_DBAccessFactory:
       oDBAccess = DBAccessFactory().create('db')
       assert type(oDBAccess).__name__ == 'DirectDBAccess'
 
+   @pytest.mark.parametrize(
+      "Description", ["Test DB Access Factory: Direct Access with connection pool",]
+   )
+   def test_direct_access_pool(self, Description):
+      """pytest 'DBAccessFactory' for Direct Access with given connection pool"""
+      oPool = object()
+      oDBAccess = DBAccessFactory().create('db', pool=oPool)
+      assert type(oDBAccess).__name__ == 'DirectDBAccess'
+      assert oDBAccess.pool is oPool
+
    @pytest.mark.parametrize(
       "Description", ["Test DB Access Factory: REST API Access",]
    )
@@ -52,4 +63,26 @@ class Test_DBAccessFactory:
    def test_invalid_access(self, Description):
       """pytest 'DBAccessFactory' for invalid value of interface"""
       with pytest.raises(Exception):
-         DBAccessFactory().create('invalidInterface')
\ No newline at end of file
+         DBAccessFactory().create('invalidInterface')
+
+   @pytest.mark.parametrize(
+      "Description", ["Test DB Access Factory: no backend is imported with the package",]
+   )
+   def test_lazy_backend_import(self, Description):
+      """pytest 'TestResultDBAccess' import does not load MySQLdb or requests"""
+      sStatement = ("import sys, TestResultDBAccess; "
+                    "print(sorted(m for m in ('MySQLdb', 'requests', 'requests_kerberos') "
+                    "if m in sys.modules))")
+      sOutput = subprocess.check_output([sys.executable, "-c", sStatement],
+                                        cwd=os.path.join(os.path.dirname(__file__), "../../"),
+                                        universal_newlines=True)
+      assert sOutput.strip() == "[]"
+
+   @pytest.mark.parametrize(
+      "Description", ["Test DB Access Factory: asynchronous REST API Access",]
+   )
+   def test_rest_api_async_access(self, Description):
+      """pytest 'DBAccessFactory' for asynchronous REST API Access"""
+      oDBAccess = DBAccessFactory().create('rest_async', max_in_flight=4)
+      assert type(oDBAccess).__name__ == 'AsyncRestApiDBAccess'
+      assert oDBAccess.nMaxInFlight == 4
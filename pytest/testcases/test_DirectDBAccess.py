@@ -1,11 +1,19 @@
 import pytest
 import sys
 import os
+import threading
+from array import array
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
 # from TestResultDBAccess.DBAccess import DirectDBAccess
 import TestResultDBAccess.DBAccess.direct_db_accesss
+import TestResultDBAccess.DBAccess.db_connection_pool
+import TestResultDBAccess.DBAccess.flush_policy
+import TestResultDBAccess.DBAccess.commit_policy
 
 class Cursor:
+   rowcount = 1
+   max_stmt_length = 64 * 1024
+
    def __init__(self):
       pass
    
@@ -16,7 +24,8 @@ class Cursor:
       return "cur:executemany"
 
    def fetchall(self):
-      return "cur:fetchall"
+      # e.g. max_allowed_packet, auto_increment_increment, innodb_autoinc_lock_mode
+      return ((4194304, 1, 1),)
 
    @property
    def lastrowid(self):
@@ -35,13 +44,24 @@ class Connection:
    def commit(self):
       return "con::commit"
 
+   def rollback(self):
+      return "con::rollback"
+
+   def ping(self):
+      return "con::ping"
+
    def close(self):
       return "con:close"
 
    def cursor(self):
       return Cursor()
 
+class MockDBError(Exception):
+   pass
+
 class MockDB:
+   Error = MockDBError
+
    def __init__(self):
       pass
 
@@ -56,6 +76,14 @@ class Test_DirectDBAccess:
       db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess()
       return db_access
 
+   @pytest.fixture
+   def db_pool(self):
+      TestResultDBAccess.DBAccess.db_connection_pool.db = MockDB
+      db_pool = TestResultDBAccess.DBAccess.db_connection_pool.DirectDBConnectionPool(
+            "host", "user", "password", "db", min_size=1, max_size=2, timeout=0.1)
+      yield db_pool
+      db_pool.close()
+
    def test_connect(self, db_access):
       db_access.connect("host", "user", "password", "db")
 
@@ -67,6 +95,465 @@ class Test_DirectDBAccess:
       db_access.connect("host", "user", "password", "db")
       db_access.disconnect()
 
+   def test_no_singleton(self, db_access):
+      other = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess()
+      assert other is not db_access
+
+   def test_pool_checkout_checkin(self, db_pool):
+      con1 = db_pool.checkout()
+      con2 = db_pool.checkout()
+      assert con1 is not con2
+      assert db_pool.nSize() == 2
+      with pytest.raises(Exception):
+         db_pool.checkout()
+      db_pool.checkin(con1)
+      assert db_pool.checkout() is con1
+
+   def test_pool_trims_idle_connections(self):
+      TestResultDBAccess.DBAccess.db_connection_pool.db = MockDB
+      db_pool = TestResultDBAccess.DBAccess.db_connection_pool.DirectDBConnectionPool(
+            "host", "user", "password", "db", min_size=1, max_size=3, idle_timeout=0)
+      lCons = [db_pool.checkout() for _ in range(3)]
+      assert db_pool.nSize() == 3
+      for con in lCons:
+         db_pool.checkin(con)
+      # idle connections above min_size are closed
+      assert db_pool.nSize() == 1
+      assert db_pool.checkout() is lCons[-1]
+      db_pool.close()
+
+   def test_pool_health_check_outside_lock(self, db_pool, monkeypatch):
+      lOtherThread = []
+      def ping(connection):
+         # another thread can use the pool while the connection is checked
+         oThread = threading.Thread(target=lambda: lOtherThread.append(db_pool.nSize()))
+         oThread.start()
+         oThread.join(1)
+         assert not oThread.is_alive()
+         raise MockDBError(2006, "MySQL server has gone away")
+      monkeypatch.setattr(Connection, "ping", ping, raising=False)
+      con = db_pool.checkout()
+      # the broken idle connection has been replaced
+      assert lOtherThread == [1]
+      assert db_pool.nSize() == 1
+      db_pool.checkin(con)
+
+   def test_pool_resets_session(self, db_pool, monkeypatch):
+      lExecuted = []
+      def execute(cursor, command, values):
+         lExecuted.append(command)
+      monkeypatch.setattr(Cursor, "execute", execute)
+      db_pool.checkin(db_pool.checkout())
+      assert lExecuted == [TestResultDBAccess.DBAccess.db_connection_pool.RESET_SESSION_STATEMENT]
+
+   def test_foreign_key_check_after_error(self, db_access, monkeypatch):
+      lExecuted = []
+      def execute(cursor, command, values):
+         lExecuted.append((command, values))
+      def executemany(cursor, command, values):
+         raise MockDBError(1062, "Duplicate entry")
+      monkeypatch.setattr(Cursor, "execute", execute)
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      db_access.connect("host", "user", "password", "db")
+      del lExecuted[:]
+      with pytest.raises(MockDBError):
+         db_access.arCreateNewTestCases([("name", "issue", "tcid", "fid", 1, 1, "component",
+                                          "start_time", "result_main", "result_state", 0, 0,
+                                          "lastlog", "result_id", 2)])
+      db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", 1,
+            1, "component", "start_time", "result_main",
+            "result_state", 0, 0, "lastlog",
+            "result_id", 2
+         )
+      with pytest.raises(Exception, match="1 buffered test case") as oError:
+         db_access.vFinishTestResult("result_id")
+      assert isinstance(oError.value.__cause__, MockDBError)
+      lToggles = [values for command, values in lExecuted if "FOREIGN_KEY_CHECKS" in command]
+      assert lToggles == [(0,), (1,), (0,), (1,)]
+
+   def test_pooled_connect_disconnect(self, db_pool):
+      access1 = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(pool=db_pool)
+      access2 = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(pool=db_pool)
+      access1.connect()
+      access2.connect()
+      assert access1.con is not access2.con
+      assert access1.oTestCaseBuffer is not access2.oTestCaseBuffer
+      access1.disconnect()
+      access2.disconnect()
+      assert db_pool.nSize() == 2
+
+   def test_disconnect_error_returns_connection(self, db_pool, monkeypatch):
+      lRollbacks = []
+      def commit(connection):
+         raise MockDBError(2013, "Lost connection to MySQL server during query")
+      monkeypatch.setattr(Connection, "commit", commit)
+      monkeypatch.setattr(Connection, "rollback", lambda connection: lRollbacks.append(connection))
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(pool=db_pool)
+      db_access.connect()
+      con = db_access.con
+      with pytest.raises(MockDBError):
+         db_access.disconnect()
+      assert db_access.con is None
+      assert con in lRollbacks
+      # the connection is back in the pool
+      assert db_pool.checkout() is con
+
+   def test_bulk_load(self, monkeypatch):
+      lLoaded = []
+      def execute(cursor, command, values):
+         if command.lstrip().startswith("load data local infile"):
+            with open(values[0], encoding='utf-8') as f:
+               lLoaded.append((values[0], f.read()))
+      monkeypatch.setattr(Cursor, "execute", execute)
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(bulk_load=True)
+      db_access.connect("host", "user", "password", "db")
+      db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", 1,
+            1, "component", "start_time", "result_main",
+            "result_state", 0, 0, "line1\tcol\nline2\\",
+            "result_id", 2
+         )
+      db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", 2,
+            1, "component", "start_time", "result_main",
+            "result_state", 0, 0, "",
+            "result_id", 2
+         )
+      db_access.vFinishTestResult("result_id")
+      assert len(lLoaded) == 1
+      sTSVFile, sContent = lLoaded[0]
+      assert not os.path.exists(sTSVFile)
+      lLines = sContent.split("\n")
+      assert lLines[0].endswith("\tresult_id\t2\tline1\\tcol\\nline2\\\\")
+      assert lLines[1].endswith("\tresult_id\t2\t\\N")
+      assert db_access.bBulkLoad
+
+   def test_bulk_load_refused(self, monkeypatch):
+      lExecMany = []
+      def execute(cursor, command, values):
+         if command.lstrip().startswith("load data local infile"):
+            raise MockDBError(1148, "The used command is not allowed with this MySQL version")
+      def executemany(cursor, command, values):
+         lExecMany.append(list(values))
+      monkeypatch.setattr(Cursor, "execute", execute)
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(bulk_load=True)
+      db_access.connect("host", "user", "password", "db")
+      db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", 1,
+            1, "component", "start_time", "result_main",
+            "result_state", 0, 0, "lastlog",
+            "result_id", 2
+         )
+      db_access.vFinishTestResult("result_id")
+      assert not db_access.bBulkLoad
+      assert len(lExecMany) == 1 and len(lExecMany[0]) == 1
+
+   def test_flush_by_byte_budget(self, db_access, monkeypatch):
+      lExecMany = []
+      def executemany(cursor, command, values):
+         lExecMany.append((cursor.max_stmt_length, list(values)))
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      db_access.connect("host", "user", "password", "db")
+      nBudget = db_access.oFlushPolicy.nByteBudget
+      assert nBudget == 4194304 // 2
+      sHugeLog = "x" * (nBudget // 3)
+      for i in range(3):
+         db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", i,
+               1, "component", "start_time", "result_main",
+               "result_state", 0, 0, sHugeLog,
+               "result_id", 2
+            )
+      # third huge row reaches the byte budget long before 100 rows
+      assert len(lExecMany) == 2
+      assert [len(rows) for _, rows in lExecMany] == [2, 1]
+      assert lExecMany[0][0] == nBudget
+      assert len(db_access.oTestCaseBuffer) == 0
+      # the shared cursor keeps the driver's default for later statements
+      assert db_access._DirectDBAccess__oGetCursor().max_stmt_length == 64 * 1024
+
+   def test_split_too_large_packet(self, db_access, monkeypatch):
+      lExecMany = []
+      def executemany(cursor, command, values):
+         if len(values) > 1:
+            raise MockDBError(1153, "Got a packet bigger than 'max_allowed_packet' bytes")
+         lExecMany.append(list(values))
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      db_access.connect("host", "user", "password", "db")
+      for i in range(3):
+         db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", i,
+               1, "component", "start_time", "result_main",
+               "result_state", 0, 0, "lastlog",
+               "result_id", 2
+            )
+      db_access.vFinishTestResult("result_id")
+      assert len(lExecMany) == 3
+
+   def test_background_writer(self, monkeypatch):
+      lExecMany = []
+      def executemany(cursor, command, values):
+         lExecMany.append([(row[13], row[4]) for row in values])
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(
+            flush_policy=TestResultDBAccess.DBAccess.flush_policy.AdaptiveFlushPolicy(
+                            initial_rows=10, min_rows=10, max_rows=10),
+            background_writer=True)
+      db_access.connect("host", "user", "password", "db")
+      for file_id in (1, 2):
+         for i in range(25):
+            db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", i,
+                  1, "component", "start_time", "result_main",
+                  "result_state", 0, 0, "lastlog",
+                  "result_id", file_id
+               )
+      db_access.vFinishTestResult("result_id")
+      lRows = [row for lRowsOfBatch in lExecMany for row in lRowsOfBatch]
+      assert lRows == [(file_id, i) for file_id in (1, 2) for i in range(25)]
+      db_access.disconnect()
+
+   def test_background_writer_error(self, monkeypatch):
+      oBuffered = threading.Event()
+      def executemany(cursor, command, values):
+         # the upload fails after all test cases are handed over
+         oBuffered.wait()
+         raise MockDBError(1452, "Cannot add or update a child row")
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(
+            background_writer=True, writer_queue_size=2,
+            flush_policy=TestResultDBAccess.DBAccess.flush_policy.AdaptiveFlushPolicy(
+                            initial_rows=2, min_rows=2, max_rows=2))
+      db_access.connect("host", "user", "password", "db")
+      # three buffers: the first upload fails, the others are dropped
+      for i in range(5):
+         db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", i,
+               1, "component", "start_time", "result_main",
+               "result_state", 0, 0, "lastlog",
+               "result_id", 2 + i // 2
+            )
+      oBuffered.set()
+      with pytest.raises(Exception, match=r"5 buffered test case\(s\) of file\(s\) 2, 3, 4 "
+                                          r"are not written") as oError:
+         db_access.vFinishTestResult("result_id")
+      assert isinstance(oError.value.__cause__, MockDBError)
+      assert len(db_access.oTestCaseBuffer) == 0
+      # the error is raised only once
+      db_access.commit()
+      db_access.disconnect()
+
+   def test_commit_policy(self, monkeypatch):
+      lCommits = []
+      monkeypatch.setattr(Connection, "commit", lambda con: lCommits.append(con))
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(
+            flush_policy=TestResultDBAccess.DBAccess.flush_policy.AdaptiveFlushPolicy(
+                            initial_rows=10, min_rows=10, max_rows=10),
+            commit_policy=TestResultDBAccess.DBAccess.commit_policy.CommitPolicy(
+                            rows=20, per_result=True))
+      db_access.connect("host", "user", "password", "db")
+      for i in range(45):
+         db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", i,
+               1, "component", "start_time", "result_main",
+               "result_state", 0, 0, "lastlog",
+               "result_id", 2
+            )
+      # after 20 and 40 rows
+      assert len(lCommits) == 2
+      db_access.vFinishTestResult("result_id")
+      assert len(lCommits) == 3
+      dStatistics = db_access.dGetTransactionStatistics()
+      assert dStatistics['transactions'] == 3
+      assert dStatistics['rows'] == 45
+
+   def test_commit_per_file(self, monkeypatch):
+      lCommits = []
+      monkeypatch.setattr(Connection, "commit", lambda con: lCommits.append(con))
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(
+            commit_policy=TestResultDBAccess.DBAccess.commit_policy.CommitPolicy(per_file=True))
+      db_access.connect("host", "user", "password", "db")
+      nCommitsAfterConnect = len(lCommits)
+      db_access.nCreateNewFile("file1", "tester", "machine", "start", "end", "result_id")
+      db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", 1,
+            1, "component", "start_time", "result_main",
+            "result_state", 0, 0, "lastlog",
+            "result_id", 1
+         )
+      db_access.nCreateNewFile("file2", "tester", "machine", "start", "end", "result_id")
+      # buffered test case of file1 is flushed before the commit
+      assert len(db_access.oTestCaseBuffer) == 0
+      assert len(lCommits) == nCommitsAfterConnect + 2
+
+   def test_batch_retry_savepoint(self, monkeypatch):
+      lExecuted = []
+      lExecMany = []
+      def execute(cursor, command, values):
+         lExecuted.append(command)
+      def executemany(cursor, command, values):
+         lExecMany.append(list(values))
+         if len(lExecMany) == 1:
+            raise MockDBError(1205, "Lock wait timeout exceeded")
+      monkeypatch.setattr(Cursor, "execute", execute)
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(
+            commit_policy=TestResultDBAccess.DBAccess.commit_policy.CommitPolicy(batch_retries=1))
+      db_access.connect("host", "user", "password", "db")
+      db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", 1,
+            1, "component", "start_time", "result_main",
+            "result_state", 0, 0, "lastlog",
+            "result_id", 2
+         )
+      db_access.vFinishTestResult("result_id")
+      assert len(lExecMany) == 2
+      lSavepoints = [sql for sql in lExecuted if "SAVEPOINT" in sql]
+      assert lSavepoints == ["SAVEPOINT tbl_case_batch",
+                             "ROLLBACK TO SAVEPOINT tbl_case_batch",
+                             "SAVEPOINT tbl_case_batch",
+                             "RELEASE SAVEPOINT tbl_case_batch"]
+      assert db_access.dGetTransactionStatistics()['batch_retries'] == 1
+
+   def test_bulk_load_session(self, db_access, monkeypatch):
+      lExecuted = []
+      def execute(cursor, command, values):
+         lExecuted.append((command, values))
+         cursor.sLastCommand = command
+      def fetchall(cursor):
+         if "@@SESSION" in cursor.sLastCommand:
+            return ((1, 1),)
+         if "LEFT JOIN" in cursor.sLastCommand:
+            return ()
+         return ((4194304, 1, 1),)
+      monkeypatch.setattr(Cursor, "execute", execute)
+      monkeypatch.setattr(Cursor, "fetchall", fetchall)
+      db_access.connect("host", "user", "password", "db")
+      with db_access.oBulkLoadSession():
+         for i in range(250):
+            db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", i,
+                  1, "component", "start_time", "result_main",
+                  "result_state", 0, 0, "lastlog",
+                  "result_id", 2 + i // 200
+               )
+      lCommands = [command for command, _ in lExecuted]
+      assert not any("FOREIGN_KEY_CHECKS" in command for command in lCommands)
+      lSet = [values for command, values in lExecuted if command.startswith("SET SESSION")]
+      assert lSet == [(0, 0), (1, 1)]
+      lChecks = [values for command, values in lExecuted if "LEFT JOIN" in command]
+      assert lChecks == [(2, 3)]
+
+   def test_bulk_load_session_integrity_error(self, db_access, monkeypatch):
+      def fetchall(cursor):
+         return ((2, 5),)
+      db_access.connect("host", "user", "password", "db")
+      with pytest.raises(Exception, match="file_id 2 \\(5 rows\\)"):
+         with db_access.oBulkLoadSession():
+            db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", 1,
+                  1, "component", "start_time", "result_main",
+                  "result_state", 0, 0, "lastlog",
+                  "result_id", 2
+               )
+            monkeypatch.setattr(Cursor, "fetchall", fetchall)
+
+   def test_arCreateNewTestCases(self, db_access, monkeypatch):
+      lExecMany = []
+      def executemany(cursor, command, values):
+         lExecMany.append((cursor.max_stmt_length, list(values)))
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      monkeypatch.setattr(Cursor, "lastrowid", 100)
+      db_access.connect("host", "user", "password", "db")
+      arTestCases = [("name", "issue", "tcid",  "fid", i, 1, "component", "start_time",
+                      "result_main", "result_state", 0, 0, "", "result_id", 2) for i in range(3)]
+      assert db_access.arCreateNewTestCases(arTestCases) == [100, 101, 102]
+      assert len(lExecMany) == 1
+      nMaxStmtLength, lRows = lExecMany[0]
+      assert nMaxStmtLength == sys.maxsize
+      assert lRows[0][12:] == ("result_id", 2, None)
+
+   def test_arCreateNewTestCases_interleaved(self, db_access, monkeypatch):
+      lExecuted = []
+      def execute(cursor, command, values):
+         lExecuted.append((command, values))
+         cursor.sLastCommand = command
+      def fetchall(cursor):
+         if "test_case_id>=" in cursor.sLastCommand:
+            return ((100,), (103,), (104,))
+         # innodb_autoinc_lock_mode 2 (interleaved)
+         return ((4194304, 1, 2),)
+      monkeypatch.setattr(Cursor, "execute", execute)
+      monkeypatch.setattr(Cursor, "fetchall", fetchall)
+      monkeypatch.setattr(Cursor, "lastrowid", 100)
+      db_access.connect("host", "user", "password", "db")
+      arTestCases = [("name", "issue", "tcid",  "fid", i, 1, "component", "start_time",
+                      "result_main", "result_state", 0, 0, "", "result_id", 2 + i % 2) for i in range(3)]
+      assert db_access.arCreateNewTestCases(arTestCases) == [100, 103, 104]
+      lQueries = [values for command, values in lExecuted if "test_case_id>=" in command]
+      assert lQueries == [(100, 2, 3, 3)]
+
+   def test_vCreateCCRdata_keeps_rows(self, db_access, monkeypatch):
+      lExecMany = []
+      def executemany(cursor, command, values):
+         lExecMany.append(list(values))
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      db_access.connect("host", "user", "password", "db")
+      lCCRdata = [[1,2,3], [4,5,6]]
+      db_access.vCreateCCRdata(7, lCCRdata)
+      assert lCCRdata == [[1,2,3], [4,5,6]]
+      assert lExecMany == [[(7,1,2,3), (7,4,5,6)]]
+
+   def test_vCreateCCRdataColumns(self, db_access, monkeypatch):
+      lExecMany = []
+      def executemany(cursor, command, values):
+         lExecMany.append(list(values))
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      db_access.connect("host", "user", "password", "db")
+      db_access.oFlushPolicy.nByteBudget = 100
+      nRows = 50
+      timestamps = ["2026-10-01 10:00:%02d" % i for i in range(nRows)]
+      mem = array('q', range(nRows))
+      cpu = array('d', [0.5] * nRows)
+      db_access.vCreateCCRdataColumns(7, timestamps, mem, cpu)
+      assert len(lExecMany) > 1
+      lRows = [row for lChunk in lExecMany for row in lChunk]
+      assert lRows == [(7, timestamps[i], i, 0.5) for i in range(nRows)]
+
+   def test_vCreateCCRdataColumns_bulk_load(self, monkeypatch):
+      lLoaded = []
+      def execute(cursor, command, values):
+         if command.lstrip().startswith("load data local infile"):
+            with open(values[0], encoding='utf-8') as f:
+               lLoaded.append((command, f.read()))
+      monkeypatch.setattr(Cursor, "execute", execute)
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(bulk_load=True)
+      db_access.connect("host", "user", "password", "db")
+      db_access.vCreateCCRdataColumns(7, ["2026-10-01 10:00:00"], array('q', [1024]), [None])
+      assert len(lLoaded) == 1
+      assert "tbl_ccr" in lLoaded[0][0]
+      assert lLoaded[0][1] == "7\t2026-10-01 10:00:00\t1024\t\\N\n"
+
+   def test_nCreateNewTestCases(self, monkeypatch):
+      lBuffered = []
+      lExecMany = []
+      def executemany(cursor, command, values):
+         lExecMany.append(len(values))
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(
+            flush_policy=TestResultDBAccess.DBAccess.flush_policy.AdaptiveFlushPolicy(
+                            initial_rows=10, min_rows=10, max_rows=10))
+      db_access.connect("host", "user", "password", "db")
+      def testcases():
+         for i in range(250):
+            lBuffered.append(len(db_access.oTestCaseBuffer))
+            yield ("name", "issue", "tcid",  "fid", i, 1, "component", "start_time",
+                   "result_main", "result_state", 0, 0, "", "result_id", 2)
+      assert db_access.nCreateNewTestCases(testcases()) == 250
+      db_access.vFinishTestResult("result_id")
+      assert sum(lExecMany) == 250
+      assert max(lBuffered) < 10
+
+   def test_vCreateCCRdataStream(self, db_access, monkeypatch):
+      lExecMany = []
+      def executemany(cursor, command, values):
+         lExecMany.append(list(values))
+      monkeypatch.setattr(Cursor, "executemany", executemany)
+      db_access.connect("host", "user", "password", "db")
+      db_access.NUM_CCR_SAMPLES_PER_CHUNK = 10
+      db_access.vCreateCCRdataStream(7, ((i, i * 2, 0.5) for i in range(25)))
+      assert [len(lRows) for lRows in lExecMany] == [10, 10, 5]
+      assert lExecMany[2][-1] == (7, 24, 48, 0.5)
+
    def test_cleanAllTables(self, db_access):
       db_access.connect("host", "user", "password", "db")
       db_access.cleanAllTables()
@@ -78,7 +565,47 @@ class Test_DirectDBAccess:
             "version_test", "version_hw", "jenkins_url", "qualitygate"
          )
 
-   def test_nCreateNewFile(self, db_access):
+   def test_sCreateNewTestResult_project_cache(self, db_access, monkeypatch):
+      lProjectInserts = []
+      def execute(cursor, command, values):
+         if "tbl_prj" in command:
+            assert "on duplicate key update" in command
+            lProjectInserts.append(values)
+      monkeypatch.setattr(Cursor, "execute", execute)
+      db_access.connect("cache_host", "user", "password", "db")
+      for sResultID in ("result_id_1", "result_id_2"):
+         db_access.sCreateNewTestResult("cached_project", "variant", "branch", sResultID,
+               "interpretation", "time_start", "end_time", "version_sw",
+               "version_test", "version_hw", "jenkins_url", "qualitygate"
+            )
+      assert len(lProjectInserts) == 1
+
+   def test_sCreateNewTestResult_project_cache_commit_failure(self, db_access, monkeypatch):
+      lProjectInserts = []
+      def execute(cursor, command, values):
+         if "tbl_prj" in command:
+            lProjectInserts.append(values)
+      def commit(con):
+         raise MockDBError("commit failed")
+      monkeypatch.setattr(Cursor, "execute", execute)
+      db_access.connect("commit_failure_host", "user", "password", "db")
+      def create(sResultID):
+         db_access.sCreateNewTestResult("uncommitted_project", "variant", "branch", sResultID,
+               "interpretation", "time_start", "end_time", "version_sw",
+               "version_test", "version_hw", "jenkins_url", "qualitygate"
+            )
+      create("result_id_1")
+      with monkeypatch.context() as patch:
+         patch.setattr(Connection, "commit", commit)
+         with pytest.raises(MockDBError):
+            db_access.commit()
+      # the project was rolled back with the transaction and is inserted again
+      create("result_id_2")
+      assert len(lProjectInserts) == 2
+      db_access.commit()
+      create("result_id_3")
+      assert len(lProjectInserts) == 2
+
       db_access.connect("host", "user", "password", "db")
       db_access.nCreateNewFile("name", "tester", "machine",  "time_start", 
             "end_time", "result_id", "origin"
@@ -118,6 +645,137 @@ class Test_DirectDBAccess:
       db_access.connect("host", "user", "password", "db")
       db_access.vSetCategory("result_id", "result_category")
 
+   def test_parameterized_statements(self, db_access, monkeypatch):
+      lExecuted = []
+      def execute(cursor, command, values):
+         lExecuted.append((command, values))
+      monkeypatch.setattr(Cursor, "execute", execute)
+      db_access.connect("host", "user", "password", "db")
+      db_access.vSetCategory("result'id", "category")
+      db_access.vUpdateFileEndTime(5, "end_time")
+      db_access.bExistingResultID("result'id")
+      assert lExecuted[-3][1] == ("category", "result'id")
+      assert lExecuted[-2][1] == ("end_time", 5)
+      assert lExecuted[-1][1] == ("result'id",)
+      for command, _ in lExecuted[-3:]:
+         assert "result'id" not in command
+         assert command.count("%s") == 2 or command.count("%s") == 1
+      # statements are compiled once per connection
+      assert db_access.oStatements['vSetCategory'] is db_access.oStatements['vSetCategory']
+
+   def test_deferred_result_updates(self, monkeypatch):
+      lExecuted = []
+      def execute(cursor, command, values):
+         lExecuted.append((command, values))
+      monkeypatch.setattr(Cursor, "execute", execute)
+      TestResultDBAccess.DBAccess.direct_db_accesss.db = MockDB
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(deferred_updates=True)
+      db_access.connect("host", "user", "password", "db")
+      del lExecuted[:]
+      db_access.vSetCategory("result_id", "category")
+      db_access.vCreateReanimation("result_id", 1)
+      db_access.vUpdateStartEndTime("result_id", "start", "end")
+      db_access.vCreateReanimation("result_id", 2)
+      db_access.vUpdateResultEndTime("other_id", "end2")
+      assert lExecuted == []
+      # pending updates of the row are written before it is read
+      db_access.bExistingResultID("result_id")
+      assert len(lExecuted) == 2
+      assert lExecuted[0] == ("update db.tbl_result set category_main=%s, num_of_reanimation=%s, "
+                              "time_end=%s, time_start=%s where test_result_id=%s",
+                              ("category", 2, "end", "start", "result_id"))
+      db_access.vSetCategory("result_id", "category2")
+      db_access.vFinishTestResult("result_id")
+      assert lExecuted[2] == ("update db.tbl_result set category_main=%s, result_state=%s "
+                              "where test_result_id=%s", ("category2", "new report", "result_id"))
+      db_access.commit()
+      assert lExecuted[3][1] == ("end2", "other_id")
+      assert db_access.dGetStatistics()['flush']['round_trips'] == 3
+
+   def test_metadata_cache(self, db_access, monkeypatch):
+      lExecuted = []
+      def execute(cursor, command, values):
+         lExecuted.append(command)
+      monkeypatch.setattr(Cursor, "execute", execute)
+      db_access.connect("host", "user", "password", "db")
+      db_access.sCreateNewTestResult("project", "variant", "branch", "result_id",
+            "", "time_start", "end_time", "version_sw",
+            "version_test", "version_hw", "jenkins_url", "qualitygate"
+         )
+      nFileID = db_access.nCreateNewFile("name", "tester", "machine",  "time_start",
+            "end_time", "result_id", "origin"
+         )
+      # the own writes answer the reads without a round trip
+      del lExecuted[:]
+      assert db_access.bExistingResultID("result_id") is True
+      assert db_access.arGetProjectVersionSWByID("result_id") == ("project", "version_sw")
+      assert db_access.sGetLatestFileID("result_id") == nFileID
+      assert lExecuted == []
+      # an existence check does not know project and version
+      assert db_access.bExistingResultID("other_id") is True
+      db_access.arGetProjectVersionSWByID("other_id")
+      assert len(lExecuted) == 2
+      db_access.arGetProjectVersionSWByID("other_id")
+      assert len(lExecuted) == 2
+      db_access.vInvalidateMetadata("result_id")
+      db_access.sGetLatestFileID("result_id")
+      assert len(lExecuted) == 3
+      assert db_access.oMetadataCache.dStatistics['hits'] == 5
+      # the cache belongs to the connection
+      db_access.disconnect()
+      assert len(db_access.oMetadataCache) == 0
+
+   def test_metadata_cache_eviction(self, monkeypatch):
+      TestResultDBAccess.DBAccess.direct_db_accesss.db = MockDB
+      db_access = TestResultDBAccess.DBAccess.direct_db_accesss.DirectDBAccess(metadata_cache_size=2)
+      db_access.connect("host", "user", "password", "db")
+      for sResultID in ("result_1", "result_2", "result_3"):
+         db_access.sCreateNewTestResult("project", "variant", "branch", sResultID,
+               "", "time_start", "end_time", "version_sw",
+               "version_test", "version_hw", "jenkins_url", "qualitygate"
+            )
+      lExecuted = []
+      def execute(cursor, command, values):
+         lExecuted.append(command)
+      monkeypatch.setattr(Cursor, "execute", execute)
+      db_access.bExistingResultID("result_3")
+      assert lExecuted == []
+      db_access.bExistingResultID("result_1")
+      assert len(lExecuted) == 1
+
+   def test_cursor_reuse_and_statistics(self, db_access, monkeypatch):
+      lCursors = []
+      def cursor(connection):
+         lCursors.append(Cursor())
+         return lCursors[-1]
+      monkeypatch.setattr(Connection, "cursor", cursor)
+      db_access.connect("host", "user", "password", "db")
+      db_access.vResetStatistics()
+      db_access.vSetCategory("result_id", "category")
+      db_access.vSetCategory("result_id", "category")
+      for i in range(3):
+         db_access.nCreateNewTestCase("name", "issue", "tcid",  "fid", i,
+               1, "component", "start_time", "result_main",
+               "result_state", 0, 0, "lastlog",
+               "result_id", 2
+            )
+      db_access.vFinishTestResult("result_id")
+      db_access.commit()
+      assert len(lCursors) == 1
+      dStatistics = db_access.dGetStatistics()
+      assert dStatistics['vSetCategory']['round_trips'] == 2
+      assert dStatistics['vSetCategory']['rows'] == 2
+      assert dStatistics['vSetCategory']['bytes'] > 0
+      # the foreign key check toggles belong to the upload
+      assert dStatistics['nCreateNewTestCase']['round_trips'] == 3
+      assert 'vEnableForeignKeyCheck' not in dStatistics
+      assert dStatistics['vFinishTestResult']['round_trips'] == 1
+      assert dStatistics['commit']['round_trips'] == 1
+      db_access.disconnect()
+      db_access.connect("host", "user", "password", "db")
+      db_access.vSetCategory("result_id", "category")
+      assert len(lCursors) == 2
+
    def test_vUpdateStartEndTime(self, db_access):
       db_access.connect("host", "user", "password", "db")
       db_access.vUpdateStartEndTime("result_id", "start_time", "end_time")
@@ -0,0 +1,72 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_JSONCodec.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+from TestResultDBAccess.DBAccess.json_codec import oGetSerializer, JSONSerializer
+from TestResultDBAccess.DBAccess.rest_payloads import dTestCasePayload, TestCasePayloadEncoder
+
+# --------------------------------------------------------------------------------------------------------------
+
+SERIALIZERS = ["json"]
+try:
+   import orjson
+   SERIALIZERS.append("orjson")
+except ImportError:
+   pass
+
+class Test_JSONCodec:
+   """JSON serializer tests"""
+
+   @pytest.mark.parametrize("sName", SERIALIZERS)
+   def test_round_trip(self, sName):
+      """pytest encoded objects are compact UTF-8 JSON and decode to the same object"""
+      oSerializer = oGetSerializer(sName)
+      obj = {"name": "Prüfung ✓", "id": 12, "values": [1.5, None, True], "nested": {}}
+      data = oSerializer.bDumps(obj)
+      assert isinstance(data, bytes)
+      assert b" " not in data.replace("Prüfung ✓".encode('utf-8'), b"")
+      assert json.loads(data) == obj
+      assert oSerializer.oLoads(data) == obj
+      assert oSerializer.oLoads(data.decode('utf-8')) == obj
+
+   @pytest.mark.parametrize("sName", SERIALIZERS)
+   def test_invalid_json(self, sName):
+      """pytest invalid JSON raises ValueError"""
+      with pytest.raises(ValueError):
+         oGetSerializer(sName).oLoads(b"<html>Bad Gateway</html>")
+
+   def test_unknown_serializer(self):
+      """pytest an unknown serializer name is rejected"""
+      with pytest.raises(ValueError):
+         oGetSerializer("simplejson")
+      assert isinstance(oGetSerializer(), JSONSerializer)
+
+   @pytest.mark.parametrize("sName", SERIALIZERS)
+   def test_test_case_encoder(self, sName):
+      """pytest pre-encoded test cases equal dTestCasePayload"""
+      oEncoder = TestCasePayloadEncoder(oGetSerializer(sName))
+      for i, (result_id, file_id) in enumerate([("R1", 1), ("R1", 1), ("R1", "2"), ("R%2", 2)]):
+         testcase = ("case \"%d\" 100%%s" % i, "ISSUE-1", "TC-%d" % i, "", i, "1", "comp",
+                     "2026-10-01 10:00:00", "PASSED", "complete", "0", 1, "log\nline",
+                     result_id, file_id)
+         assert json.loads(oEncoder.bEncode(*testcase)) == dTestCasePayload(*testcase)
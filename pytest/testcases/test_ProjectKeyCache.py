@@ -0,0 +1,63 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_ProjectKeyCache.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+from TestResultDBAccess.DBAccess.project_cache import ProjectKeyCache
+
+# --------------------------------------------------------------------------------------------------------------
+
+class Test_ProjectKeyCache:
+   """ProjectKeyCache tests"""
+
+   def test_add_contains(self):
+      oCache = ProjectKeyCache()
+      assert not oCache.bContains("host/db", "project", "variant", "branch")
+      oCache.vAdd("host/db", "project", "variant", "branch")
+      assert oCache.bContains("host/db", "project", "variant", "branch")
+      assert not oCache.bContains("other/db", "project", "variant", "branch")
+
+   def test_ttl(self):
+      oCache = ProjectKeyCache(ttl=0.01)
+      oCache.vAdd("host/db", "project", "variant", "branch")
+      time.sleep(0.02)
+      assert not oCache.bContains("host/db", "project", "variant", "branch")
+      assert len(oCache) == 0
+
+   def test_max_size(self):
+      oCache = ProjectKeyCache(max_size=2)
+      oCache.vAdd("host/db", "p1", "v", "b")
+      oCache.vAdd("host/db", "p2", "v", "b")
+      # p1 becomes the most recently used entry
+      assert oCache.bContains("host/db", "p1", "v", "b")
+      oCache.vAdd("host/db", "p3", "v", "b")
+      assert len(oCache) == 2
+      assert oCache.bContains("host/db", "p1", "v", "b")
+      assert not oCache.bContains("host/db", "p2", "v", "b")
+
+   def test_clear_target(self):
+      oCache = ProjectKeyCache()
+      oCache.vAdd("host/db1", "project", "variant", "branch")
+      oCache.vAdd("host/db2", "project", "variant", "branch")
+      oCache.vClear("host/db1")
+      assert not oCache.bContains("host/db1", "project", "variant", "branch")
+      assert oCache.bContains("host/db2", "project", "variant", "branch")
@@ -0,0 +1,249 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_RestApiDBAccess.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(os.path.dirname(__file__))
+from rest_stub_server import RestStubServer
+from TestResultDBAccess.DBAccess.rest_api_db_access import RestApiDBAccess
+from TestResultDBAccess.DBAccess.http_cache import RestResponseCache
+
+RESULT_ID = "3d8c6f0e-4c7b-4a5e-9d0e-3b1f2d4e5a6b"
+
+# --------------------------------------------------------------------------------------------------------------
+
+def oTestCase(i):
+   return ("test case %d" % i, "", "TC-%d" % i, "", i, 1, "component",
+           "2026-10-01 10:00:00", "PASSED", "complete", 0, 0, "", RESULT_ID, 1)
+
+def db_access(oServer, **kwargs):
+   oDBAccess = RestApiDBAccess(**kwargs)
+   # connect() needs the Kerberos login of the real server
+   oDBAccess.base_url = oServer.base_url
+   return oDBAccess
+
+class Test_RestApiDBAccess:
+   """RestApiDBAccess tests against a local stub server"""
+
+   def test_sequential_test_case(self):
+      """pytest nCreateNewTestCase returns the ID without pipelining"""
+      with RestStubServer() as oServer:
+         oDBAccess = db_access(oServer)
+         assert oDBAccess.nCreateNewTestCase(*oTestCase(0)) == 1
+         assert oDBAccess.nCreateNewTestCase(*oTestCase(1)) == 2
+
+   def test_pipelined_ids_in_order(self):
+      """pytest pipelined test cases keep at most max_in_flight requests in flight"""
+      with RestStubServer(latency=0.05) as oServer:
+         oDBAccess = db_access(oServer, max_in_flight=4)
+         arIDs = oDBAccess.arCreateNewTestCases([oTestCase(i) for i in range(12)])
+         arRecords = oServer.arRecords('testcases')
+         assert [arRecords[nID - 1]['name'] for nID in arIDs] == \
+                ["test case %d" % i for i in range(12)]
+         assert 1 < oServer.nMaxInFlight <= 4
+
+   def test_pipelined_barrier_before_finish(self):
+      """pytest vFinishTestResult waits for all pipelined test cases"""
+      with RestStubServer(latency=0.02) as oServer:
+         oDBAccess = db_access(oServer, max_in_flight=3)
+         for i in range(7):
+            assert oDBAccess.nCreateNewTestCase(*oTestCase(i)) is None
+         oDBAccess.vFinishTestResult(RESULT_ID)
+         arRequests = [(sMethod, sPath) for sMethod, sPath, _ in oServer.arRequests]
+         assert arRequests.count(('POST', 'testcases')) == 7
+         assert arRequests[-1] == ('PATCH', 'results/' + RESULT_ID)
+         assert oServer.dUpdates['results'][RESULT_ID]['result_state'] == "new report"
+         assert oDBAccess.arWaitForTestCases() == []
+
+   def test_pipelined_ids_of_barrier(self):
+      """pytest arWaitForTestCases returns the IDs of nCreateNewTestCase in order"""
+      with RestStubServer(latency=0.01) as oServer:
+         oDBAccess = db_access(oServer, max_in_flight=2)
+         for i in range(5):
+            oDBAccess.nCreateNewTestCase(*oTestCase(i))
+         arIDs = oDBAccess.arWaitForTestCases()
+         arRecords = oServer.arRecords('testcases')
+         assert [arRecords[nID - 1]['name'] for nID in arIDs] == \
+                ["test case %d" % i for i in range(5)]
+
+   def test_pipelined_error(self):
+      """pytest the first error of the pipelined test cases is raised"""
+      with RestStubServer() as oServer:
+         oServer.setFailResources.add('testcases')
+         oDBAccess = db_access(oServer, max_in_flight=4)
+         for i in range(3):
+            oDBAccess.nCreateNewTestCase(*oTestCase(i))
+         with pytest.raises(Exception, match="cannot create testcases"):
+            oDBAccess.arWaitForTestCases()
+         assert oDBAccess.arWaitForTestCases() == []
+
+   def test_probe_batch_support(self):
+      """pytest batching is only used if the server announces it"""
+      with RestStubServer(batch=True, max_batch_size=50) as oServer:
+         oDBAccess = db_access(oServer, batch_size=100)
+         assert oDBAccess.bProbeBatchSupport()
+         assert oDBAccess.nBatchSize == 50
+         # the capabilities are asked once per base URL
+         assert db_access(oServer, batch_size=100).bProbeBatchSupport()
+         assert [sPath for _, sPath, _ in oServer.arRequests].count('capabilities') == 1
+      with RestStubServer() as oServer:
+         oDBAccess = db_access(oServer, batch_size=100)
+         assert not oDBAccess.bProbeBatchSupport()
+
+   @pytest.mark.parametrize("bBatch, nRequests", [(True, 3), (False, 10)])
+   def test_batch_test_cases(self, bBatch, nRequests):
+      """pytest test cases are posted in batches or one by one"""
+      with RestStubServer(batch=bBatch) as oServer:
+         oDBAccess = db_access(oServer, batch_size=4)
+         oDBAccess.bProbeBatchSupport()
+         arIDs = oDBAccess.arCreateNewTestCases([oTestCase(i) for i in range(10)])
+         arRecords = oServer.arRecords('testcases')
+         assert [arRecords[nID - 1]['name'] for nID in arIDs] == \
+                ["test case %d" % i for i in range(10)]
+         assert [sPath for _, sPath, _ in oServer.arRequests].count('testcases') == nRequests
+
+   def test_pipelined_batches(self):
+      """pytest pipelined test cases are posted in batches"""
+      with RestStubServer(batch=True, latency=0.01) as oServer:
+         oDBAccess = db_access(oServer, max_in_flight=2, batch_size=3)
+         oDBAccess.bProbeBatchSupport()
+         for i in range(7):
+            oDBAccess.nCreateNewTestCase(*oTestCase(i))
+         arIDs = oDBAccess.arWaitForTestCases()
+         arRecords = oServer.arRecords('testcases')
+         assert [arRecords[nID - 1]['name'] for nID in arIDs] == \
+                ["test case %d" % i for i in range(7)]
+         assert [len(payload) for _, sPath, payload in oServer.arRequests
+                 if sPath == 'testcases'] == [3, 3, 1]
+
+   @pytest.mark.parametrize("bBatch, nRequests", [(True, 3), (False, 7)])
+   def test_batch_ccr_data(self, bBatch, nRequests):
+      """pytest CCR samples are posted in batches or one by one"""
+      with RestStubServer(batch=bBatch) as oServer:
+         oDBAccess = db_access(oServer, batch_size=3)
+         oDBAccess.bProbeBatchSupport()
+         oDBAccess.vCreateCCRdata(5, [("2026-10-01 10:00:00", i, 1.0) for i in range(7)])
+         assert [record['MEM_RSS'] for record in oServer.arRecords('ccrs')] == list(range(7))
+         assert [sPath for _, sPath, _ in oServer.arRequests].count('ccrs') == nRequests
+
+   @pytest.mark.parametrize("bBatch", [True, False])
+   def test_pre_encoded_test_cases(self, bBatch):
+      """pytest pre-encoded test cases are received as the original payloads"""
+      with RestStubServer(batch=bBatch) as oServer:
+         oDBAccess = db_access(oServer, serializer="json")
+         oDBAccess.bProbeBatchSupport()
+         oDBAccess.arCreateNewTestCases([oTestCase(i) for i in range(3)])
+         arRecords = oServer.arRecords('testcases')
+         assert [record['name'] for record in arRecords] == ["test case %d" % i for i in range(3)]
+         assert arRecords[2]['testnumber'] == "2"
+         assert arRecords[2]['test_result_id'] == RESULT_ID
+         assert arRecords[2]['file_id'] == 1
+
+   def test_error_message(self):
+      """pytest the message of a rejected request is raised"""
+      with RestStubServer() as oServer:
+         oServer.setFailResources.add('testcases')
+         oDBAccess = db_access(oServer)
+         with pytest.raises(Exception, match="cannot create testcases"):
+            oDBAccess.nCreateNewTestCase(*oTestCase(0))
+
+   def test_response_cache(self):
+      """pytest fresh cached responses are returned without a request"""
+      with RestStubServer() as oServer:
+         oServer.nCreate('results', {"test_result_id": RESULT_ID, "project": "P",
+                                     "version_sw_target": "V1"})
+         oServer.nCreate('categories', {"category": "main"})
+         oDBAccess = db_access(oServer, response_cache=True)
+         for _ in range(3):
+            assert oDBAccess.arGetCategories() == ["main"]
+            assert oDBAccess.bExistingResultID(RESULT_ID)
+            assert oDBAccess.arGetProjectVersionSWByID(RESULT_ID) == ("P", "V1")
+         assert [sPath for sMethod, sPath, _ in oServer.arRequests if sMethod == 'GET'] == \
+                ['categories', 'results/' + RESULT_ID]
+         assert not oDBAccess.bExistingResultID("unknown")
+         assert not oDBAccess.bExistingResultID("unknown")
+         assert len(oServer.arRequests) == 4
+
+   def test_response_cache_revalidation(self):
+      """pytest stale entries are revalidated and a PATCH of the result invalidates it"""
+      with RestStubServer(etag=True) as oServer:
+         oServer.nCreate('results', {"test_result_id": RESULT_ID, "project": "P",
+                                     "version_sw_target": "V1"})
+         oCache = RestResponseCache(ttls={'results': 0})
+         oDBAccess = db_access(oServer, response_cache=oCache)
+         assert oDBAccess.arGetProjectVersionSWByID(RESULT_ID) == ("P", "V1")
+         assert oDBAccess.arGetProjectVersionSWByID(RESULT_ID) == ("P", "V1")
+         assert oCache.dStatistics == {'hits': 0, 'revalidated': 1, 'misses': 1}
+         oDBAccess.vSetCategory(RESULT_ID, "main")
+         assert len(oCache) == 0
+         oServer.dRecords['results'][1]['version_sw_target'] = "V2"
+         assert oDBAccess.arGetProjectVersionSWByID(RESULT_ID) == ("P", "V2")
+         assert oCache.dStatistics['misses'] == 2
+
+   @pytest.mark.parametrize("response_cache", [None, False])
+   def test_response_cache_disabled(self, response_cache):
+      """pytest without response_cache (the default) each GET request is sent"""
+      with RestStubServer() as oServer:
+         oDBAccess = db_access(oServer, response_cache=response_cache)
+         assert oDBAccess.oResponseCache is None
+         oDBAccess.arGetCategories()
+         oDBAccess.arGetCategories()
+         assert len(oServer.arRequests) == 2
+
+   def test_deferred_updates(self):
+      """pytest deferred updates are merged into one PATCH per resource"""
+      with RestStubServer() as oServer:
+         oServer.nCreate('results', {"test_result_id": RESULT_ID, "project": "P",
+                                     "version_sw_target": "V1"})
+         oDBAccess = db_access(oServer, deferred_updates=True)
+         oDBAccess.vCreateReanimation(RESULT_ID, 1)
+         oDBAccess.vSetCategory(RESULT_ID, "main")
+         for file_id in (1, 2):
+            oDBAccess.vUpdateFileEndTime(file_id, "2026-10-01 10:00:0%d" % file_id)
+         oDBAccess.vCreateReanimation(RESULT_ID, 2)
+         oDBAccess.vUpdateResultEndTime(RESULT_ID, "2026-10-01 11:00:00")
+         assert oServer.arRequests == []
+         oDBAccess.vFinishTestResult(RESULT_ID)
+         assert [(sMethod, sPath) for sMethod, sPath, _ in oServer.arRequests] == \
+                [('PATCH', 'files/1'), ('PATCH', 'files/2'), ('PATCH', 'results/' + RESULT_ID)]
+         assert oServer.dUpdates['results'][RESULT_ID] == {"num_of_reanimation": 2,
+                                                           "category_main": "main",
+                                                           "time_end": "2026-10-01 11:00:00",
+                                                           "result_state": "new report"}
+
+   def test_deferred_updates_flush(self):
+      """pytest deferred updates are sent by flush and before a GET of the resource"""
+      with RestStubServer() as oServer:
+         oServer.nCreate('results', {"test_result_id": RESULT_ID, "project": "P",
+                                     "version_sw_target": "V1"})
+         oDBAccess = db_access(oServer, deferred_updates=True)
+         oDBAccess.vSetCategory(RESULT_ID, "main")
+         oDBAccess.vUpdateFileEndTime(1, "2026-10-01 10:00:00")
+         assert oDBAccess.bExistingResultID(RESULT_ID)
+         assert [sPath for _, sPath, _ in oServer.arRequests] == \
+                ['results/' + RESULT_ID, 'results/' + RESULT_ID]
+         oServer.setFailResources.add('files')
+         with pytest.raises(Exception, match="cannot update files"):
+            oDBAccess.flush()
+         oServer.setFailResources.clear()
+         oDBAccess.flush()
+         assert oServer.dUpdates['files']['1'] == {"time_end": "2026-10-01 10:00:00"}
+
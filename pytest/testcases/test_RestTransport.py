@@ -0,0 +1,135 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_RestTransport.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from TestResultDBAccess.DBAccess.rest_transport import RestTransportAdapter
+
+# --------------------------------------------------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+   protocol_version = "HTTP/1.1"
+   nFailures = 0
+
+   def log_message(self, *args):
+      pass
+
+   def __vReply(self):
+      nLength = int(self.headers.get('Content-Length') or 0)
+      self.rfile.read(nLength)
+      if self.path == "/flaky" and _Handler.nFailures > 0:
+         _Handler.nFailures -= 1
+         nStatus = 503
+      else:
+         nStatus = 200
+      if self.path == "/slow":
+         time.sleep(0.5)
+      body = b'{"success": true, "data": null}'
+      self.send_response(nStatus)
+      self.send_header('Content-Type', 'application/json')
+      self.send_header('Content-Length', str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+   do_GET = do_POST = do_PATCH = __vReply
+
+@pytest.fixture
+def base_url():
+   oServer = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+   oServer.daemon_threads = True
+   oThread = threading.Thread(target=oServer.serve_forever, daemon=True)
+   oThread.start()
+   yield "http://127.0.0.1:%d" % oServer.server_address[1]
+   oServer.shutdown()
+   oServer.server_close()
+
+def _oSession(oTransport):
+   oSession = requests.Session()
+   oSession.mount("http://", oTransport)
+   return oSession
+
+class Test_RestTransport:
+   """RestTransportAdapter tests"""
+
+   def test_connection_reuse(self, base_url):
+      """pytest sequential requests reuse one kept-alive connection"""
+      oTransport = RestTransportAdapter()
+      oSession = _oSession(oTransport)
+      for _ in range(5):
+         assert oSession.get(base_url + "/ok").status_code == 200
+      dStatistics = oTransport.dGetStatistics()
+      assert dStatistics['requests'] == 5
+      assert dStatistics['connections'] == 1
+      assert dStatistics['reused'] == 4
+      assert dStatistics['pools'] == 1
+
+   def test_no_keep_alive(self, base_url):
+      """pytest keep_alive=False opens a connection per request"""
+      oTransport = RestTransportAdapter(keep_alive=False)
+      oSession = _oSession(oTransport)
+      for _ in range(3):
+         assert oSession.get(base_url + "/ok").status_code == 200
+      assert oTransport.dGetStatistics()['connections'] == 3
+
+   def test_retry_idempotent_only(self, base_url):
+      """pytest GET is retried after 503, POST is not"""
+      oTransport = RestTransportAdapter(retries=2, backoff_factor=0)
+      oSession = _oSession(oTransport)
+      _Handler.nFailures = 1
+      assert oSession.get(base_url + "/flaky").status_code == 200
+      assert oTransport.dGetStatistics()['retries'] == 1
+      _Handler.nFailures = 1
+      assert oSession.post(base_url + "/flaky", json={}).status_code == 503
+      assert oTransport.dGetStatistics()['retries'] == 1
+
+   def test_read_timeout(self, base_url):
+      """pytest the default read timeout is used for requests without timeout"""
+      oTransport = RestTransportAdapter(connect_timeout=1, read_timeout=0.1)
+      oSession = _oSession(oTransport)
+      with pytest.raises(requests.exceptions.ReadTimeout):
+         oSession.get(base_url + "/slow")
+      assert oTransport.dGetStatistics()['errors'] == 1
+
+   def test_reset_statistics(self, base_url):
+      """pytest statistics restart after reset"""
+      oTransport = RestTransportAdapter()
+      oSession = _oSession(oTransport)
+      oSession.get(base_url + "/ok")
+      oTransport.vResetStatistics()
+      oSession.get(base_url + "/ok")
+      dStatistics = oTransport.dGetStatistics()
+      assert dStatistics['requests'] == 1
+      assert dStatistics['connections'] == 0
+      assert dStatistics['reused'] == 1
+
+   def test_rest_api_db_access_transport(self):
+      """pytest RestApiDBAccess uses the given transport for HTTP and HTTPS"""
+      from TestResultDBAccess.DBAccess.rest_api_db_access import RestApiDBAccess
+      oTransport = RestTransportAdapter(pool_maxsize=4, retries=3)
+      oDBAccess = RestApiDBAccess(transport=oTransport)
+      assert oDBAccess.session.get_adapter("https://localhost/api") is oTransport
+      assert oDBAccess.session.get_adapter("http://localhost/api") is oTransport
+      assert oTransport.sCABundle == oDBAccess.certs_file
+      assert oDBAccess.dGetTransportStatistics()['requests'] == 0
@@ -0,0 +1,120 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_SessionCache.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+import stat
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(os.path.dirname(__file__))
+import requests
+from rest_stub_server import RestStubServer
+from TestResultDBAccess.DBAccess.session_cache import RestSessionCache
+from TestResultDBAccess.DBAccess.rest_api_db_access import RestApiDBAccess
+
+# --------------------------------------------------------------------------------------------------------------
+
+posix_only = pytest.mark.skipif(not hasattr(os, 'getuid'), reason="no POSIX permissions")
+
+def oCookies(**dCookies):
+   oJar = requests.cookies.RequestsCookieJar()
+   for sName, (sValue, expires) in dCookies.items():
+      oJar.set(sName, sValue, domain="example.com", path="/", expires=expires)
+   return oJar
+
+@pytest.fixture
+def fake_login(monkeypatch):
+   # the login handshake against the stub server without Kerberos and RSA
+   monkeypatch.setattr(RestApiDBAccess, "_RestApiDBAccess__get_wam_cookies", lambda self: None)
+   monkeypatch.setattr(RestApiDBAccess, "encrypt_password", staticmethod(lambda passwd, pubkey: passwd))
+
+class Test_SessionCache:
+   """REST session cache tests"""
+
+   def test_save_and_load(self, tmp_path):
+      """pytest a saved session is loaded for the same host, database and user only"""
+      oCache = RestSessionCache(directory=str(tmp_path))
+      oCache.vSave("https://host", "db", "user", oCookies(session=("abc", None)))
+      dSession = oCache.dLoad("https://host", "db", "user")
+      assert [(d['name'], d['value']) for d in dSession['cookies']] == [("session", "abc")]
+      assert oCache.dLoad("https://host", "db", "other") is None
+      assert oCache.dLoad("https://host", "db2", "user") is None
+      oCache.vRemove("https://host", "db", "user")
+      assert oCache.dLoad("https://host", "db", "user") is None
+
+   def test_expiry(self, tmp_path):
+      """pytest a session expires with its first cookie or after ttl"""
+      oCache = RestSessionCache(directory=str(tmp_path), ttl=3600)
+      oCache.vSave("h", "db", "user", oCookies(a=("1", int(time.time()) + 60), b=("2", None)))
+      assert oCache.dLoad("h", "db", "user")['expires'] <= time.time() + 60
+      oCache = RestSessionCache(directory=str(tmp_path), ttl=-1)
+      oCache.vSave("h", "db", "user", oCookies(b=("2", None)))
+      assert oCache.dLoad("h", "db", "user") is None
+
+   @posix_only
+   def test_permissions(self, tmp_path):
+      """pytest session files are private and other files are ignored"""
+      oCache = RestSessionCache(directory=str(tmp_path / "sessions"))
+      oCache.vSave("h", "db", "user", oCookies(session=("abc", None)))
+      sPath = oCache.sGetPath("h", "db", "user")
+      assert stat.S_IMODE(os.stat(sPath).st_mode) == 0o600
+      assert stat.S_IMODE(os.stat(oCache.sDirectory).st_mode) & 0o077 == 0
+      os.chmod(sPath, 0o644)
+      assert oCache.dLoad("h", "db", "user") is None
+
+   def test_reuse_session(self, tmp_path, fake_login):
+      """pytest connect reuses a cached session and logs in again if it is rejected"""
+      oCache = RestSessionCache(directory=str(tmp_path))
+      with RestStubServer(sessions=True) as oServer:
+         oDBAccess = RestApiDBAccess(session_cache=oCache)
+         oDBAccess.connect(oServer.host, "user", "passwd", "db")
+         assert oServer.nLogins == 1 and not oDBAccess.bCachedSession
+
+         oDBAccess = RestApiDBAccess(session_cache=oCache)
+         oDBAccess.connect(oServer.host, "user", "passwd", "db")
+         assert oDBAccess.bCachedSession
+         assert oDBAccess.nCreateNewFile("file", "tester", "origin", "2026-10-01", "R1", "1.0") == 1
+         assert oServer.nLogins == 1
+
+         oServer.vExpireSessions()
+         oDBAccess = RestApiDBAccess(session_cache=oCache)
+         oDBAccess.connect(oServer.host, "user", "passwd", "db")
+         assert oDBAccess.nCreateNewFile("file", "tester", "origin", "2026-10-01", "R1", "1.0") == 2
+         assert oServer.nLogins == 2 and not oDBAccess.bCachedSession
+         assert oCache.dLoad(oServer.host, "db", "user")['cookies'][0]['value'] == "s2"
+
+   def test_disconnect_keeps_session(self, tmp_path, fake_login):
+      """pytest disconnect does not log out a cached session, so the next connect reuses it"""
+      oCache = RestSessionCache(directory=str(tmp_path))
+      with RestStubServer(sessions=True) as oServer:
+         for _ in range(2):
+            oDBAccess = RestApiDBAccess(session_cache=oCache)
+            oDBAccess.connect(oServer.host, "user", "passwd", "db")
+            oDBAccess.nCreateNewFile("file", "tester", "origin", "2026-10-01", "R1", "1.0")
+            oDBAccess.disconnect()
+         assert oServer.nLogins == 1
+         assert oDBAccess.bCachedSession
+         assert ('GET', 'logout', None) not in oServer.arRequests
+
+         # without session cache, disconnect logs out
+         oDBAccess = RestApiDBAccess()
+         oDBAccess.connect(oServer.host, "user", "passwd", "db")
+         oDBAccess.disconnect()
+         assert ('GET', 'logout', None) in oServer.arRequests
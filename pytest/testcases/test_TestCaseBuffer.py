@@ -0,0 +1,73 @@
+#  Copyright 2020-2024 Robert Bosch GmbH
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# --------------------------------------------------------------------------------------------------------------
+#
+# File: test_TestCaseBuffer.py
+#
+# --------------------------------------------------------------------------------------------------------------
+
+import pytest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
+from TestResultDBAccess.DBAccess.case_buffer import TestCaseBuffer
+from TestResultDBAccess.DBAccess.flush_policy import AdaptiveFlushPolicy
+
+# --------------------------------------------------------------------------------------------------------------
+
+def row(i, component="comp"):
+   return ("name%d" % i, "issue", "tcid", "fid", i, 1, component, "start_time",
+           "PASSED", "complete", 0, 0, "result_id", 2, None)
+
+class Test_TestCaseBuffer:
+   """TestCaseBuffer tests"""
+
+   def test_append_rows(self):
+      oBuffer = TestCaseBuffer(capacity=4)
+      oBuffer.vAppend(*row(0))
+      oBuffer.vAppend(*row(1))
+      assert len(oBuffer) == 2
+      assert oBuffer.nBytes == 2 * AdaptiveFlushPolicy.nRowSize(row(0))
+      assert list(oBuffer.itRows()) == [row(0), row(1)]
+      # the buffer can be iterated again, e.g. for a retry of the upload
+      assert list(oBuffer) == [row(0), row(1)]
+      assert oBuffer.arColumn(TestCaseBuffer.FILE_ID) == [2, 2]
+
+   def test_grow(self):
+      oBuffer = TestCaseBuffer(capacity=2)
+      for i in range(5):
+         oBuffer.vAppend(*row(i))
+      assert oBuffer.nCapacity == 8
+      assert list(oBuffer.itRows()) == [row(i) for i in range(5)]
+
+   def test_clear_reuses_storage(self):
+      oBuffer = TestCaseBuffer(capacity=2)
+      oBuffer.vAppend(*row(0))
+      oBuffer.vAppend(*row(1))
+      arColumns = [id(column) for column in oBuffer.arColumns]
+      oBuffer.vClear()
+      assert len(oBuffer) == 0 and oBuffer.nBytes == 0
+      assert list(oBuffer.itRows()) == []
+      assert oBuffer.arColumns[0] == [None, None]
+      oBuffer.vAppend(*row(2))
+      assert [id(column) for column in oBuffer.arColumns] == arColumns
+      assert list(oBuffer.itRows()) == [row(2)]
+
+   def test_interned_values(self):
+      oBuffer = TestCaseBuffer()
+      # equal but distinct string objects as delivered by a parser
+      oBuffer.vAppend(*row(0, "".join(["comp", "onent"])))
+      oBuffer.vAppend(*row(1, "".join(["compo", "nent"])))
+      arComponents = oBuffer.arColumn(TestCaseBuffer.COMPONENT)
+      assert arComponents[0] is arComponents[1]
@@ -211,6 +211,7 @@ setuptools.setup(
         'install': ExtendedInstallCommand,
     },
     install_requires = oRepositoryConfig.Get('INSTALLREQUIRES'), # public package dependencies from PyPI
+    extras_require = oRepositoryConfig.Get('EXTRASREQUIRE'), # optional dependencies, e.g. aiohttp for "rest_async"
     package_data={f"{oRepositoryConfig.Get('PACKAGENAME')}" : oRepositoryConfig.Get('PACKAGEDATA')}
 )
 # --------------------------------------------------------------------------------------------------------------